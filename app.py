@@ -2,7 +2,7 @@ from flask import Flask
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from config import Config
-from routes import auth_bp, user_bp, guestbook_bp, event_bp, photo_bp, schedule_bp, stats_bp, newsrookie_bp, newsjumpball_bp, news_bp, diary_bp
+from routes import auth_bp, user_bp, guestbook_bp, event_bp, photo_bp, schedule_bp, stats_bp, newsrookie_bp, newsjumpball_bp, news_bp, diary_bp, media_bp
 from routes.admin.admin_routes import admin_bp
 from routes.admin.photo_routes import admin_photo_bp
 from routes.admin.profile_routes import profile_bp
@@ -11,6 +11,7 @@ from routes.admin.event_routes import admin_event_bp
 from routes.admin.guestbook_routes import admin_guestbook_bp
 from routes.admin.stats_routes import admin_stats_bp
 from database import db
+from indexes import ensure_indexes
 
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "*"}})
@@ -38,6 +39,16 @@ app.register_blueprint(newsrookie_bp)
 app.register_blueprint(newsjumpball_bp)
 app.register_blueprint(news_bp)
 app.register_blueprint(diary_bp)
+app.register_blueprint(media_bp)
+
+# 자주 쓰는 쿼리의 인덱스 생성 (이미 있으면 그대로, python -m indexes --report 로 실행 계획 점검)
+if Config.ENSURE_INDEXES:
+    ensure_indexes(db)
+
+# 크롤링 스케줄러를 앱 프로세스 안에서 돌리는 경우 (따로 돌릴 때는 python -m crawler.scheduler)
+if Config.CRAWL_SCHEDULER_ENABLED:
+    from crawler.scheduler import start_scheduler
+    start_scheduler()
 
 if __name__ == '__main__':
     print(app.url_map)
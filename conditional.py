@@ -0,0 +1,118 @@
+from database import db
+from datetime import datetime, timezone
+from flask import request, make_response
+from functools import wraps
+import hashlib
+
+# 조건부 GET (ETag / Last-Modified)
+# 목록 쿼리를 실행하기 전에 컬렉션의 싼 검증값만 읽어서 클라이언트가 가진 응답과 같으면 304 를 반환함
+#   - 문서 수 (estimated_document_count, 컬렉션 메타데이터)
+#   - 가장 큰 _id 와 정렬 필드의 최댓값 (인덱스 끝 한 건)
+#   - collection_versions 의 버전과 갱신 시각 (제자리 수정과 삭제는 _id/날짜 최댓값을 바꾸지 않으므로
+#     그런 엔드포인트는 @changes, 크롤러/스크립트는 bump_version 으로 올림)
+# ETag 는 위 값과 요청 키(경로 + 쿼리 파라미터)의 해시라서 쿼리 조건마다 다르고,
+# 컬렉션이 바뀌면 그 컬렉션을 읽는 모든 목록의 ETag 가 함께 바뀜
+
+collection_versions = db['collection_versions']
+
+
+def bump_version(*names, database=db):
+    """names 컬렉션의 버전을 올림 (그 컬렉션을 읽는 조건부 GET 응답이 모두 다시 만들어짐)"""
+    now = datetime.utcnow()
+    for name in names:
+        try:
+            database['collection_versions'].update_one(
+                {'_id': name}, {'$inc': {'version': 1}, '$set': {'updated_at': now}}, upsert=True
+            )
+        except Exception as e:
+            print(f"{name} 버전 갱신 실패: {e}")
+
+
+def changes(*names):
+    """뷰가 성공(2xx)하면 names 컬렉션 버전을 올림 (route 데코레이터 아래에 붙임)"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            response = make_response(view(*args, **kwargs))
+            if response.status_code < 300:
+                bump_version(*names)
+            return response
+        return wrapper
+    return decorator
+
+
+def _utc(value, tz=None):
+    """비교할 수 있는 naive UTC datetime (datetime 이 아니면 None)
+
+    tz 가 있으면 naive 값을 그 시간대의 시각으로 보고 UTC 로 바꿈 (없으면 naive 값은 UTC 로 봄).
+    """
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None and tz is not None:
+        value = value.replace(tzinfo=tz)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def validators(name, field=None, tz=None):
+    """(ETag 값, Last-Modified) name 컬렉션의 문서 수/최댓값/버전으로 계산 (tz: field 값의 시간대)"""
+    collection = db[name]
+    count = collection.estimated_document_count()
+    newest = collection.find_one({}, {'_id': 1}, sort=[('_id', -1)])
+    latest = collection.find_one({field: {'$exists': True}}, {field: 1}, sort=[(field, -1)]) if field else None
+    version = collection_versions.find_one({'_id': name}) or {}
+
+    latest_value = latest.get(field) if latest else None
+    parts = [name, count, newest['_id'] if newest else None, latest_value, version.get('version', 0)]
+    etag = hashlib.sha1(repr((request.full_path, parts)).encode('utf-8')).hexdigest()
+
+    times = [
+        _utc(newest['_id'].generation_time if newest and hasattr(newest['_id'], 'generation_time') else None),
+        _utc(latest_value, tz),
+        _utc(version.get('updated_at'))
+    ]
+    times = [value for value in times if value is not None]
+    last_modified = max(times).replace(microsecond=0) if times else None
+    return etag, last_modified
+
+
+def _not_modified(etag, last_modified):
+    # If-None-Match 가 있으면 If-Modified-Since 는 보지 않음 (RFC 9110)
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified:
+        return last_modified <= _utc(request.if_modified_since)
+    return False
+
+
+def conditional(name, field=None, tz=None):
+    """name 컬렉션을 읽는 GET 뷰에 ETag/Last-Modified 를 붙이고 바뀌지 않았으면 뷰를 실행하지 않고 304 반환
+
+    route 데코레이터 바로 아래(cached_response/single_flight 보다 위)에 붙임.
+    field 는 목록의 정렬 기준 날짜 필드 (created_at, date 등, 인덱스가 있어야 함).
+    tz 는 field 에 naive 로 저장된 시각의 시간대 (크롤러 기사는 crawler.sites.SITE_TIMEZONE, 없으면 UTC).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                etag, last_modified = validators(name, field, tz)
+            except Exception as e:
+                print(f"{name} 검증값 계산 실패: {e}")
+                return view(*args, **kwargs)
+
+            if _not_modified(etag, last_modified):
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=True)
+            if last_modified:
+                response.last_modified = last_modified
+            # 캐시해 두되 쓸 때마다 서버에 확인
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
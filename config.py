@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 from datetime import timedelta
 
@@ -8,3 +9,81 @@ class Config:
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     MONGO_URI = os.getenv("MONGO_URI")
+
+    # GridFS 읽기 캐시 (메모리 LRU + 워커 간 공유되는 디스크 LRU)
+    MEDIA_CACHE_MEMORY_BYTES = int(os.getenv("MEDIA_CACHE_MEMORY_BYTES", 64 * 1024 * 1024))
+    MEDIA_CACHE_MEMORY_TTL = int(os.getenv("MEDIA_CACHE_MEMORY_TTL", 300))
+    MEDIA_CACHE_DISK_DIR = os.getenv("MEDIA_CACHE_DISK_DIR", os.path.join(tempfile.gettempdir(), "sofanpage_media_cache"))
+    MEDIA_CACHE_DISK_BYTES = int(os.getenv("MEDIA_CACHE_DISK_BYTES", 1024 * 1024 * 1024))
+    MEDIA_CACHE_MAX_ITEM_BYTES = int(os.getenv("MEDIA_CACHE_MAX_ITEM_BYTES", 8 * 1024 * 1024))
+
+    # 여러 사진을 한 번에 가져올 때 쓰는 스레드 수 (MongoClient maxPoolSize=50 안에서 공유)
+    MEDIA_FETCH_WORKERS = int(os.getenv("MEDIA_FETCH_WORKERS", 8))
+    MEDIA_FETCH_TIMEOUT = int(os.getenv("MEDIA_FETCH_TIMEOUT", 20))
+
+    # 이미지 저장소: gridfs (기본) | local | s3
+    MEDIA_STORAGE = os.getenv("MEDIA_STORAGE", "gridfs")
+    MEDIA_LOCAL_DIR = os.getenv("MEDIA_LOCAL_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "media_files"))
+    MEDIA_S3_PREFIX = os.getenv("MEDIA_S3_PREFIX", "media")
+    MEDIA_S3_PRESIGN_EXPIRES = int(os.getenv("MEDIA_S3_PRESIGN_EXPIRES", 3600))
+
+    # 서명된 미디어 URL (?exp=&sig=). 키가 없으면 JWT_SECRET_KEY 에서 파생
+    MEDIA_URL_SIGNING_KEY = os.getenv("MEDIA_URL_SIGNING_KEY")
+    MEDIA_URL_TTL = int(os.getenv("MEDIA_URL_TTL", 6 * 60 * 60))
+    # 만료 시각을 이 단위로 올림해서 같은 구간 안에서는 같은 URL 이 나오게 함 (CDN 캐시 적중)
+    MEDIA_URL_WINDOW = int(os.getenv("MEDIA_URL_WINDOW", 60 * 60))
+    # 서명된 URL 로만 받을 수 있는 버킷 (쉼표로 구분). 기본값은 개인 다이어리 사진
+    # 여기에 없는 버킷은 id 만 알면 누구나 받을 수 있음 (빈 값으로 두면 서명을 쓰지 않음)
+    MEDIA_SIGNED_BUCKETS = tuple(b.strip() for b in os.getenv("MEDIA_SIGNED_BUCKETS", "diary").split(",") if b.strip())
+
+    # 목록 total 을 다시 세기 전까지 재사용하는 시간(초) (pagination.cached_count)
+    PAGINATION_COUNT_TTL = int(os.getenv("PAGINATION_COUNT_TTL", 60))
+
+    # 일정/스탯/프로필/이벤트/최신 기사 GET 응답 캐시 (response_cache.py): memory | mongo | off
+    RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", 300))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 512))
+
+    # 같은 GET 의 동시 요청을 한 번만 계산 (singleflight.py): none(프로세스 안) | file(같은 서버) | mongo(여러 서버)
+    SINGLEFLIGHT_LOCK = os.getenv("SINGLEFLIGHT_LOCK", "none")
+    SINGLEFLIGHT_LOCK_DIR = os.getenv("SINGLEFLIGHT_LOCK_DIR", os.path.join(tempfile.gettempdir(), "sofanpage_singleflight"))
+    # 다른 요청의 결과를 기다리는 최대 시간(초). 지나면 직접 계산
+    SINGLEFLIGHT_TIMEOUT = float(os.getenv("SINGLEFLIGHT_TIMEOUT", 10))
+
+    # 앱 시작 시 indexes.py 의 인덱스 생성 (python -m indexes --apply 로 따로 실행해도 됨)
+    ENSURE_INDEXES = os.getenv("ENSURE_INDEXES", "true").lower() in ("1", "true", "yes")
+
+    # 크롤링할 키워드(선수 이름 등, 쉼표로 구분). 기사마다 제목에 들어 있는 키워드가 keywords 태그로 저장됨
+    CRAWL_KEYWORDS = tuple(k.strip() for k in os.getenv("CRAWL_KEYWORDS", "이소희").split(",") if k.strip())
+
+    # 크롤러: 상세 페이지 동시 요청 수와 호스트별 초당 요청 수(토큰 버킷)
+    CRAWL_MAX_WORKERS = int(os.getenv("CRAWL_MAX_WORKERS", 4))
+    CRAWL_HOST_RATE = float(os.getenv("CRAWL_HOST_RATE", 2.0))
+    CRAWL_HOST_BURST = int(os.getenv("CRAWL_HOST_BURST", 2))
+    CRAWL_TIMEOUT = float(os.getenv("CRAWL_TIMEOUT", 10))
+    CRAWL_RETRIES = int(os.getenv("CRAWL_RETRIES", 2))
+    # 재시도 간격: 0 ~ min(MAX, BASE * 2^시도) 사이의 무작위 값 (full jitter)
+    CRAWL_BACKOFF_BASE = float(os.getenv("CRAWL_BACKOFF_BASE", 0.5))
+    CRAWL_BACKOFF_MAX = float(os.getenv("CRAWL_BACKOFF_MAX", 8))
+    # 검색 목록을 넘길 때 미리 요청해 둘 다음 페이지 수
+    CRAWL_PREFETCH_PAGES = int(os.getenv("CRAWL_PREFETCH_PAGES", 3))
+    # 조건부 요청용으로 저장한 목록 페이지 본문/ETag 의 보관 기간 (crawl_http_cache)
+    CRAWL_VALIDATOR_TTL = int(os.getenv("CRAWL_VALIDATOR_TTL", 7 * 24 * 60 * 60))
+
+    # 크롤러가 받은 원본 페이지 보관 위치 (python -m crawler.replay 로 재파싱)
+    # 보관소는 자동으로 정리되지 않으므로 기본값은 보관하지 않음(빈 값). 필요할 때만 경로를 지정 (예: ./crawl_archive)
+    CRAWL_ARCHIVE_DIR = os.getenv("CRAWL_ARCHIVE_DIR", "")
+
+    # 크롤링 스케줄러: 같은 앱 프로세스의 백그라운드 스레드로 돌릴지 여부
+    # (따로 돌릴 때는 python -m crawler.scheduler)
+    CRAWL_SCHEDULER_ENABLED = os.getenv("CRAWL_SCHEDULER_ENABLED", "false").lower() in ("1", "true", "yes")
+    CRAWL_INTERVAL = int(os.getenv("CRAWL_INTERVAL", 24 * 60 * 60))
+    CRAWL_SCHEDULER_POLL = int(os.getenv("CRAWL_SCHEDULER_POLL", 60))
+    CRAWL_LEASE_TTL = int(os.getenv("CRAWL_LEASE_TTL", 120))
+
+    AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
+    AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
+    AWS_S3_REGION = os.getenv("AWS_S3_REGION")
+    AWS_S3_BUCKET = os.getenv("AWS_S3_BUCKET")
+    # MinIO 등 S3 호환 저장소나 로컬 테스트용 서버 주소
+    AWS_S3_ENDPOINT_URL = os.getenv("AWS_S3_ENDPOINT_URL")
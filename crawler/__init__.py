@@ -0,0 +1,7 @@
+"""뉴스 크롤러
+
+DB 에 연결하는 모듈(engine, store, scheduler)은 필요한 곳에서 직접 import 해서
+파싱/HTTP 도구는 DB 없이도 쓸 수 있게 함 (벤치마크 등).
+"""
+from .http import HttpClient, HttpMetrics, ValidatorStore
+from .sites import PageSpec, ROOKIE_LISTING, JUMPBALL_LISTING, JUMPBALL_ARTICLE
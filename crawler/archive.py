@@ -0,0 +1,87 @@
+"""크롤러가 받은 원본 페이지 보관소
+
+파일 하나에 JSON 헤더 한 줄(url, status, fetched_at, content_type) + 본문을 gzip 으로 저장:
+
+    <root>/<호스트>/<YYYYMMDD>/<HHMMSSffffff>-<url sha1 앞 16자>.html.gz
+
+replay 가 네트워크 없이 다시 파싱할 수 있도록 URL 과 받은 시각으로 찾을 수 있게 함.
+"""
+from datetime import datetime
+from urllib.parse import urlsplit
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+SUFFIX = '.html.gz'
+
+
+class PageArchive:
+    def __init__(self, root, compresslevel=6):
+        self.root = root
+        self.compresslevel = compresslevel
+
+    def path_for(self, url, fetched_at):
+        host = urlsplit(url).netloc or 'unknown'
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(
+            self.root, host, fetched_at.strftime('%Y%m%d'),
+            f"{fetched_at.strftime('%H%M%S%f')}-{digest}{SUFFIX}"
+        )
+
+    def save(self, url, response, fetched_at=None):
+        """응답 본문을 압축해서 저장 (실패해도 크롤링은 계속되도록 예외를 올리지 않음)"""
+        fetched_at = fetched_at or datetime.now()
+        header = {
+            'url': url,
+            'status': response.status_code,
+            'content_type': response.headers.get('Content-Type'),
+            'fetched_at': fetched_at.isoformat()
+        }
+        path = self.path_for(url, fetched_at)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=self.compresslevel) as f:
+                f.write((json.dumps(header, ensure_ascii=False) + '\n').encode('utf-8'))
+                f.write(response.content)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to archive {url}: {e!r}")
+            return None
+        return path
+
+    def entries(self, since=None, hosts=None):
+        """저장된 파일 경로를 오래된 순으로 (since: 이 날짜 이후 디렉토리만)"""
+        if not os.path.isdir(self.root):
+            return []
+        since_day = since.strftime('%Y%m%d') if since else None
+        paths = []
+        for host in sorted(os.listdir(self.root)):
+            if hosts and host not in hosts:
+                continue
+            host_dir = os.path.join(self.root, host)
+            if not os.path.isdir(host_dir):
+                continue
+            for day in sorted(os.listdir(host_dir)):
+                if since_day and day < since_day:
+                    continue
+                day_dir = os.path.join(host_dir, day)
+                paths.extend(
+                    os.path.join(day_dir, name)
+                    for name in sorted(os.listdir(day_dir)) if name.endswith(SUFFIX)
+                )
+        return paths
+
+
+def read_entry(path):
+    """(헤더 dict, 본문 bytes)"""
+    with gzip.open(path, 'rb') as f:
+        header = json.loads(f.readline().decode('utf-8'))
+        body = f.read()
+    header['fetched_at'] = datetime.fromisoformat(header['fetched_at'])
+    return header, body
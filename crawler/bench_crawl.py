@@ -0,0 +1,368 @@
+"""녹화해 둔 페이지로 크롤러 처리량을 재고 추출 결과가 바뀌지 않았는지 확인 (실제 사이트에 요청하지 않음)
+
+    # 1) 보관소(CRAWL_ARCHIVE_DIR)에서 URL 별 최신 페이지와 현재 추출 결과를 fixture 로 저장
+    python -m crawler.bench_crawl record bench_fixtures [--since 2024-12-01]
+
+    # 2) 추출 회귀 확인: fixture 를 다시 파싱해서 저장된 결과와 다르면 종료 코드 1
+    python -m crawler.bench_crawl check crawler/bench_fixtures
+
+    # 3) 로컬 HTTP 서버가 fixture 를 지연/오류와 함께 돌려주는 상태로 실제 crawl_source 경로를 실행
+    python -m crawler.bench_crawl run crawler/bench_fixtures --latency 0.05 --error-rate 0.05 --repeat 3
+
+crawler/bench_fixtures 는 저장소에 함께 있는 작은 fixture (선택자에 맞춰 만든 루키/점프볼 검색 목록과
+점프볼 기사 페이지, 키워드 이소희). record 없이 바로 check/run 할 수 있음.
+
+run 은 MONGO_URI 의 별도 DB(--db, 기본값 fanpage_bench)에 쓰고 매 회 비움.
+--mongomock 을 주면 MongoDB 없이 메모리 DB(mongomock 패키지)로 실행 (네트워크가 없는 CI 용, DB 쓰기 수는 못 셈).
+출력: 페이지/초, 페이지 종류별 파싱 시간, 크롤링당 DB 쓰기 수, 최대 메모리.
+"""
+from config import Config
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pymongo import monitoring
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlsplit, quote
+import argparse
+import contextlib
+import json
+import logging
+import os
+import random
+import resource
+import shutil
+import sys
+import threading
+import time
+import tracemalloc
+from .archive import PageArchive, read_entry
+from .sites import page_kind
+
+EXPECTED_FILE = 'expected.json'
+
+
+def latest_entries(root, since=None):
+    """보관소에서 URL 별 가장 최근 파일 {url: path}"""
+    entries = {}
+    for path in PageArchive(root).entries(since=since):
+        header, _ = read_entry(path)
+        if header['status'] == 200 and page_kind(header['url'])[0]:
+            entries[header['url']] = path
+    return entries
+
+
+def extract(path):
+    header, body = read_entry(path)
+    _, spec = page_kind(header['url'])
+    return spec.extract(spec.parse(body))
+
+
+# ---- record / check ----
+
+def record(args):
+    if not args.archive:
+        raise SystemExit("CRAWL_ARCHIVE_DIR 이 설정되지 않았습니다.")
+    entries = latest_entries(args.archive, args.since)
+    if not entries:
+        raise SystemExit("보관된 페이지가 없습니다.")
+
+    expected = {}
+    for url, path in entries.items():
+        target = os.path.join(args.fixtures, os.path.relpath(path, args.archive))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(path, target)
+        expected[url] = extract(path)
+    with open(os.path.join(args.fixtures, EXPECTED_FILE), 'w', encoding='utf-8') as f:
+        json.dump(expected, f, ensure_ascii=False, indent=1, sort_keys=True)
+    print(f"fixture {len(entries)}개 저장: {args.fixtures}")
+
+
+def check(args):
+    with open(os.path.join(args.fixtures, EXPECTED_FILE), encoding='utf-8') as f:
+        expected = json.load(f)
+    entries = latest_entries(args.fixtures)
+
+    failures = 0
+    for url, items in sorted(expected.items()):
+        if url not in entries:
+            print(f"MISSING {url}")
+            failures += 1
+            continue
+        actual = extract(entries[url])
+        if actual != items:
+            failures += 1
+            print(f"CHANGED {url}: 항목 {len(items)} -> {len(actual)}")
+            for before, after in zip(items, actual):
+                if before != after:
+                    print(f"  - {before}\n  + {after}")
+                    break
+    print(f"{len(expected) - failures}/{len(expected)} 페이지 일치")
+    return 1 if failures else 0
+
+
+# ---- 로컬 HTTP 서버 ----
+
+class StandInServer(ThreadingHTTPServer):
+    """fixture 를 URL 그대로 돌려주는 서버. /<호스트><경로>?<쿼리> 로 요청받음"""
+
+    daemon_threads = True
+
+    def __init__(self, entries, latency=0.0, error_rate=0.0):
+        super().__init__(('127.0.0.1', 0), StandInHandler)
+        self.bodies = {}
+        for url, path in entries.items():
+            header, body = read_entry(path)
+            parts = urlsplit(url)
+            key = '/' + parts.netloc + parts.path + ('?' + parts.query if parts.query else '')
+            self.bodies[key] = (header.get('content_type') or 'text/html', body)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.served = 0
+        self.errors = 0
+        self.missing = 0
+        self._lock = threading.Lock()
+
+    def count(self, field):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        if server.latency:
+            time.sleep(random.uniform(0.5, 1.5) * server.latency)
+        if random.random() < server.error_rate:
+            server.count('errors')
+            self.send_error(503)
+            return
+        entry = server.bodies.get(self.path)
+        if entry is None:
+            server.count('missing')
+            self.send_error(404)
+            return
+        server.count('served')
+        content_type, body = entry
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInAdapter(HTTPAdapter):
+    """모든 요청을 로컬 서버로 돌리는 requests 어댑터"""
+
+    def __init__(self, address, **kwargs):
+        super().__init__(**kwargs)
+        self.address = address
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        path = quote(parts.netloc + parts.path, safe='/:.-_~%')
+        request.url = f"http://{self.address}/{path}" + (f"?{parts.query}" if parts.query else '')
+        return super().send(request, **kwargs)
+
+
+class WriteCounter(monitoring.CommandListener):
+    """database 의 쓰기 명령 수와 문서 수"""
+
+    COMMANDS = {'insert': 'documents', 'update': 'updates', 'delete': 'deletes'}
+
+    def __init__(self, database):
+        self.database = database
+        self.commands = 0
+        self.operations = 0
+
+    def started(self, event):
+        field = self.COMMANDS.get(event.command_name)
+        if field and event.database_name == self.database:
+            self.commands += 1
+            self.operations += len(event.command.get(field, ()))
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+@contextlib.contextmanager
+def stand_in_engine(address, workers, rate):
+    """로컬 서버로 요청하는 HttpClient/CrawlEngine 으로 crawler.sources 를 잠시 바꿈 (보관/조건부 요청 없음)"""
+    from . import sources
+    from .engine import CrawlEngine
+    from .http import HttpClient
+
+    class StandInClient(HttpClient):
+        def session(self, host):
+            created = host not in self._sessions
+            session = super().session(host)
+            if created:
+                adapter = StandInAdapter(address, pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+            return session
+
+    client = StandInClient(backoff_base=0.01, backoff_max=0.1, pool_size=workers)
+    engine = CrawlEngine(client, max_workers=workers, rate=rate, burst=workers)
+    original = sources.crawl_engine
+    sources.crawl_engine = engine
+    try:
+        yield client
+    finally:
+        sources.crawl_engine = original
+
+
+@contextlib.contextmanager
+def use_mongomock():
+    """블록 안에서 MongoClient 를 mongomock 으로 바꿈 (MongoDB/네트워크 없이 실행)
+
+    database 모듈을 처음 import 하기 전에 들어가야 하며, 끝나면 원래 MongoClient 로 되돌림.
+    """
+    try:
+        import mongomock
+        import mongomock.gridfs
+    except ImportError:
+        raise SystemExit("--mongomock 을 쓰려면 mongomock 패키지가 필요합니다 (pip install mongomock).")
+    import pymongo.mongo_client
+
+    class InMemoryClient(mongomock.MongoClient):
+        def __init__(self, *args, **kwargs):
+            # MONGO_URI/tls 같은 pymongo 연결 옵션은 무시
+            super().__init__()
+
+    mongomock.gridfs.enable_gridfs_integration()
+    original = pymongo.mongo_client.MongoClient
+    pymongo.mongo_client.MongoClient = InMemoryClient
+    try:
+        yield
+    finally:
+        pymongo.mongo_client.MongoClient = original
+
+
+def parse_times(entries):
+    """페이지 종류별 평균 파싱+추출 시간 (ms)"""
+    times = {}
+    for url, path in entries.items():
+        kind, spec = page_kind(url)
+        _, body = read_entry(path)
+        started = time.perf_counter()
+        spec.extract(spec.parse(body))
+        times.setdefault(kind, []).append(time.perf_counter() - started)
+    return {kind: sum(values) / len(values) * 1000 for kind, values in sorted(times.items())}
+
+
+def run(args):
+    entries = latest_entries(args.fixtures)
+    if not entries:
+        raise SystemExit("fixture 가 없습니다. 먼저 record 를 실행하세요.")
+
+    # 쓰기 수를 세려면 MongoClient 가 만들어지기 전에 listener 를 등록해야 함 (mongomock 은 이벤트가 없음)
+    counter = WriteCounter(args.db)
+    if args.mongomock:
+        with use_mongomock():
+            return _run(args, entries, counter)
+    monitoring.register(counter)
+    return _run(args, entries, counter)
+
+
+def _run(args, entries, counter):
+    from database import client as mongo_client, db as app_db
+    from .sources import crawl_source
+    from indexes import ensure_indexes
+
+    if args.db == app_db.name:
+        raise SystemExit("운영 DB 에는 실행할 수 없습니다. --db 로 다른 이름을 지정하세요.")
+    db = mongo_client[args.db]
+    server = StandInServer(entries, args.latency, args.error_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    address = f"127.0.0.1:{server.server_address[1]}"
+    keywords = args.keywords.split(',') if args.keywords else None
+
+    print(f"fixture {len(entries)}개, 지연 {args.latency}s, 오류율 {args.error_rate:.0%}, 동시 요청 {args.workers}")
+    try:
+        with stand_in_engine(address, args.workers, args.rate) as client:
+            for run_index in range(args.repeat):
+                for site in args.site:
+                    collection = db[f"news_{site}"]
+                    collection.drop()
+                    ensure_indexes(db, [collection.name])
+                    if args.incremental:
+                        crawl_source(site, db, keywords=keywords, backfill=args.backfill)
+
+                    served, errors = server.served, server.errors
+                    commands, operations = counter.commands, counter.operations
+                    tracemalloc.start()
+                    started = time.perf_counter()
+                    new_articles = crawl_source(site, db, keywords=keywords, backfill=args.backfill)
+                    elapsed = time.perf_counter() - started
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+
+                    pages = server.served - served
+                    writes = 'n/a' if args.mongomock else (
+                        f"{counter.commands - commands} cmds/{counter.operations - operations} ops"
+                    )
+                    print(
+                        f"[{run_index + 1}] {site:8} pages {pages:4d} ({server.errors - errors} errors) "
+                        f"{elapsed:6.2f}s {pages / elapsed if elapsed else 0:7.1f} pages/s  "
+                        f"new {len(new_articles):4d}  db writes {writes}  peak {peak / 1024 / 1024:.1f} MB"
+                    )
+            print(f"http: {client.stats()}")
+    finally:
+        server.shutdown()
+        for site in args.site:
+            db[f"news_{site}"].drop()
+
+    for kind, ms in parse_times(entries).items():
+        print(f"parse {kind:17}: {ms:7.2f} ms/page")
+    print(f"max RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB")
+    if server.missing:
+        print(f"fixture 에 없는 URL 요청 {server.missing}개 (키워드/페이지가 녹화 당시와 다름)")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="녹화한 페이지로 크롤러 벤치마크/회귀 확인")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = commands.add_parser('record', help="보관소에서 fixture 만들기")
+    record_parser.add_argument('fixtures')
+    record_parser.add_argument('--archive', default=Config.CRAWL_ARCHIVE_DIR)
+    record_parser.add_argument('--since', type=lambda value: datetime.strptime(value, '%Y-%m-%d'))
+
+    check_parser = commands.add_parser('check', help="추출 결과가 녹화 당시와 같은지 확인")
+    check_parser.add_argument('fixtures')
+
+    run_parser = commands.add_parser('run', help="로컬 서버로 실제 크롤링 경로 실행")
+    run_parser.add_argument('fixtures')
+    run_parser.add_argument('--site', choices=['rookie', 'jumpball'], action='append')
+    run_parser.add_argument('--keywords', help="쉼표로 구분 (기본값: CRAWL_KEYWORDS)")
+    run_parser.add_argument('--latency', type=float, default=0.05, help="응답 지연 초 (±50%%)")
+    run_parser.add_argument('--error-rate', type=float, default=0.0, help="503 을 돌려줄 비율 (0~1)")
+    run_parser.add_argument('--workers', type=int, default=Config.CRAWL_MAX_WORKERS)
+    run_parser.add_argument('--rate', type=float, default=1000.0, help="호스트별 초당 요청 수")
+    run_parser.add_argument('--repeat', type=int, default=1)
+    run_parser.add_argument('--backfill', action='store_true', help="기준 날짜 없이 모든 페이지 확인")
+    run_parser.add_argument('--incremental', action='store_true', help="한 번 저장한 뒤 증분 크롤링을 측정")
+    run_parser.add_argument('--db', default='fanpage_bench')
+    run_parser.add_argument('--mongomock', action='store_true', help="MongoDB 대신 메모리 DB 사용 (mongomock 필요)")
+    run_parser.add_argument('-v', '--verbose', action='store_true', help="크롤러 로그 보기")
+
+    args = parser.parse_args()
+    if args.command == 'record':
+        record(args)
+    elif args.command == 'check':
+        sys.exit(check(args))
+    else:
+        if args.verbose:
+            logging.basicConfig(level=logging.INFO)
+        args.site = args.site or ['rookie', 'jumpball']
+        sys.exit(run(args))
+
+
+if __name__ == '__main__':
+    main()
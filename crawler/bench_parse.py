@@ -0,0 +1,79 @@
+"""저장해 둔 페이지로 전체 파싱과 필요한 부분만 파싱하는 방식의 속도 비교
+
+    python -m crawler.bench_parse --page rookie_listing saved/rookie_*.html [-n 20]
+
+페이지 종류: rookie_listing, jumpball_listing, jumpball_article
+"""
+from bs4 import BeautifulSoup
+import argparse
+import glob
+import os
+import time
+from .sites import PARSER, ROOKIE_LISTING, JUMPBALL_LISTING, JUMPBALL_ARTICLE
+
+PAGES = {
+    'rookie_listing': ROOKIE_LISTING,
+    'jumpball_listing': JUMPBALL_LISTING,
+    'jumpball_article': JUMPBALL_ARTICLE,
+}
+
+
+def full_parse(spec, content):
+    """이전 방식: 문서 전체를 html.parser 로 파싱한 뒤 선택"""
+    return spec.extract(BeautifulSoup(content, 'html.parser'))
+
+
+def targeted_parse(spec, content):
+    return spec.extract(spec.parse(content))
+
+
+def measure(parse, spec, contents, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for content in contents:
+            parse(spec, content)
+    return (time.perf_counter() - started) / (repeat * len(contents))
+
+
+def load_pages(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '*.html'))))
+        else:
+            files.extend(sorted(glob.glob(path)))
+    contents = []
+    for file in files:
+        with open(file, 'rb') as f:
+            contents.append(f.read())
+    return contents
+
+
+def main():
+    parser = argparse.ArgumentParser(description="크롤러 파싱 마이크로벤치마크")
+    parser.add_argument('--page', choices=sorted(PAGES), required=True)
+    parser.add_argument('-n', '--repeat', type=int, default=20)
+    parser.add_argument('paths', nargs='+', help="저장한 HTML 파일 또는 디렉토리")
+    args = parser.parse_args()
+
+    spec = PAGES[args.page]
+    contents = load_pages(args.paths)
+    if not contents:
+        raise SystemExit("HTML 파일이 없습니다.")
+
+    full_items = [full_parse(spec, content) for content in contents]
+    targeted_items = [targeted_parse(spec, content) for content in contents]
+    if full_items != targeted_items:
+        raise SystemExit("두 방식의 추출 결과가 다릅니다. crawler/sites.py 의 keep 정의를 확인하세요.")
+
+    full = measure(full_parse, spec, contents, args.repeat)
+    targeted = measure(targeted_parse, spec, contents, args.repeat)
+    size = sum(len(content) for content in contents) / len(contents)
+    print(f"pages: {len(contents)} (avg {size / 1024:.1f} KB), items: {sum(len(items) for items in full_items)}")
+    print(f"full     (html.parser): {full * 1000:8.2f} ms/page")
+    print(f"targeted ({PARSER}): {targeted * 1000:8.2f} ms/page")
+    print(f"speedup: {full / targeted:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+"""루키/점프볼에 같은 내용으로 올라온 기사 묶기 (MinHash + LSH)
+
+제목+요약을 공백/기호를 뺀 글자 3개 단위(shingle)로 나눠 MinHash 서명(NUM_PERM 개)을 만들고,
+서명을 BANDS 개 구간으로 나눈 해시(lsh)를 기사 문서에 저장함. lsh 에 인덱스(indexes.py)가 있으므로 새 기사는
+구간 하나라도 같은 기사만 후보로 조회해서 비교함 (전체 기사와 비교하지 않음).
+
+같은 기사로 판단되면 같은 cluster(처음 저장된 기사의 link)를 갖고, 처음 기사가 아닌 것은
+duplicate_of 가 붙음. 목록 API 는 duplicate_of 가 없는 기사만 보여 주면 한 번씩만 나옴.
+
+    python -m crawler.dedup --rebuild     # 저장된 기사 전체의 서명/묶음을 다시 계산
+"""
+from database import db
+from datetime import datetime
+import argparse
+import hashlib
+import random
+import re
+
+COLLECTIONS = ('news_rookie', 'news_jumpball')
+
+SHINGLE_SIZE = 3
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+# 추정 Jaccard 유사도가 이 값 이상이면 같은 기사 (BANDS/ROWS 로 후보가 되는 기준도 약 0.5)
+THRESHOLD = 0.5
+
+_PRIME = (1 << 61) - 1
+_random = random.Random(20241112)
+_PERMUTATIONS = [(_random.randrange(1, _PRIME), _random.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+_NON_WORD = re.compile(r'[\W_]+', re.UNICODE)
+
+
+def shingles(text):
+    """공백/기호를 뺀 글자 SHINGLE_SIZE 개 단위 집합 (한글은 형태소 분석 없이 글자 단위가 잘 맞음)"""
+    text = _NON_WORD.sub('', (text or '').lower())
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def _hash(value):
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def minhash(text):
+    hashes = [_hash(shingle) for shingle in shingles(text)]
+    if not hashes:
+        return None
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def lsh_keys(signature):
+    """"<구간 번호>:<구간 해시>" 목록"""
+    keys = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS:(band + 1) * ROWS]
+        digest = hashlib.blake2b(repr(rows).encode('ascii'), digest_size=8).hexdigest()
+        keys.append(f"{band}:{digest}")
+    return keys
+
+
+def similarity(first, second):
+    """두 서명으로 추정한 Jaccard 유사도"""
+    return sum(1 for a, b in zip(first, second) if a == b) / NUM_PERM
+
+
+def article_text(article):
+    return f"{article.get('title') or ''} {article.get('summary') or ''}"
+
+
+def signature_fields(article):
+    """기사 문서에 저장할 {'minhash', 'lsh'} (글자가 없으면 빈 dict)"""
+    signature = minhash(article_text(article))
+    if signature is None:
+        return {}
+    return {'minhash': signature, 'lsh': lsh_keys(signature)}
+
+
+def find_similar(database, article):
+    """lsh 구간이 하나라도 같은 기사 중 THRESHOLD 이상인 것 [(유사도, 문서)] (두 컬렉션 모두)"""
+    if not article.get('lsh'):
+        return []
+    matches = []
+    for name in COLLECTIONS:
+        candidates = database[name].find(
+            {'lsh': {'$in': article['lsh']}, 'link': {'$ne': article['link']}},
+            {'link': 1, 'minhash': 1, 'cluster': 1, 'created_at': 1}
+        )
+        for candidate in candidates:
+            score = similarity(article['minhash'], candidate['minhash'])
+            if score >= THRESHOLD:
+                matches.append((score, candidate))
+    return matches
+
+
+def _set_cluster(database, links, cluster):
+    others = [link for link in links if link != cluster]
+    for name in COLLECTIONS:
+        database[name].update_many({'link': {'$in': others}}, {'$set': {'cluster': cluster, 'duplicate_of': cluster}})
+        # 묶음의 대표 기사에는 duplicate_of 를 두지 않음
+        database[name].update_one({'link': cluster}, {'$set': {'cluster': cluster}, '$unset': {'duplicate_of': ''}})
+
+
+def assign_cluster(database, article):
+    """저장된 article 을 비슷한 기사의 묶음에 넣음. 묶음 대표 link 반환 (비슷한 기사가 없으면 None)
+
+    새 기사가 서로 다른 묶음과 비슷하면 하나로 합치고, 가장 먼저 작성된 기사를 대표로 함.
+    """
+    matches = find_similar(database, article)
+    if not matches:
+        return None
+
+    clusters = {candidate.get('cluster') or candidate['link'] for _, candidate in matches}
+    clusters.add(article.get('cluster') or article['link'])
+    members = {article['link']: article.get('created_at')}
+    members.update((candidate['link'], candidate.get('created_at')) for _, candidate in matches)
+    for name in COLLECTIONS:
+        for doc in database[name].find({'cluster': {'$in': list(clusters)}}, {'link': 1, 'created_at': 1}):
+            members[doc['link']] = doc.get('created_at')
+
+    cluster = min(members, key=lambda link: (members[link] is None, members[link] or datetime.min, link))
+    _set_cluster(database, members, cluster)
+    return cluster
+
+
+def cluster_articles(database, articles):
+    """crawl_source 가 새로 저장한 기사들을 차례로 묶음에 넣고 묶인 기사 수 반환"""
+    clustered = 0
+    for article in articles:
+        if assign_cluster(database, article):
+            clustered += 1
+    return clustered
+
+
+def collapse_filter():
+    """목록에서 같은 기사는 대표 하나만 남기는 조건"""
+    return {'duplicate_of': {'$exists': False}}
+
+
+# 목록 응답에서 뺄 필드 (서명은 클라이언트에 필요 없고 JS 정수 범위를 넘음)
+SIGNATURE_PROJECTION = {'minhash': 0, 'lsh': 0}
+
+
+def cluster_links(database, article):
+    """article 과 같은 묶음에 있는 다른 기사 link 목록"""
+    if not article.get('cluster'):
+        return []
+    return [
+        doc['link']
+        for name in COLLECTIONS
+        for doc in database[name].find({'cluster': article['cluster'], 'link': {'$ne': article['link']}}, {'link': 1})
+    ]
+
+
+def rebuild(database):
+    """모든 기사의 서명을 다시 계산하고 작성 시간 순으로 묶음을 다시 만듦"""
+    documents = []
+    for name in COLLECTIONS:
+        database[name].update_many({}, {'$unset': {'cluster': '', 'duplicate_of': ''}})
+        for doc in database[name].find({}, {'link': 1, 'title': 1, 'summary': 1, 'created_at': 1}):
+            fields = signature_fields(doc)
+            database[name].update_one({'_id': doc['_id']}, {'$set': fields} if fields else {'$unset': {'minhash': '', 'lsh': ''}})
+            doc.update(fields)
+            documents.append((name, doc))
+
+    documents.sort(key=lambda item: (item[1].get('created_at') is None, item[1].get('created_at') or datetime.min))
+    clustered = sum(1 for _, doc in documents if assign_cluster(database, doc))
+    return len(documents), clustered
+
+
+def main():
+    parser = argparse.ArgumentParser(description="루키/점프볼 중복 기사 묶기")
+    parser.add_argument('--rebuild', action='store_true', help="저장된 기사 전체 다시 계산")
+    args = parser.parse_args()
+    if not args.rebuild:
+        parser.print_help()
+        return
+    # lsh/cluster 인덱스 (indexes.py)
+    from indexes import ensure_indexes
+    ensure_indexes(db)
+    total, clustered = rebuild(db)
+    from conditional import bump_version
+    bump_version(*COLLECTIONS, database=db)
+    print(f"기사 {total}개 중 {clustered}개를 다른 기사와 묶음")
+
+
+if __name__ == '__main__':
+    main()
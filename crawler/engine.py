@@ -0,0 +1,125 @@
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from database import crawl_http_cache
+from urllib.parse import urlsplit
+import logging
+import threading
+import time
+from .archive import PageArchive
+from .http import HttpClient, ValidatorStore
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """초당 rate 개, 최대 burst 개까지 모아 둘 수 있는 토큰 버킷"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 기다림 (기다린 시간 반환)"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class CrawlEngine:
+    """호스트별 속도 제한을 지키면서 여러 페이지를 동시에 가져오는 크롤러 엔진
+
+    요청마다 sleep 하는 대신 호스트별 토큰 버킷으로 간격을 맞추므로, 전체 소요 시간은
+    요청 수 / 초당 허용 요청 수 에 비례함. 버킷과 스레드 풀은 같은 프로세스의 모든 크롤링이 공유함.
+    """
+
+    def __init__(self, client, max_workers=None, rate=None, burst=None):
+        self.client = client
+        self.max_workers = max_workers or Config.CRAWL_MAX_WORKERS
+        self.rate = rate or Config.CRAWL_HOST_RATE
+        self.burst = burst or Config.CRAWL_HOST_BURST
+        self._buckets = {}
+        self._buckets_lock = threading.Lock()
+        # 스레드는 처음 submit 할 때 만들어지므로 gunicorn fork 이후에 생성됨
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='crawler')
+
+    def _bucket(self, url):
+        host = urlsplit(url).netloc
+        with self._buckets_lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return bucket
+
+    def fetch(self, url, params=None, conditional=True):
+        """속도 제한을 지켜서 GET (재시도/조건부 요청은 HttpClient 가 처리)"""
+        return self.client.get(url, params=params, conditional=conditional, throttle=self._bucket(url).acquire)
+
+    def fetch_all(self, urls, params=None, conditional=True):
+        """urls 를 동시에 가져와서 입력 순서대로 응답 목록 반환 (실패한 항목은 None)"""
+        futures = [self._executor.submit(self.fetch, url, params, conditional) for url in urls]
+        responses = []
+        for url, future in zip(urls, futures):
+            try:
+                responses.append(future.result())
+            except Exception as e:
+                logger.warning(f"Failed to fetch {url}: {e!r}")
+                responses.append(None)
+        return responses
+
+    def walk_pages(self, url, page_params, page_count, first=None, prefetch=None, conditional=True):
+        """1 ~ page_count 페이지를 순서대로 (페이지 번호, 응답) 으로 내보내는 generator
+
+        - first: 이미 받은 1페이지 응답 (다시 요청하지 않음)
+        - prefetch: 지금 처리 중인 페이지 뒤로 미리 요청해 둘 페이지 수 (page_count 면 전체를 한 번에)
+        - 호출하는 쪽이 break 하면 아직 시작하지 않은 요청은 취소됨
+        요청이 실패한 페이지는 응답이 None.
+        """
+        prefetch = max(Config.CRAWL_PREFETCH_PAGES if prefetch is None else prefetch, 0)
+        pending = {}
+        next_page = 1
+
+        def schedule(until):
+            nonlocal next_page
+            while next_page <= min(until, page_count):
+                if next_page == 1 and first is not None:
+                    pending[1] = None
+                else:
+                    pending[next_page] = self._executor.submit(self.fetch, url, page_params(next_page), conditional)
+                next_page += 1
+
+        try:
+            for page in range(1, page_count + 1):
+                schedule(page + prefetch)
+                future = pending.pop(page)
+                if future is None:
+                    response = first
+                else:
+                    try:
+                        response = future.result()
+                    except Exception as e:
+                        logger.warning(f"Failed to fetch page {page} of {url}: {e!r}")
+                        response = None
+                yield page, response
+        finally:
+            cancelled = sum(1 for future in pending.values() if future is not None and future.cancel())
+            if cancelled:
+                logger.info(f"Cancelled {cancelled} prefetched pages of {url}")
+
+
+http_client = HttpClient(
+    ValidatorStore(crawl_http_cache),
+    archive=PageArchive(Config.CRAWL_ARCHIVE_DIR) if Config.CRAWL_ARCHIVE_DIR else None
+)
+crawl_engine = CrawlEngine(http_client)
@@ -0,0 +1,192 @@
+from bson import Binary
+from config import Config
+from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib.parse import urlsplit
+import gzip
+import logging
+import random
+import requests
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# 다시 시도하면 성공할 수 있는 응답 코드
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class HttpMetrics:
+    """호스트별 요청 수/응답 바이트/소요 시간 카운터"""
+
+    FIELDS = ('requests', 'not_modified', 'retries', 'errors', 'bytes', 'seconds')
+
+    def __init__(self):
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def add(self, host, **counts):
+        with self._lock:
+            entry = self._hosts.setdefault(host, dict.fromkeys(self.FIELDS, 0))
+            for field, value in counts.items():
+                entry[field] += value
+
+    def stats(self):
+        with self._lock:
+            return {
+                host: {**entry, 'seconds': round(entry['seconds'], 3)}
+                for host, entry in self._hosts.items()
+            }
+
+
+class ValidatorStore:
+    """URL 별 ETag/Last-Modified 와 마지막 200 응답 본문(gzip)을 Mongo 에 저장
+
+    304 가 오면 저장해 둔 본문으로 응답을 만들어 주므로 호출하는 쪽은 그대로 파싱하면 됨.
+    항목은 ttl 초 뒤에 만료되고 expires_at TTL 인덱스(indexes.py)로 지워지므로
+    한 번 받고 다시 요청하지 않는 페이지가 계속 쌓이지 않음.
+    """
+
+    def __init__(self, collection, ttl=None):
+        self.collection = collection
+        self.ttl = Config.CRAWL_VALIDATOR_TTL if ttl is None else ttl
+
+    def get(self, url):
+        try:
+            return self.collection.find_one({'_id': url, 'expires_at': {'$gt': datetime.utcnow()}})
+        except Exception as e:
+            logger.warning(f"Failed to read validators for {url}: {e!r}")
+            return None
+
+    def save(self, url, response):
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        now = datetime.utcnow()
+        try:
+            self.collection.update_one({'_id': url}, {'$set': {
+                'etag': etag,
+                'last_modified': last_modified,
+                'content_type': response.headers.get('Content-Type'),
+                'body': Binary(gzip.compress(response.content)),
+                'fetched_at': now,
+                'expires_at': now + timedelta(seconds=self.ttl)
+            }}, upsert=True)
+        except Exception as e:
+            logger.warning(f"Failed to save validators for {url}: {e!r}")
+
+    @staticmethod
+    def conditional_headers(entry):
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    @staticmethod
+    def cached_response(url, entry):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = gzip.decompress(entry['body'])
+        response.headers = CaseInsensitiveDict({'Content-Type': entry.get('content_type') or 'text/html'})
+        response.from_cache = True
+        return response
+
+
+class HttpClient:
+    """모든 크롤러가 함께 쓰는 HTTP 클라이언트
+
+    - 호스트마다 keep-alive 세션을 하나씩 두고 연결을 재사용
+    - 연결 오류/429/5xx 는 jitter 를 준 지수 백오프로 재시도 (Retry-After 가 있으면 따름)
+    - ETag/Last-Modified 로 조건부 요청을 보내서 바뀌지 않은 페이지는 304 로 받음
+    - 호스트별 요청 수, 응답 바이트, 소요 시간을 기록
+    - archive 가 있으면 네트워크로 받은 200 응답 원본을 압축해서 보관 (crawler/archive.py)
+    """
+
+    def __init__(self, validator_store=None, timeout=None, retries=None,
+                 backoff_base=None, backoff_max=None, pool_size=None, headers=None, archive=None):
+        self.validators = validator_store
+        self.archive = archive
+        self.timeout = timeout or Config.CRAWL_TIMEOUT
+        self.retries = Config.CRAWL_RETRIES if retries is None else retries
+        self.backoff_base = Config.CRAWL_BACKOFF_BASE if backoff_base is None else backoff_base
+        self.backoff_max = Config.CRAWL_BACKOFF_MAX if backoff_max is None else backoff_max
+        self.pool_size = pool_size or Config.CRAWL_MAX_WORKERS
+        self.headers = headers or DEFAULT_HEADERS
+        self.metrics = HttpMetrics()
+        self._sessions = {}
+        self._sessions_lock = threading.Lock()
+
+    def session(self, host):
+        with self._sessions_lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                session.headers.update(self.headers)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[host] = session
+            return session
+
+    def backoff(self, attempt, response=None):
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def get(self, url, params=None, conditional=True, throttle=None):
+        """GET 요청. throttle 은 매 시도 전에 호출됨 (호스트별 속도 제한)
+
+        마지막 시도까지 연결 오류면 requests 예외를 올리고, 그 외 응답은 상태 코드와 관계없이 반환.
+        304 는 저장해 둔 본문으로 만든 200 응답(response.from_cache = True)으로 바꿔서 돌려줌.
+        """
+        full_url = requests.Request('GET', url, params=params).prepare().url
+        host = urlsplit(full_url).netloc
+        session = self.session(host)
+
+        entry = self.validators.get(full_url) if conditional and self.validators else None
+        headers = ValidatorStore.conditional_headers(entry) if entry else {}
+
+        for attempt in range(self.retries + 1):
+            if throttle is not None:
+                throttle()
+            started = time.monotonic()
+            try:
+                response = session.get(full_url, headers=headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                self.metrics.add(host, requests=1, errors=1, seconds=time.monotonic() - started)
+                if attempt == self.retries:
+                    raise
+                logger.warning(f"Retrying {full_url} after {e!r}")
+                self.metrics.add(host, retries=1)
+                time.sleep(self.backoff(attempt))
+                continue
+
+            self.metrics.add(host, requests=1, bytes=len(response.content), seconds=time.monotonic() - started)
+            if response.status_code in RETRY_STATUSES and attempt < self.retries:
+                logger.warning(f"Retrying {full_url} after HTTP {response.status_code}")
+                self.metrics.add(host, retries=1)
+                time.sleep(self.backoff(attempt, response))
+                continue
+
+            if response.status_code == 304 and entry is not None:
+                self.metrics.add(host, not_modified=1)
+                return ValidatorStore.cached_response(full_url, entry)
+            if response.status_code == 200 and self.archive is not None:
+                self.archive.save(full_url, response)
+            if response.status_code == 200 and conditional and self.validators:
+                self.validators.save(full_url, response)
+            response.from_cache = False
+            return response
+
+    def stats(self):
+        return self.metrics.stats()
@@ -0,0 +1,187 @@
+"""보관해 둔 원본 페이지(crawler/archive.py)를 네트워크 없이 다시 파싱해서 기사 컬렉션을 맞춤
+
+    python -m crawler.replay                       # 전체 보관소, 모든 사이트
+    python -m crawler.replay --site jumpball --since 2024-12-01
+    python -m crawler.replay --dry-run             # DB 에 쓰지 않고 개수만 출력
+
+추출 규칙(crawler/sites.py)을 고친 뒤 다시 크롤링하지 않고 저장된 기사를 고칠 때 사용.
+파싱은 CPU 코어 수만큼 프로세스로 나눠서 하고, 같은 URL 은 가장 최근에 받은 페이지만 씀.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from config import Config
+from datetime import datetime
+from pymongo import UpdateOne
+from urllib.parse import urlsplit, parse_qs
+import argparse
+import os
+import time
+from .archive import PageArchive, read_entry
+from .sites import (
+    ROOKIE_EXCLUDED_TITLES, JUMPBALL_CUTOFF,
+    page_kind, parse_jumpball_date, rookie_article, jumpball_article
+)
+
+# 사이트 -> 보관소의 호스트 디렉토리
+SITE_HOSTS = {
+    'rookie': 'www.rookie.co.kr',
+    'jumpball': 'jumpball.co.kr',
+}
+
+
+def parse_entry(path):
+    """보관 파일 하나를 파싱 (프로세스 풀에서 실행). 모르는 페이지나 200 이 아니면 None"""
+    header, body = read_entry(path)
+    kind, spec = page_kind(header['url'])
+    if kind is None or header['status'] != 200:
+        return None
+    return {
+        'url': header['url'],
+        'fetched_at': header['fetched_at'],
+        'kind': kind,
+        'items': spec.extract(spec.parse(body))
+    }
+
+
+def latest_pages(paths, workers=None):
+    """URL 별로 가장 최근에 받은 페이지의 파싱 결과 {url: page}"""
+    pages = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(paths) // ((workers or os.cpu_count() or 1) * 4))
+        for page in executor.map(parse_entry, paths, chunksize=chunksize):
+            if page is None:
+                continue
+            current = pages.get(page['url'])
+            if current is None or page['fetched_at'] > current['fetched_at']:
+                pages[page['url']] = page
+    return pages
+
+
+def _query_param(url, name):
+    values = parse_qs(urlsplit(url).query).get(name)
+    return values[0] if values else None
+
+
+def _tags(title, query):
+    """제목에 들어 있는 추적 키워드 (검색어 포함, crawler/sources.py 와 같은 규칙)"""
+    keywords = list(Config.CRAWL_KEYWORDS) + ([query] if query and query not in Config.CRAWL_KEYWORDS else [])
+    return [keyword for keyword in keywords if keyword in title]
+
+
+def rookie_articles(pages):
+    """루키 검색 목록 페이지 -> 기사 (실시간 크롤링과 같은 필터: 제외 제목, 제목 키워드, 날짜)"""
+    articles = {}
+    for page in pages.values():
+        if page['kind'] != 'rookie_listing':
+            continue
+        query = _query_param(page['url'], 'sc_word')
+        for item in page['items']:
+            article = rookie_article(item)
+            if article is None or not article['created_at']:
+                continue
+            if any(excluded in article['title'] for excluded in ROOKIE_EXCLUDED_TITLES):
+                continue
+            if query and query not in article['title']:
+                continue
+            article['keywords'] = _tags(article['title'], query)
+            articles[article['link']] = article
+    return list(articles.values())
+
+
+def jumpball_articles(pages):
+    """점프볼 검색 목록 + 상세 페이지 -> 기사 (작성 시간은 보관된 상세 페이지에서)"""
+    created = {}
+    for page in pages.values():
+        if page['kind'] == 'jumpball_article' and page['items'] and page['items'][0]['date_text']:
+            created[page['url']] = parse_jumpball_date(page['items'][0]['date_text'])
+
+    articles = {}
+    for page in pages.values():
+        if page['kind'] != 'jumpball_listing':
+            continue
+        query = _query_param(page['url'], 'q')
+        for item in page['items']:
+            article = jumpball_article(item)
+            if article is None or (query and query not in article['title']):
+                continue
+            created_at = created.get(article['link'])
+            if not created_at or created_at <= JUMPBALL_CUTOFF:
+                continue
+            article['created_at'] = created_at
+            article['keywords'] = _tags(article['title'], query)
+            articles[article['link']] = article
+    return list(articles.values())
+
+
+def reconcile(collection, articles):
+    """link 기준으로 upsert. 보관된 페이지의 값으로 기존 문서의 필드를 덮어쓰고 키워드 태그는 추가
+
+    MinHash 서명은 크롤링과 같은 signature_fields 로 다시 계산하고, 새로 추가된 기사는 비슷한 기사의
+    묶음에 넣음 (crawler/dedup.py) -> (추가, 수정, 묶음) 개수
+    """
+    if not articles:
+        return 0, 0, 0
+    # dedup 은 DB 에 연결하므로 --dry-run 에서는 import 하지 않음
+    from .dedup import signature_fields, cluster_articles
+
+    operations = []
+    for article in articles:
+        article.update(signature_fields(article))
+        fields = {key: value for key, value in article.items() if key != 'keywords'}
+        operations.append(UpdateOne(
+            {'link': article['link']},
+            {'$set': fields, '$addToSet': {'keywords': {'$each': article.get('keywords', [])}}},
+            upsert=True
+        ))
+    result = collection.bulk_write(operations, ordered=False)
+    inserted = [articles[index] for index in result.upserted_ids]
+    clustered = cluster_articles(collection.database, inserted)
+    return result.upserted_count, result.modified_count, clustered
+
+
+BUILDERS = {
+    'rookie': ('news_rookie', rookie_articles),
+    'jumpball': ('news_jumpball', jumpball_articles),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="보관된 크롤링 페이지 재파싱")
+    parser.add_argument('--site', choices=sorted(SITE_HOSTS), action='append', help="기본값: 모든 사이트")
+    parser.add_argument('--since', type=lambda value: datetime.strptime(value, '%Y-%m-%d'), help="YYYY-MM-DD 이후 보관분만")
+    parser.add_argument('--workers', type=int, default=None, help="파싱 프로세스 수 (기본값: CPU 코어 수)")
+    parser.add_argument('--archive', default=Config.CRAWL_ARCHIVE_DIR, help="보관소 경로 (기본값: CRAWL_ARCHIVE_DIR)")
+    parser.add_argument('--dry-run', action='store_true', help="DB 에 쓰지 않고 개수만 출력")
+    args = parser.parse_args()
+
+    if not args.archive:
+        raise SystemExit("CRAWL_ARCHIVE_DIR 이 설정되지 않았습니다.")
+    sites = args.site or sorted(SITE_HOSTS)
+    paths = PageArchive(args.archive).entries(since=args.since, hosts={SITE_HOSTS[site] for site in sites})
+    if not paths:
+        raise SystemExit("보관된 페이지가 없습니다.")
+
+    started = time.perf_counter()
+    pages = latest_pages(paths, args.workers)
+    print(f"보관 파일 {len(paths)}개, 파싱한 페이지 {len(pages)}개 ({time.perf_counter() - started:.2f}s)")
+
+    if not args.dry_run:
+        from database import db
+        from conditional import bump_version
+
+    for site in sites:
+        collection_name, build = BUILDERS[site]
+        articles = build(pages)
+        if args.dry_run:
+            print(f"{site}: 기사 {len(articles)}개")
+            continue
+        inserted, modified, clustered = reconcile(db[collection_name], articles)
+        if clustered:
+            # 묶음은 두 사이트에 걸침
+            bump_version('news_rookie', 'news_jumpball', database=db)
+        elif modified:
+            bump_version(collection_name, database=db)
+        print(f"{site}: 기사 {len(articles)}개, 추가 {inserted}개, 수정 {modified}개, 묶음 {clustered}개")
+
+
+if __name__ == '__main__':
+    main()
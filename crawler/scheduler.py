@@ -0,0 +1,272 @@
+"""크롤링 스케줄러
+
+    python -m crawler.scheduler            # 계속 실행 (CRAWL_SCHEDULER_POLL 초마다 확인)
+    python -m crawler.scheduler --once     # 한 번만 확인하고 종료
+    python -m crawler.scheduler --job rookie   # 주기와 관계없이 바로 크롤링
+    python -m crawler.scheduler --job rookie --backfill   # 모든 페이지를 다시 확인
+
+CRAWL_SCHEDULER_ENABLED=true 면 앱 프로세스 안의 백그라운드 스레드로도 돌아감.
+여러 gunicorn 워커/서버에서 동시에 돌아도 crawl_info 의 lease 문서를 가진 하나만 크롤링함.
+"""
+from config import Config
+from database import db, crawl_info
+from datetime import datetime, timedelta, timezone
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+import argparse
+import logging
+import os
+import socket
+import threading
+import uuid
+from .sources import crawl_source
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = 'crawl_lease'
+SCHEDULER_NAME = 'crawl_scheduler'
+
+# 작업 이름(crawler/sources.py 의 사이트 이름) -> 마지막 크롤링 시간을 저장하는 crawl_info 문서 _id
+# (lease 처럼 고정된 _id 로 찾으므로 fencing 이 name 인덱스에 의존하지 않음)
+JOBS = {
+    'rookie': 'last:rookie',
+    'jumpball': 'last:jumpball',
+}
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def default_owner():
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class Lease:
+    """crawl_info 문서 하나로 구현한 만료 시간이 있는 분산 lock
+
+    문서는 고정된 _id(=name) 로 찾으므로 소유자가 하나뿐인 것은 _id 의 unique 보장에만 의존함
+    (보조 인덱스가 없거나 만들지 못해도 문서가 두 개 생기지 않음).
+    lease 를 얻을 때마다 token 이 1 씩 올라가며(fencing token), 이 token 으로 기록한 결과는
+    더 큰 token 을 가진 다음 소유자의 기록을 덮어쓰지 못함.
+    """
+
+    def __init__(self, collection, name, ttl, owner=None):
+        self.collection = collection
+        self.name = name
+        self.ttl = ttl
+        self.owner = owner or default_owner()
+        self.token = None
+
+    def acquire(self):
+        """lease 를 얻으면 fencing token, 다른 곳에서 가지고 있으면 None"""
+        now = _now()
+        try:
+            doc = self.collection.find_one_and_update(
+                {'_id': self.name, '$or': [{'expires_at': {'$lte': now}}, {'owner': self.owner}]},
+                {
+                    '$set': {'owner': self.owner, 'expires_at': now + timedelta(seconds=self.ttl), 'acquired_at': now},
+                    '$inc': {'token': 1}
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # 문서는 있지만 만료되지 않은 다른 소유자가 있음
+            return None
+        self.token = doc['token']
+        return self.token
+
+    def _owned(self):
+        return {'_id': self.name, 'owner': self.owner, 'token': self.token}
+
+    def heartbeat(self):
+        """만료 시간 연장. lease 를 잃었으면 False"""
+        result = self.collection.update_one(
+            self._owned(),
+            {'$set': {'expires_at': _now() + timedelta(seconds=self.ttl)}}
+        )
+        return result.matched_count == 1
+
+    def release(self):
+        self.collection.update_one(self._owned(), {'$set': {'expires_at': _now()}})
+        self.token = None
+
+
+class LeaseKeeper:
+    """작업하는 동안 ttl/3 마다 heartbeat 를 보내는 스레드"""
+
+    def __init__(self, lease):
+        self.lease = lease
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='crawl-lease', daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(max(self.lease.ttl / 3, 1)):
+            try:
+                if not self.lease.heartbeat():
+                    self.lost = True
+                    logger.warning(f"Lost crawl lease {self.lease.name} (token {self.lease.token})")
+                    return
+            except Exception as e:
+                logger.warning(f"Crawl lease heartbeat failed: {e!r}")
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def crawl_due(job, now=None):
+    last_crawl = crawl_info.find_one({'_id': JOBS[job]})
+    if not last_crawl:
+        return True
+    return (now or datetime.now()) - last_crawl['date'] > timedelta(seconds=Config.CRAWL_INTERVAL)
+
+
+def _request_name(job):
+    return f"{job}_crawl_request"
+
+
+def request_crawl(job):
+    crawl_info.update_one({'name': _request_name(job)}, {'$set': {'requested_at': _now()}}, upsert=True)
+
+
+def crawl_requested(job):
+    return crawl_info.find_one({'name': _request_name(job)}) is not None
+
+
+def record_crawl(job, token):
+    """마지막 크롤링 시간 기록. 더 새로운 lease 가 이미 기록했으면 False (fencing)
+
+    token 이 더 크면 조건이 맞지 않아 upsert 가 같은 _id 로 새 문서를 만들려다 DuplicateKeyError 가 남.
+    """
+    try:
+        crawl_info.update_one(
+            {'_id': JOBS[job], '$or': [{'token': {'$lt': token}}, {'token': {'$exists': False}}]},
+            {'$set': {'date': datetime.now(), 'token': token}},
+            upsert=True
+        )
+        return True
+    except DuplicateKeyError:
+        return False
+
+
+def run_pending(jobs=None, force=False, owner=None, backfill=False):
+    """lease 를 얻은 경우에만 주기가 지났거나 요청된 작업을 실행하고 {작업: 새 기사 수} 반환
+
+    backfill 이면 저장된 최신 기사와 관계없이 모든 페이지를 다시 확인함.
+    """
+    lease = Lease(crawl_info, LEASE_NAME, Config.CRAWL_LEASE_TTL, owner)
+    token = lease.acquire()
+    if token is None:
+        return {}
+
+    results = {}
+    try:
+        with LeaseKeeper(lease) as keeper:
+            for job in jobs or JOBS:
+                if not (force or crawl_due(job) or crawl_requested(job)):
+                    continue
+                if keeper.lost:
+                    break
+                logger.info(f"Crawling {job} (lease token {token})")
+                started_at = _now()
+                try:
+                    # 사이트마다 추적 중인 모든 키워드(CRAWL_KEYWORDS)를 한 번에 처리
+                    new_articles = crawl_source(job, db, backfill=backfill)
+                except Exception as e:
+                    # 한 사이트가 실패해도 다른 작업은 계속하고, 요청은 남겨 두어 다음 확인 때 다시 시도
+                    logger.error(f"Crawl {job} failed: {e!r}")
+                    continue
+                results[job] = len(new_articles)
+                # 크롤링하는 동안 새로 들어온 요청은 남겨 둠
+                crawl_info.delete_one({'name': _request_name(job), 'requested_at': {'$lte': started_at}})
+                if keeper.lost or not record_crawl(job, token):
+                    logger.warning(f"Crawl {job} finished without the lease; not recording")
+    finally:
+        lease.release()
+    return results
+
+
+# ---- 프로세스 안에서 도는 스케줄러 ----
+
+_wakeup = threading.Event()
+_scheduler_thread = None
+_scheduler_lock = threading.Lock()
+
+
+def mark_alive():
+    crawl_info.update_one({'name': SCHEDULER_NAME}, {'$set': {'seen_at': _now()}}, upsert=True)
+
+
+def scheduler_alive():
+    """최근 CRAWL_SCHEDULER_POLL 의 두 배 안에 살아 있다고 기록한 스케줄러가 있는지"""
+    doc = crawl_info.find_one({'name': SCHEDULER_NAME, 'seen_at': {
+        '$gte': _now() - timedelta(seconds=Config.CRAWL_SCHEDULER_POLL * 2)
+    }})
+    return doc is not None
+
+
+def run_forever(stop=None, once=False):
+    stop = stop or threading.Event()
+    owner = default_owner()
+    while not stop.is_set():
+        try:
+            mark_alive()
+            results = run_pending(owner=owner)
+            if results:
+                logger.info(f"Crawl results: {results}")
+        except Exception as e:
+            logger.error(f"Crawl scheduler error: {e!r}")
+        if once:
+            return
+        _wakeup.wait(Config.CRAWL_SCHEDULER_POLL)
+        _wakeup.clear()
+
+
+def start_scheduler():
+    """앱 프로세스 안에서 스케줄러 스레드 시작 (프로세스마다 한 번)"""
+    global _scheduler_thread
+    with _scheduler_lock:
+        if _scheduler_thread is None or not _scheduler_thread.is_alive():
+            _scheduler_thread = threading.Thread(target=run_forever, name='crawl-scheduler', daemon=True)
+            _scheduler_thread.start()
+    return _scheduler_thread
+
+
+def trigger_crawl(job):
+    """POST 엔드포인트용: 크롤링을 요청만 하고 바로 반환
+
+    도는 스케줄러가 없으면 이 프로세스에서 한 번만 실행하는 스레드를 띄움 (lease 로 중복 방지).
+    """
+    request_crawl(job)
+    if _scheduler_thread is not None and _scheduler_thread.is_alive():
+        _wakeup.set()
+    elif not scheduler_alive():
+        threading.Thread(target=run_pending, kwargs={'jobs': [job]}, name=f'crawl-{job}', daemon=True).start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="뉴스 크롤링 스케줄러")
+    parser.add_argument('--once', action='store_true', help="한 번만 확인하고 종료")
+    parser.add_argument('--job', choices=sorted(JOBS), action='append', help="주기와 관계없이 바로 실행할 작업")
+    parser.add_argument('--backfill', action='store_true', help="--job 과 함께: 모든 페이지를 동시에 받아서 전체 다시 확인")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    # 앱과 따로 실행할 때도 크롤러가 쓰는 인덱스를 만들어 둠 (indexes.py)
+    from indexes import ensure_indexes
+    ensure_indexes(db)
+
+    if args.job:
+        print(run_pending(jobs=args.job, force=True, backfill=args.backfill) or "다른 곳에서 크롤링 중입니다.")
+    else:
+        run_forever(once=args.once)
+
+
+if __name__ == '__main__':
+    main()
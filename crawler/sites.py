@@ -0,0 +1,194 @@
+"""사이트별 파싱 정의
+
+페이지 전체를 트리로 만들지 않고 필요한 부분(keep)만 SoupStrainer 로 골라서 파싱한 뒤,
+item 선택자로 찾은 요소마다 fields 에 정의한 값을 꺼냄. lxml 이 설치돼 있으면 lxml 파서를 씀.
+마크업이 바뀌면 이 파일의 선택자만 고치면 됨.
+"""
+from bs4 import BeautifulSoup, SoupStrainer
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit
+import re
+
+try:
+    import lxml  # noqa: F401
+    PARSER = 'lxml'
+except ImportError:
+    PARSER = 'html.parser'
+
+
+def _classes(attrs):
+    classes = attrs.get('class') or ''
+    return classes.split() if isinstance(classes, str) else classes
+
+
+def by_id(*ids):
+    return lambda name, attrs: attrs.get('id') in ids
+
+
+def by_class(*class_names):
+    return lambda name, attrs: any(class_name in _classes(attrs) for class_name in class_names)
+
+
+def any_of(*matchers):
+    return lambda name, attrs: any(matcher(name, attrs) for matcher in matchers)
+
+
+class PageSpec:
+    """페이지에서 남길 부분(keep), 항목 선택자(item), 항목별 필드 {이름: (선택자, 'text' 또는 속성)}"""
+
+    def __init__(self, keep, item, fields):
+        self.keep = keep
+        self.item = item
+        self.fields = fields
+
+    def parse(self, content):
+        return BeautifulSoup(content, PARSER, parse_only=SoupStrainer(self.keep))
+
+    def extract(self, soup):
+        """item 마다 {필드: 값} 반환 (요소가 없으면 None)"""
+        items = []
+        for element in soup.select(self.item):
+            values = {}
+            for field, (selector, source) in self.fields.items():
+                tag = element.select_one(selector) if selector else element
+                if tag is None:
+                    values[field] = None
+                elif source == 'text':
+                    values[field] = tag.text.strip()
+                else:
+                    values[field] = tag.get(source)
+            items.append(values)
+        return items
+
+    def extract_one(self, soup):
+        items = self.extract(soup)
+        return items[0] if items else None
+
+
+# 루키 검색 목록: #section-list > ul > li, 페이지 수는 .pagination
+ROOKIE_LISTING = PageSpec(
+    keep=any_of(by_id('section-list'), by_class('pagination')),
+    item='#section-list > ul > li',
+    fields={
+        'title': ('.titles a', 'text'),
+        'href': ('.titles a', 'href'),
+        'summary': ('.lead a', 'text'),
+        'date_text': ('.byline em:last-child', 'text'),
+        'image_url': ('.thumb img', 'src'),
+    }
+)
+
+# 점프볼 검색 목록: .listPhoto
+JUMPBALL_LISTING = PageSpec(
+    keep=by_class('listPhoto', 'pagination'),
+    item='.listPhoto',
+    fields={
+        'title': ('dt a', 'text'),
+        'href': ('dt a', 'href'),
+        'image_style': ('.img a', 'style'),
+        'summary': ('.conts', 'text'),
+        'text': ('.txt', 'text'),
+    }
+)
+
+# 점프볼 기사 상세: .viewTitle (제목, "입력 : 2024-12-05 16:22:51")
+JUMPBALL_ARTICLE = PageSpec(
+    keep=by_class('viewTitle'),
+    item='.viewTitle',
+    fields={
+        'title': ('h3', 'text'),
+        'date_text': ('dl > dd', 'text'),
+    }
+)
+
+
+def total_pages(soup, pattern):
+    """.pagination 의 마지막 링크에서 페이지 수 (pattern 예: r'page=(\\d+)')"""
+    pagination = soup.select('.pagination a')
+    if pagination:
+        match = re.search(pattern, pagination[-1].get('href') or '')
+        if match:
+            return int(match.group(1))
+    return 1
+
+
+def background_image(style):
+    """style="background:url('...')" 에서 이미지 주소"""
+    if style and "url('" in style:
+        return style.split("url('")[1].split("')")[0]
+    return None
+
+
+# ---- 목록/상세 항목을 기사 문서로 변환 (실시간 크롤링과 replay 가 함께 사용) ----
+
+ROOKIE_BASE_URL = 'https://www.rookie.co.kr'
+JUMPBALL_BASE_URL = 'https://jumpball.co.kr'
+
+# 키워드가 들어 있어도 제외하는 루키 기사
+ROOKIE_EXCLUDED_TITLES = ('원조 머슬녀',)
+
+# 점프볼은 이 날짜 이후 기사만 저장
+JUMPBALL_CUTOFF = datetime(2024, 11, 12)
+
+# 두 사이트의 작성 시간은 한국 시간이고 created_at 에 그대로(naive) 저장됨
+SITE_TIMEZONE = timezone(timedelta(hours=9), 'KST')
+
+
+def parse_rookie_date(date_string):
+    """"2024.12.05 16:22" 형식"""
+    try:
+        match = re.search(r"(\d{4}\.\d{2}\.\d{2}\s*\d{2}:\d{2})", date_string or "")
+        return datetime.strptime(match.group(1), "%Y.%m.%d %H:%M") if match else None
+    except ValueError:
+        return None
+
+
+def parse_jumpball_date(date_string):
+    """"입력 : 2024-12-05 16:22:51" 형식"""
+    try:
+        match = re.search(r"(\d{4}-\d{2}-\d{2}\s*\d{2}:\d{2}:\d{2})", date_string or "")
+        return datetime.strptime(match.group(1), "%Y-%m-%d %H:%M:%S") if match else None
+    except ValueError:
+        return None
+
+
+def rookie_article(item):
+    """루키 목록 항목 -> 기사 (제목/링크가 없으면 None, 날짜를 못 읽으면 created_at 이 None)"""
+    if not item['title'] or not item['href']:
+        return None
+    return {
+        'title': item['title'],
+        'link': ROOKIE_BASE_URL + item['href'],
+        'summary': item['summary'] or "",
+        'image_url': item['image_url'],
+        'created_at': parse_rookie_date(item['date_text'])
+    }
+
+
+def jumpball_article(item):
+    """점프볼 목록 항목 -> 기사 (작성 시간은 상세 페이지에서 따로 채움)"""
+    if not item['title'] or not item['href']:
+        return None
+    return {
+        'title': item['title'],
+        'link': JUMPBALL_BASE_URL + item['href'],
+        'summary': item['summary'] or "",
+        'image_url': background_image(item['image_style'])
+    }
+
+
+# URL 로 페이지 종류 판별: (종류, 호스트, 경로, PageSpec)
+PAGE_KINDS = (
+    ('rookie_listing', 'www.rookie.co.kr', '/news/articleList.html', ROOKIE_LISTING),
+    ('jumpball_listing', 'jumpball.co.kr', '/news/search.php', JUMPBALL_LISTING),
+    ('jumpball_article', 'jumpball.co.kr', '/news/newsview.php', JUMPBALL_ARTICLE),
+)
+
+
+def page_kind(url):
+    """URL 에 맞는 (종류, PageSpec), 모르는 페이지면 (None, None)"""
+    parts = urlsplit(url)
+    for kind, host, path, spec in PAGE_KINDS:
+        if parts.netloc == host and parts.path == path:
+            return kind, spec
+    return None, None
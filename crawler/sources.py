@@ -0,0 +1,189 @@
+"""뉴스 사이트 어댑터 레지스트리
+
+사이트마다 Source 를 하나 만들어 register_source 로 등록하면 스케줄러/엔드포인트가 이름으로 크롤링함.
+키워드 여러 개를 한 번에 넘기면 같은 기사는 링크 기준으로 한 번만 처리하고, 파싱한 항목마다
+모든 키워드를 제목과 비교해서 keywords 태그를 붙임. 검색 목록은 키워드마다 요청해야 하지만
+상세 페이지 요청과 저장은 키워드 수와 관계없이 기사당 한 번.
+"""
+from config import Config
+from conditional import bump_version
+from response_cache import response_cache
+import logging
+from .dedup import signature_fields, cluster_articles
+from .engine import crawl_engine
+from .sites import (
+    ROOKIE_LISTING, JUMPBALL_LISTING, JUMPBALL_ARTICLE,
+    ROOKIE_EXCLUDED_TITLES, JUMPBALL_CUTOFF,
+    total_pages, parse_jumpball_date, rookie_article, jumpball_article
+)
+from .store import save_articles, tag_articles, latest_created_at
+
+logger = logging.getLogger(__name__)
+
+SOURCES = {}
+
+
+def register_source(source):
+    SOURCES[source.name] = source
+    return source
+
+
+def match_keywords(title, keywords):
+    """제목에 들어 있는 키워드 목록 (입력 순서 유지)"""
+    return [keyword for keyword in keywords if keyword in title]
+
+
+def _merge(articles, article, keywords):
+    """링크가 같은 기사는 하나로 합치고 태그만 추가"""
+    existing = articles.get(article['link'])
+    if existing is None:
+        article['keywords'] = keywords
+        articles[article['link']] = article
+    else:
+        existing['keywords'] += [keyword for keyword in keywords if keyword not in existing['keywords']]
+
+
+class Source:
+    """사이트 어댑터: name(=스케줄러 작업 이름), collection(저장할 컬렉션 이름), collect()"""
+
+    name = None
+    collection = None
+
+    def collect(self, keywords, collection, backfill=False):
+        """keywords 중 하나라도 제목에 있는 기사 목록 (keywords 태그 포함)
+
+        이미 저장된 기사는 created_at 이 없을 수 있음 (태그만 추가하는 데 사용).
+        """
+        raise NotImplementedError
+
+
+class RookieSource(Source):
+    name = 'rookie'
+    collection = 'news_rookie'
+    url = 'https://www.rookie.co.kr/news/articleList.html'
+
+    def params(self, keyword, page):
+        return {'sc_word': keyword, 'view_type': 'sm', 'page': page}
+
+    def search(self, keyword, keywords, watermark, found):
+        """keyword 검색 결과를 훑으면서 found 에 추가. watermark 이하 날짜에 닿으면 남은 페이지는 취소"""
+        first = crawl_engine.fetch(self.url, params=self.params(keyword, 1))
+        if first.status_code != 200:
+            logger.warning(f"Failed to retrieve the first Rookie page for {keyword}: {first.status_code}")
+            return
+
+        page_count = total_pages(ROOKIE_LISTING.parse(first.content), r'page=(\d+)')
+        # 기준점이 없으면(백필) 모든 페이지를 한 번에 요청
+        prefetch = page_count if watermark is None else None
+        pages = crawl_engine.walk_pages(
+            self.url, lambda page: self.params(keyword, page), page_count, first=first, prefetch=prefetch
+        )
+        for page, response in pages:
+            if response is None or response.status_code != 200:
+                logger.warning(f"Failed to retrieve Rookie page {page} for {keyword}")
+                continue
+
+            reached = False
+            for item in ROOKIE_LISTING.extract(ROOKIE_LISTING.parse(response.content)):
+                article = rookie_article(item)
+                if article is None or any(excluded in article['title'] for excluded in ROOKIE_EXCLUDED_TITLES):
+                    continue
+                tags = match_keywords(article['title'], keywords)
+                if keyword not in tags or not article['created_at']:
+                    continue
+                if watermark and article['created_at'] <= watermark:
+                    reached = True
+                    break
+                _merge(found, article, tags)
+
+            if reached:
+                logger.info(f"Reached stored Rookie articles for {keyword} on page {page}")
+                pages.close()
+                break
+
+    def collect(self, keywords, collection, backfill=False):
+        found = {}
+        for keyword in keywords:
+            watermark = None if backfill else latest_created_at(collection, keyword)
+            self.search(keyword, keywords, watermark, found)
+        return list(found.values())
+
+
+class JumpballSource(Source):
+    name = 'jumpball'
+    collection = 'news_jumpball'
+    url = 'https://jumpball.co.kr/news/search.php'
+
+    def params(self, keyword):
+        return {'q': keyword, 'sfld': 'subj', 'x': '0', 'y': '0'}
+
+    def collect(self, keywords, collection, backfill=False):
+        found = {}
+        for keyword in keywords:
+            response = crawl_engine.fetch(self.url, params=self.params(keyword))
+            if response.status_code != 200:
+                logger.warning(f"Failed to retrieve Jumpball search for {keyword}: {response.status_code}")
+                continue
+            for item in JUMPBALL_LISTING.extract(JUMPBALL_LISTING.parse(response.content)):
+                article = jumpball_article(item)
+                if article is None:
+                    continue
+                tags = match_keywords(article['title'], keywords)
+                if keyword in tags:
+                    _merge(found, article, tags)
+
+        # 작성 시간은 상세 페이지에만 있으므로 아직 저장되지 않은 기사만 동시에 가져옴
+        stored = set() if backfill else {
+            doc['link'] for doc in collection.find({'link': {'$in': list(found)}}, {'link': 1})
+        }
+        candidates = [article for link, article in found.items() if link not in stored]
+        # 상세 페이지는 새 기사만 한 번 받으므로 조건부 요청용 본문을 저장하지 않음
+        responses = crawl_engine.fetch_all([article['link'] for article in candidates], conditional=False)
+
+        articles = [article for link, article in found.items() if link in stored]
+        for article, response in zip(candidates, responses):
+            if response is None or response.status_code != 200:
+                logger.warning(f"Failed to retrieve Jumpball article {article['link']}")
+                continue
+            detail = JUMPBALL_ARTICLE.extract_one(JUMPBALL_ARTICLE.parse(response.content))
+            created_at = parse_jumpball_date(detail['date_text']) if detail else None
+            # 기준 날짜(JUMPBALL_CUTOFF) 이후 기사만 저장
+            if created_at and created_at > JUMPBALL_CUTOFF:
+                article['created_at'] = created_at
+                articles.append(article)
+        return articles
+
+
+register_source(RookieSource())
+register_source(JumpballSource())
+
+
+def crawl_source(name, db, keywords=None, backfill=False):
+    """name 사이트를 keywords(기본값 CRAWL_KEYWORDS)로 크롤링해서 새 기사는 저장하고 기존 기사에는 태그 추가
+
+    새로 저장한 기사 목록 반환.
+    """
+    source = SOURCES[name]
+    keywords = list(keywords or Config.CRAWL_KEYWORDS)
+    collection = db[source.collection]
+
+    articles = source.collect(keywords, collection, backfill=backfill)
+    candidates = [article for article in articles if article.get('created_at')]
+    for article in candidates:
+        # 다른 사이트의 같은 기사를 찾기 위한 MinHash 서명 (crawler/dedup.py)
+        article.update(signature_fields(article))
+    new_articles = save_articles(collection, candidates)
+    clustered = cluster_articles(db, new_articles)
+    inserted = {article['link'] for article in new_articles}
+    tagged = tag_articles(collection, [article for article in articles if article['link'] not in inserted])
+    if new_articles:
+        # /api/latest 캐시 (스케줄러를 따로 돌리면서 memory 백엔드를 쓰면 RESPONSE_CACHE_TTL 후 반영)
+        response_cache.invalidate('news')
+    if tagged or clustered:
+        # 태그/묶음만 바뀐 기사는 문서 수와 최신 날짜가 그대로라 조건부 GET 버전을 올림 (묶음은 두 사이트에 걸침)
+        bump_version(*(('news_rookie', 'news_jumpball') if clustered else (source.collection,)), database=db)
+    logger.info(
+        f"{name}: {len(articles)} matched, {len(new_articles)} new ({clustered} duplicates), "
+        f"{tagged} re-tagged ({', '.join(keywords)})"
+    )
+    return new_articles
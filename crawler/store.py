@@ -0,0 +1,108 @@
+from database import news_rookie, news_jumpball
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+import argparse
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# 중복 키 오류 코드 (동시에 같은 기사를 저장하려 할 때)
+DUPLICATE_KEY = 11000
+
+
+def save_articles(collection, articles):
+    """크롤링한 기사 중 새 기사만 저장하고 저장한 기사 목록 반환
+
+    링크 전체를 $in 한 번으로 조회한 뒤, 새 기사를 순서 없는 bulk_write 한 번으로 upsert 함.
+    link 에 unique 인덱스가 있으므로 다른 워커와 동시에 저장해도 중복되지 않음.
+    """
+    unique = {}
+    for article in articles:
+        unique.setdefault(article['link'], article)
+    if not unique:
+        return []
+
+    existing = {doc['link'] for doc in collection.find({'link': {'$in': list(unique)}}, {'link': 1})}
+    new_articles = [article for link, article in unique.items() if link not in existing]
+    if not new_articles:
+        return []
+
+    operations = [
+        UpdateOne({'link': article['link']}, {'$setOnInsert': article}, upsert=True)
+        for article in new_articles
+    ]
+    try:
+        result = collection.bulk_write(operations, ordered=False)
+        inserted = set(result.upserted_ids)
+    except BulkWriteError as e:
+        # 다른 워커가 먼저 저장한 기사는 건너뛰고 나머지 오류만 다시 올림
+        errors = [error for error in e.details.get('writeErrors', []) if error.get('code') != DUPLICATE_KEY]
+        if errors:
+            raise
+        inserted = {upserted['index'] for upserted in e.details.get('upserted', [])}
+    return [article for index, article in enumerate(new_articles) if index in inserted]
+
+
+def tag_articles(collection, articles):
+    """이미 저장된 기사에 찾은 키워드 태그를 추가 (keywords 배열, 중복 없이)"""
+    operations = [
+        UpdateOne({'link': article['link']}, {'$addToSet': {'keywords': {'$each': article['keywords']}}})
+        for article in articles if article.get('keywords')
+    ]
+    if not operations:
+        return 0
+    return collection.bulk_write(operations, ordered=False).modified_count
+
+
+def keyword_filter(keyword):
+    """keyword 태그가 붙은 기사 조건 (태그가 생기기 전에 저장된 기사는 제목으로 판단)"""
+    return {'$or': [
+        {'keywords': keyword},
+        {'keywords': {'$exists': False}, 'title': {'$regex': re.escape(keyword)}}
+    ]}
+
+
+def latest_created_at(collection, keyword):
+    """keyword 기사 중 가장 최근 작성 시간 (증분 크롤링 기준점)"""
+    latest = collection.find_one(keyword_filter(keyword), sort=[('created_at', -1)])
+    return latest['created_at'] if latest else None
+
+
+def remove_duplicate_links(collection, dry_run=False):
+    """같은 link 를 가진 문서 중 가장 먼저 저장된 것만 남기고 삭제 (삭제한 개수 반환, dry_run 이면 개수만)"""
+    duplicates = collection.aggregate([
+        {'$group': {'_id': '$link', 'ids': {'$push': '$_id'}, 'count': {'$sum': 1}}},
+        {'$match': {'count': {'$gt': 1}}}
+    ])
+    removed = 0
+    for group in duplicates:
+        extra_ids = sorted(group['ids'])[1:]
+        logger.info(f"{collection.name}: {group['_id']} 중복 {len(extra_ids)}개 {'삭제 예정' if dry_run else '삭제'}")
+        if dry_run:
+            removed += len(extra_ids)
+        else:
+            removed += collection.delete_many({'_id': {'$in': extra_ids}}).deleted_count
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="기사 컬렉션의 중복 link 정리 후 unique 인덱스 생성")
+    parser.add_argument('--dedupe-links', action='store_true', help="같은 link 의 기사 중 처음 저장된 것만 남기고 삭제")
+    parser.add_argument('--dry-run', action='store_true', help="삭제하지 않고 개수만 출력")
+    args = parser.parse_args()
+    if not args.dedupe_links:
+        parser.print_help()
+        return
+    logging.basicConfig(level=logging.INFO)
+    for collection in (news_rookie, news_jumpball):
+        removed = remove_duplicate_links(collection, dry_run=args.dry_run)
+        print(f"{collection.name}: 중복 기사 {removed}개 {'삭제 예정' if args.dry_run else '삭제'}")
+    if not args.dry_run:
+        # 정리한 뒤 link unique 인덱스 생성 (indexes.py)
+        from indexes import ensure_indexes
+        ensure_indexes(names=[collection.name for collection in (news_rookie, news_jumpball)])
+
+
+if __name__ == '__main__':
+    main()
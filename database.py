@@ -31,6 +31,23 @@ fs_event = gridfs.GridFS(db, collection="event_photo")
 fs_guestbooks = gridfs.GridFS(db, collection="guestbooks_photo")
 fs_diary = gridfs.GridFS(db, collection='diary_photo')
 
+# /api/media/<bucket>/<id> 에서 사용하는 버킷 이름과 컬렉션
+media_collections = {
+    'admin': 'admin_photo',
+    'user': 'user_photo',
+    'event': 'event_photo',
+    'guestbook': 'guestbooks_photo',
+    'diary': 'diary_photo',
+}
+
+media_buckets = {
+    'admin': fs_admin,
+    'user': fs_user,
+    'event': fs_event,
+    'guestbook': fs_guestbooks,
+    'diary': fs_diary,
+}
+
 users = db['users']
 guestbooks = db['guestbooks']
 admins = db['admin']
@@ -42,3 +59,12 @@ events = db['admin_events']
 news_rookie = db['news_rookie']
 news_jumpball = db['news_jumpball']
 diaries = db['diaries']
+
+# 크롤링 상태 (마지막 크롤링 시간, 스케줄러 lease, 수동 요청)
+crawl_info = db['crawl_info']
+
+# 크롤러 조건부 요청용 ETag/Last-Modified 와 마지막 응답 본문 (crawler/http.py)
+crawl_http_cache = db['crawl_http_cache']
+
+# 같은 내용의 이미지를 한 번만 저장하기 위한 참조 테이블 (media/store.py)
+media_blobs = db['media_blobs']
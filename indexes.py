@@ -0,0 +1,197 @@
+from bson import ObjectId
+from database import db, media_collections
+from datetime import datetime
+from pagination import keyset_filter
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+import argparse
+
+# 컬렉션별 인덱스 정의. 앱 시작 시(ENSURE_INDEXES) 또는 python -m indexes --apply 로 생성
+# 이미 같은 인덱스가 있으면 아무것도 하지 않으므로 여러 워커에서 동시에 실행해도 됨
+# (이전에 저장된 중복 기사 때문에 link unique 인덱스가 실패하면 python -m crawler.store --dedupe-links)
+
+_NEWS_INDEXES = [
+    # 같은 기사를 두 번 저장하지 않음 (crawler/store.py 의 upsert 가 의존)
+    IndexModel([('link', ASCENDING)], unique=True),
+    # 목록/최신 기사 (/api/rookie/search, /api/jumpball/search, /api/latest), 증분 크롤링 기준점
+    IndexModel([('created_at', DESCENDING)]),
+    # ?keyword= 목록과 키워드별 기준점 (crawler/store.py)
+    IndexModel([('keywords', ASCENDING), ('created_at', DESCENDING)]),
+    # 중복 기사 후보 조회와 묶음 (crawler/dedup.py)
+    IndexModel([('lsh', ASCENDING)]),
+    IndexModel([('cluster', ASCENDING)], sparse=True),
+]
+
+_MEDIA_FILE_INDEXES = [
+    # 갤러리 keyset 페이지 (media/gallery.py)
+    IndexModel([('uploadDate', DESCENDING), ('_id', DESCENDING)]),
+    # 원본의 썸네일/파생본 조회 (media/store.py)
+    IndexModel([('metadata.original_id', ASCENDING)], sparse=True),
+]
+
+INDEXES = {
+    'users': [IndexModel([('nickname', ASCENDING)])],
+    'admin': [IndexModel([('username', ASCENDING)])],
+    'diaries': [
+        # 사용자별 최신순 목록
+        IndexModel([('name', ASCENDING), ('saved_at', DESCENDING)]),
+        # 전체 최신순 목록
+        IndexModel([('saved_at', DESCENDING)]),
+        # 시즌별 통계 (name + date 범위)
+        IndexModel([('name', ASCENDING), ('date', ASCENDING)]),
+    ],
+    'guestbooks': [
+        # 사용자별/전체 최신순 목록
+        IndexModel([('name', ASCENDING), ('date', DESCENDING)]),
+        IndexModel([('date', DESCENDING)]),
+        # 관리자 방명록 목록의 name/_id 커서 (routes/admin/guestbook_routes.py, 역방향 페이지도 같은 인덱스)
+        IndexModel([('name', ASCENDING), ('_id', ASCENDING)]),
+    ],
+    'admin_schedules': [IndexModel([('season', ASCENDING), ('date', ASCENDING)])],
+    'admin_events': [IndexModel([('date', DESCENDING)])],
+    'admin_stats': [IndexModel([('season', DESCENDING)])],
+    # 작업별 크롤링 요청/스케줄러 문서 (crawler/scheduler.py)
+    # lease 와 마지막 크롤링 문서는 _id 로 찾고 name 이 없으므로 name 이 있는 문서만 unique 로 검사
+    # (이전의 partial 이 아닌 name_1 인덱스가 있으면 한 번 지우고 다시 만들어야 함)
+    'crawl_info': [IndexModel([('name', ASCENDING)], unique=True, partialFilterExpression={'name': {'$exists': True}})],
+    'news_rookie': _NEWS_INDEXES,
+    'news_jumpball': _NEWS_INDEXES,
+    # 파일 id(원본/파생본)로 어느 버킷에 저장돼 있는지 역조회 (media/store.py)
+    'media_blobs': [IndexModel([('file_ids', ASCENDING)])],
+    # RESPONSE_CACHE_BACKEND=mongo 일 때의 응답 캐시 (response_cache.py): 태그 무효화, 만료 항목 자동 삭제
+    'response_cache': [
+        IndexModel([('tags', ASCENDING)]),
+        IndexModel([('expires_at', ASCENDING)], expireAfterSeconds=0),
+    ],
+    # 크롤러 조건부 요청용 목록 페이지 본문 (crawler/http.py): 만료 항목 자동 삭제
+    'crawl_http_cache': [IndexModel([('expires_at', ASCENDING)], expireAfterSeconds=0)],
+    # SINGLEFLIGHT_LOCK=mongo 일 때의 lock 문서 (singleflight.py): 해제 후 1분 동안 결과를 남겨 둠
+    'singleflight': [IndexModel([('expires_at', ASCENDING)], expireAfterSeconds=60)],
+}
+
+# GridFS(<컬렉션>.files)와 로컬/S3 백엔드(<컬렉션>.objects)의 파일 문서
+for _collection in media_collections.values():
+    INDEXES[f'{_collection}.files'] = _MEDIA_FILE_INDEXES
+    INDEXES[f'{_collection}.objects'] = _MEDIA_FILE_INDEXES
+
+# --report 에서 explain 할 라우트 쿼리: (이름, 컬렉션, 조건, 정렬, limit)
+# 값은 실행 계획에 영향이 없으므로 임의의 예시 값을 씀
+_SAMPLE = '__explain__'
+QUERIES = [
+    ('login / signup nickname', 'users', {'nickname': _SAMPLE}, None, 1),
+    ('admin login', 'admin', {'username': _SAMPLE}, None, 1),
+    ('user diaries', 'diaries', {'name': _SAMPLE}, [('saved_at', -1)], 10),
+    ('all diaries', 'diaries', {}, [('saved_at', -1)], 10),
+    ('user stats season', 'diaries', {'name': _SAMPLE, 'date': {'$gte': datetime(2024, 5, 1), '$lte': datetime(2025, 4, 30)}}, None, 0),
+    ('guestbook list', 'guestbooks', {}, [('date', -1)], 10),
+    ('user guestbook list', 'guestbooks', {'name': _SAMPLE}, [('date', -1)], 10),
+    ('admin guestbook list', 'guestbooks', {}, [('name', 1)], 10),
+    ('admin guestbook by name', 'guestbooks', {'name': _SAMPLE}, [('name', 1)], 10),
+    ('admin guestbook cursor', 'guestbooks', keyset_filter('name', _SAMPLE, ObjectId(), 1), [('name', 1), ('_id', 1)], 11),
+    ('admin guestbook cursor back', 'guestbooks', {}, [('name', -1), ('_id', -1)], 11),
+    ('season schedules', 'admin_schedules', {'season': _SAMPLE}, [('date', 1)], 0),
+    ('event list', 'admin_events', {}, [('date', -1)], 0),
+    ('stats list', 'admin_stats', {}, [('season', -1)], 0),
+    ('rookie search', 'news_rookie', {}, [('created_at', -1)], 0),
+    ('rookie search by keyword', 'news_rookie', {'keywords': _SAMPLE}, [('created_at', -1)], 0),
+    ('jumpball search', 'news_jumpball', {}, [('created_at', -1)], 0),
+    ('latest rookie', 'news_rookie', {'image_url': {'$exists': True, '$ne': None}}, [('created_at', -1)], 1),
+    ('latest jumpball', 'news_jumpball', {'image_url': {'$exists': True, '$ne': None}}, [('created_at', -1)], 1),
+    ('jumpball link', 'news_jumpball', {'link': _SAMPLE}, None, 1),
+    ('crawl info', 'crawl_info', {'name': _SAMPLE}, None, 1),
+    ('duplicate candidates', 'news_rookie', {'lsh': {'$in': [_SAMPLE]}}, None, 0),
+    ('media blob by file id', 'media_blobs', {'file_ids': {'$in': [_SAMPLE]}}, None, 0),
+    ('admin gallery', 'admin_photo.files', {'metadata.original_id': {'$exists': False}}, [('uploadDate', -1), ('_id', -1)], 20),
+    ('photo variants', 'admin_photo.files', {'metadata.original_id': _SAMPLE}, None, 0),
+]
+
+
+def ensure_indexes(database=db, names=None):
+    """INDEXES(names 가 있으면 그 컬렉션만)의 인덱스를 만들고 {컬렉션: [인덱스 이름]} 반환
+
+    인덱스마다 따로 만들어서 하나가 실패해도(중복 기사가 남은 unique 인덱스 등) 나머지는 만들고, 실패는 출력함.
+    """
+    created = {}
+    for name in names or INDEXES:
+        created[name] = []
+        for model in INDEXES[name]:
+            try:
+                created[name] += database[name].create_indexes([model])
+            except Exception as e:
+                print(f"{name} 인덱스 생성 실패: {e}")
+    return created
+
+
+def _stages(plan):
+    """winningPlan 트리의 stage 이름과 사용한 인덱스"""
+    stages, indexes = [], []
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        stages.append(node.get('stage'))
+        if node.get('indexName'):
+            indexes.append(node['indexName'])
+        if 'inputStage' in node:
+            stack.append(node['inputStage'])
+        stack.extend(node.get('inputStages', []))
+        # 슬롯 기반 실행 엔진(SBE)은 queryPlan 아래에 같은 형식으로 들어 있음
+        if 'queryPlan' in node:
+            stack.append(node['queryPlan'])
+    return stages, indexes
+
+
+def explain_query(database, collection, filter, sort=None, limit=0):
+    """(stage 목록, 인덱스 목록, 경고 목록)"""
+    cursor = database[collection].find(filter)
+    if sort:
+        cursor = cursor.sort(sort)
+    if limit:
+        cursor = cursor.limit(limit)
+    plan = cursor.explain().get('queryPlanner', {}).get('winningPlan', {})
+    stages, indexes = _stages(plan)
+    warnings = []
+    if 'COLLSCAN' in stages:
+        warnings.append('COLLSCAN')
+    if 'SORT' in stages:
+        warnings.append('in-memory SORT')
+    return stages, indexes, warnings
+
+
+def report(database=db):
+    """QUERIES 를 explain 해서 출력하고 경고가 있는 쿼리 수 반환"""
+    flagged = 0
+    for name, collection, filter, sort, limit in QUERIES:
+        try:
+            stages, indexes, warnings = explain_query(database, collection, filter, sort, limit)
+        except OperationFailure as e:
+            print(f"[ERROR] {name:28} {collection}: {e}")
+            flagged += 1
+            continue
+        status = 'WARN' if warnings else 'OK'
+        flagged += bool(warnings)
+        detail = ', '.join(indexes) if indexes else '-'
+        print(f"[{status:4}] {name:28} {collection:18} {' > '.join(reversed(stages)):40} index: {detail}"
+              + (f"  ({', '.join(warnings)})" if warnings else ''))
+    print(f"\n{len(QUERIES)}개 쿼리 중 {flagged}개 확인 필요")
+    return flagged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MongoDB 인덱스 생성/점검")
+    parser.add_argument('--apply', action='store_true', help="INDEXES 의 인덱스 생성")
+    parser.add_argument('--report', action='store_true', help="라우트 쿼리를 explain 해서 COLLSCAN/메모리 정렬 확인")
+    args = parser.parse_args()
+    if not (args.apply or args.report):
+        parser.print_help()
+        return 0
+
+    if args.apply:
+        for name, index_names in ensure_indexes().items():
+            print(f"{name}: {', '.join(index_names)}")
+    if args.report:
+        return 1 if report() else 0
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,7 @@
+from .streaming import send_media, make_etag, media_url, media_ref
+from .store import save_image, store_image, delete_image, release_images, variant_ids, open_file, read_file, open_variant, locate_file, owner_buckets, ORIGINALS_ONLY
+from .cache import media_cache
+from .gallery import list_gallery, parse_buckets, inline_photo_list, GALLERY_BUCKETS
+from .fetch import fetch_files
+from .storage import get_storage, storages
+from .signing import sign_media, verify_media
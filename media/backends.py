@@ -0,0 +1,225 @@
+from bson import ObjectId
+from datetime import datetime, timezone
+from io import BytesIO
+import abc
+import gridfs.errors
+import hashlib
+import os
+import tempfile
+
+
+class FileNotFound(gridfs.errors.NoFile):
+    """GridFS 가 아닌 저장소에서 파일이 없을 때 (기존 NoFile 처리와 호환)"""
+
+
+class GridFSBackend:
+    """기존 GridFS 버킷을 그대로 사용하는 저장소"""
+
+    def __init__(self, fs):
+        self.fs = fs
+
+    def put(self, data, **kwargs):
+        return self.fs.put(data, **kwargs)
+
+    def get(self, file_id):
+        return self.fs.get(file_id)
+
+    def delete(self, file_id):
+        self.fs.delete(file_id)
+
+    def exists(self, file_id):
+        return self.fs.exists(file_id)
+
+    def find(self, filter, sort=None, limit=0):
+        return self.fs.find(filter, sort=sort, limit=limit)
+
+    def url(self, file_id):
+        """직접 내려받을 수 있는 주소 (GridFS 는 없음)"""
+        return None
+
+
+class StoredFile:
+    """GridOut 과 같은 속성/메서드를 가진 파일 객체
+
+    실제 데이터 스트림은 처음 read 할 때 opener(position) 으로 연다.
+    """
+
+    def __init__(self, doc, opener):
+        self._id = doc["_id"]
+        self.filename = doc.get("filename")
+        self.content_type = doc.get("contentType")
+        self.length = doc["length"]
+        self.upload_date = doc.get("uploadDate")
+        self.md5 = doc.get("md5")
+        self.metadata = doc.get("metadata")
+        self._opener = opener
+        self._stream = None
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self.length
+        if offset != self._position:
+            self._close_stream()
+            self._position = max(0, min(offset, self.length))
+        return self._position
+
+    def read(self, size=-1):
+        if self._position >= self.length:
+            return b''
+        if self._stream is None:
+            self._stream = self._opener(self._position)
+        data = self._stream.read() if size is None or size < 0 else self._stream.read(size)
+        self._position += len(data)
+        return data
+
+    def _close_stream(self):
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    def close(self):
+        self._close_stream()
+
+
+class ObjectBackend(abc.ABC):
+    """바이트는 외부 저장소에, GridFS 형식의 파일 정보는 Mongo 컬렉션에 저장
+
+    files 문서 필드(filename, contentType, length, uploadDate, metadata)를 GridFS 와
+    같게 맞춰서 갤러리/파생 이미지 쿼리를 그대로 쓸 수 있음.
+    """
+
+    def __init__(self, files, prefix):
+        self.files = files
+        self.prefix = prefix
+
+    def key(self, file_id):
+        return f"{self.prefix}/{file_id}"
+
+    def put(self, data, _id=None, filename=None, content_type=None, metadata=None, upload_date=None):
+        file_id = _id or ObjectId()
+        key = self.key(file_id)
+        self._write(key, data, content_type)
+        self.files.insert_one({
+            "_id": file_id,
+            "filename": filename,
+            "contentType": content_type,
+            "length": len(data),
+            "uploadDate": upload_date or datetime.now(timezone.utc).replace(tzinfo=None),
+            "md5": hashlib.md5(data).hexdigest(),
+            "metadata": metadata,
+            "key": key
+        })
+        return file_id
+
+    def get(self, file_id):
+        doc = self.files.find_one({"_id": file_id})
+        if doc is None:
+            raise FileNotFound(f"no file in {self.files.name} with _id {file_id!r}")
+        return self._stored_file(doc)
+
+    def delete(self, file_id):
+        doc = self.files.find_one_and_delete({"_id": file_id})
+        if doc is not None:
+            self._remove(doc["key"])
+
+    def exists(self, file_id):
+        return self.files.count_documents({"_id": file_id}, limit=1) > 0
+
+    def find(self, filter, sort=None, limit=0):
+        cursor = self.files.find(filter, sort=sort, limit=limit)
+        return (self._stored_file(doc) for doc in cursor)
+
+    def url(self, file_id):
+        return None
+
+    def _stored_file(self, doc):
+        return StoredFile(doc, lambda position: self._open(doc["key"], position, doc["length"]))
+
+    @abc.abstractmethod
+    def _write(self, key, data, content_type):
+        """data(bytes) 를 key 에 저장"""
+
+    @abc.abstractmethod
+    def _open(self, key, position, length):
+        """key 의 position 부터 읽는 스트림"""
+
+    @abc.abstractmethod
+    def _remove(self, key):
+        """key 삭제 (없으면 무시)"""
+
+
+class LocalBackend(ObjectBackend):
+    """로컬 디스크 저장소 (개발/단일 서버용)"""
+
+    def __init__(self, files, prefix, root):
+        super().__init__(files, prefix)
+        self.root = root
+
+    def _path(self, key):
+        return os.path.join(self.root, *key.split('/'))
+
+    def _write(self, key, data, content_type):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _open(self, key, position, length):
+        f = open(self._path(key), 'rb')
+        f.seek(position)
+        return f
+
+    def _remove(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class S3Backend(ObjectBackend):
+    """S3 호환 오브젝트 저장소 (AWS S3, MinIO 등)
+
+    업로드는 PUT 한 번으로 함 (store_image 가 정규화/해시를 위해 이미지 전체를 메모리에 읽은 뒤라서
+    나눠 올려도 메모리가 줄지 않음). 읽기는 presigned GET URL 로 클라이언트가 직접 받아가게 함.
+    """
+
+    def __init__(self, files, prefix, client, bucket_name, presign_expires):
+        super().__init__(files, prefix)
+        self.client = client
+        self.bucket_name = bucket_name
+        self.presign_expires = presign_expires
+
+    def _write(self, key, data, content_type):
+        extra_args = {"ContentType": content_type} if content_type else {}
+        self.client.put_object(Bucket=self.bucket_name, Key=key, Body=data, **extra_args)
+
+    def _open(self, key, position, length):
+        if position >= length:
+            return BytesIO()
+        response = self.client.get_object(Bucket=self.bucket_name, Key=key, Range=f"bytes={position}-")
+        return response["Body"]
+
+    def _remove(self, key):
+        self.client.delete_object(Bucket=self.bucket_name, Key=key)
+
+    def url(self, file_id):
+        # 키가 id 로 정해지므로 DB 조회 없이 서명 가능
+        return self.client.generate_presigned_url(
+            'get_object',
+            Params={"Bucket": self.bucket_name, "Key": self.key(file_id)},
+            ExpiresIn=self.presign_expires
+        )
@@ -0,0 +1,256 @@
+from bson import json_util
+from collections import OrderedDict
+from config import Config
+import io
+import logging
+import os
+import tempfile
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CachedFile(io.BytesIO):
+    """GridOut 과 같은 속성을 가진 메모리 파일 (send_media 에 그대로 넘길 수 있음)"""
+
+    def __init__(self, data, info):
+        super().__init__(data)
+        self._id = info["_id"]
+        self.filename = info.get("filename")
+        self.content_type = info.get("content_type")
+        self.upload_date = info.get("upload_date")
+        self.md5 = info.get("md5")
+        self.metadata = info.get("metadata")
+        self.length = len(data)
+
+
+def file_info(grid_out):
+    return {
+        "_id": grid_out._id,
+        "filename": grid_out.filename,
+        "content_type": grid_out.content_type,
+        "upload_date": grid_out.upload_date,
+        "md5": getattr(grid_out, 'md5', None),
+        "metadata": grid_out.metadata
+    }
+
+
+class MemoryLRU:
+    """바이트 예산 기반 프로세스 내 LRU
+
+    다른 워커에서 삭제된 파일을 계속 들고 있지 않도록 항목마다 TTL 을 둠.
+    """
+
+    def __init__(self, max_bytes, ttl):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, info, data = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return info, data
+
+    def set(self, key, info, data):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, info, data)
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def _remove(self, key):
+        _, _, data = self._entries.pop(key)
+        self.size -= len(data)
+
+
+class DiskLRU:
+    """여러 gunicorn 워커가 함께 쓰는 디스크 LRU
+
+    파일 하나에 JSON 헤더 한 줄 + 원본 바이트를 저장하고, 조회할 때 mtime 을 갱신해서
+    가장 오래 안 쓰인 파일부터 지움. 크기는 프로세스별로 대략 추적하다가 예산을 넘으면
+    디렉토리를 다시 스캔함.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._approx_size = self._scan_size()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key.replace('/', '_') + '.bin')
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                info = json_util.loads(f.readline().decode('utf-8'))
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Broken media cache entry {path}: {str(e)}")
+            self.delete(key)
+            return None
+        return info, data
+
+    def set(self, key, info, data):
+        if len(data) > self.max_bytes:
+            return
+        header = (json_util.dumps(info) + '\n').encode('utf-8')
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(header)
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"Failed to write media cache entry {key}: {str(e)}")
+            return
+        with self._lock:
+            self._approx_size += len(header) + len(data)
+            if self._approx_size > self.max_bytes:
+                self._evict()
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.bin'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+        return entries
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        # 매번 스캔하지 않도록 예산의 90% 까지 비움
+        target = self.max_bytes * 0.9
+        for _, size, name in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+                self.evictions += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._approx_size = total
+
+
+class MediaCache:
+    """GridFS 읽기 앞단의 2단 캐시. 키는 (버킷, 파일 id)"""
+
+    def __init__(self, memory_bytes, memory_ttl, disk_dir, disk_bytes, max_item_bytes):
+        self.memory = MemoryLRU(memory_bytes, memory_ttl)
+        self.disk = DiskLRU(disk_dir, disk_bytes) if disk_dir and disk_bytes > 0 else None
+        self.max_item_bytes = max_item_bytes
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(bucket, file_id):
+        return f"{bucket}/{file_id}"
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, bucket, file_id, loader):
+        """캐시에 없으면 loader() 로 GridOut 을 가져와서 채움
+
+        max_item_bytes 보다 큰 파일은 캐시하지 않고 GridOut 을 그대로 돌려줘서 스트리밍함.
+        """
+        key = self.key(bucket, file_id)
+        entry = self.memory.get(key)
+        if entry is not None:
+            self._count('memory_hits')
+            return CachedFile(entry[1], entry[0])
+
+        if self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                self._count('disk_hits')
+                self.memory.set(key, *entry)
+                return CachedFile(entry[1], entry[0])
+
+        self._count('misses')
+        grid_out = loader()
+        if grid_out.length > self.max_item_bytes:
+            return grid_out
+
+        info = file_info(grid_out)
+        data = grid_out.read()
+        grid_out.close()
+        self.memory.set(key, info, data)
+        if self.disk is not None:
+            self.disk.set(key, info, data)
+        return CachedFile(data, info)
+
+    def invalidate(self, bucket, file_id):
+        key = self.key(bucket, file_id)
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+        self._count('invalidations')
+
+    def stats(self):
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "memory_evictions": self.memory.evictions,
+            "disk_evictions": self.disk.evictions if self.disk is not None else 0,
+            "memory_bytes": self.memory.size,
+            "memory_items": len(self.memory._entries)
+        }
+
+
+media_cache = MediaCache(
+    memory_bytes=Config.MEDIA_CACHE_MEMORY_BYTES,
+    memory_ttl=Config.MEDIA_CACHE_MEMORY_TTL,
+    disk_dir=Config.MEDIA_CACHE_DISK_DIR,
+    disk_bytes=Config.MEDIA_CACHE_DISK_BYTES,
+    max_item_bytes=Config.MEDIA_CACHE_MAX_ITEM_BYTES
+)
@@ -0,0 +1,71 @@
+from bson import ObjectId
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from config import Config
+import gridfs.errors
+import logging
+from .cache import CachedFile, file_info
+from .store import open_file, variant_ids
+
+logger = logging.getLogger(__name__)
+
+# 스레드는 처음 submit 할 때 만들어지므로 gunicorn fork 이후에 생성됨
+_executor = ThreadPoolExecutor(max_workers=Config.MEDIA_FETCH_WORKERS, thread_name_prefix='media-fetch')
+
+
+def _load(bucket, file_id):
+    # 큰 파일은 캐시가 GridOut 을 그대로 주므로 읽기까지 워커 스레드에서 끝냄
+    file = open_file(bucket, file_id)
+    if isinstance(file, CachedFile):
+        return file
+    try:
+        return CachedFile(file.read(), file_info(file))
+    finally:
+        file.close()
+
+
+def fetch_files(bucket, file_ids, variant=None):
+    """GridFS 파일 여러 개를 제한된 스레드 풀에서 동시에 가져옴
+
+    입력 순서대로 [파일 또는 None] 목록과 찾지 못한 id 목록을 반환하며,
+    일부 파일이 없거나 읽다가 실패해도(저장소/네트워크 오류 포함) 나머지 결과는 그대로 돌려줌.
+    """
+    file_ids = [str(file_id) for file_id in file_ids]
+    # 같은 id 는 한 번만 읽음 (아래에서 복사본을 줌)
+    valid_ids = list(dict.fromkeys(file_id for file_id in file_ids if ObjectId.is_valid(file_id)))
+    targets = variant_ids(bucket, valid_ids, variant) if variant else {file_id: file_id for file_id in valid_ids}
+
+    if len(valid_ids) == 1:
+        pending = {valid_ids[0]: None}
+    else:
+        pending = {file_id: _executor.submit(_load, bucket, targets[file_id]) for file_id in valid_ids}
+
+    results = []
+    missing = []
+    returned = set()
+    for file_id in file_ids:
+        if file_id not in pending:
+            results.append(None)
+            missing.append(file_id)
+            continue
+        try:
+            future = pending[file_id]
+            if future is None:
+                file = _load(bucket, targets[file_id])
+            else:
+                file = future.result(timeout=Config.MEDIA_FETCH_TIMEOUT)
+            # 같은 id 가 여러 번 있으면(중복 제거로 같은 사진을 공유) 읽기 위치를 나누지 않도록 복사본을 줌
+            if file_id in returned:
+                file = CachedFile(file.getvalue(), file_info(file))
+            returned.add(file_id)
+            results.append(file)
+        except (gridfs.errors.NoFile, gridfs.errors.CorruptGridFile, TimeoutError) as e:
+            results.append(None)
+            missing.append(file_id)
+            logger.warning(f"Failed to fetch {bucket}/{file_id}: {e!r}")
+        except Exception:
+            # 파일 하나의 예상하지 못한 오류로 목록 전체가 실패하지 않도록 함
+            results.append(None)
+            missing.append(file_id)
+            logger.exception(f"Unexpected error fetching {bucket}/{file_id}")
+
+    return results, missing
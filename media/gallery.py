@@ -0,0 +1,84 @@
+from pagination import encode_cursor, decode_cursor, keyset_filter
+import base64
+from .store import read_file, ORIGINALS_ONLY
+from .storage import get_storage
+from .streaming import media_url
+
+# 갤러리에 노출되는 버킷
+GALLERY_BUCKETS = ('admin', 'user')
+
+GALLERY_SORT = [('uploadDate', -1), ('_id', -1)]
+
+
+def parse_buckets(value):
+    """?bucket=admin,user 파라미터 파싱 (없으면 전체 갤러리 버킷)"""
+    if not value:
+        return GALLERY_BUCKETS
+    buckets = tuple(dict.fromkeys(bucket.strip() for bucket in value.split(',') if bucket.strip()))
+    unknown = [bucket for bucket in buckets if bucket not in GALLERY_BUCKETS]
+    if unknown or not buckets:
+        raise ValueError(f"Unknown bucket: {', '.join(unknown) or value}")
+    return buckets
+
+
+def gallery_item(bucket, grid_out, signed=None):
+    metadata = grid_out.metadata or {}
+    variants = metadata.get("variants", {})
+    return {
+        "_id": str(grid_out._id),
+        "bucket": bucket,
+        "filename": grid_out.filename,
+        "content_type": grid_out.content_type,
+        "length": grid_out.length,
+        "width": metadata.get("width"),
+        "height": metadata.get("height"),
+        "uploaded_at": grid_out.upload_date,
+        "url": media_url(bucket, grid_out._id, signed=signed),
+        "thumb_url": media_url(bucket, grid_out._id, 'thumb' if 'thumb' in variants else None, signed=signed)
+    }
+
+
+def list_gallery(buckets, limit, cursor=None, signed=None):
+    """uploadDate/_id 기준 최신순으로 limit 개의 메타데이터와 다음 커서 반환
+
+    버킷마다 limit + 1 개만 조회한 뒤 합치므로 전체 사진 수와 관계없이 일정한 비용.
+    signed=True 면 url/thumb_url 을 서명된 주소로 만듦 (관리자 목록).
+    """
+    query = ORIGINALS_ONLY
+    if cursor:
+        upload_date, last_id = decode_cursor(cursor)
+        query = {'$and': [ORIGINALS_ONLY, keyset_filter('uploadDate', upload_date, last_id)]}
+
+    candidates = []
+    for bucket in buckets:
+        for grid_out in get_storage(bucket).find(query, sort=GALLERY_SORT, limit=limit + 1):
+            candidates.append((bucket, grid_out))
+    candidates.sort(key=lambda item: (item[1].upload_date, item[1]._id), reverse=True)
+
+    page = candidates[:limit]
+    next_cursor = None
+    if len(candidates) > limit:
+        last = page[-1][1]
+        next_cursor = encode_cursor(last.upload_date, last._id)
+
+    return {
+        "photos": [gallery_item(bucket, grid_out, signed) for bucket, grid_out in page],
+        "next_cursor": next_cursor,
+        "limit": limit
+    }
+
+
+def inline_photo_list(bucket, signed=None):
+    """이전 응답 형식: 버킷의 모든 사진을 base64 썸네일로 반환 (?inline=1)"""
+    photo_list = []
+    for photo in get_storage(bucket).find(ORIGINALS_ONLY):
+        thumb_id = (photo.metadata or {}).get("variants", {}).get("thumb", photo._id)
+        image_data = read_file(bucket, thumb_id)
+        base64_img = base64.b64encode(image_data).decode('utf-8')
+        photo_list.append({
+            "_id": str(photo._id),
+            "filename": photo.filename,
+            "base64": f"data:image/jpeg;base64,{base64_img}",
+            "url": media_url(bucket, photo._id, signed=signed)
+        })
+    return photo_list
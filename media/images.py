@@ -0,0 +1,109 @@
+from PIL import Image, ImageOps
+from io import BytesIO
+
+# 업로드 시 한 번만 만들어 두는 파생 이미지 (긴 변 기준 최대 픽셀)
+VARIANTS = {
+    'thumb': 320,
+    'medium': 1024,
+    'full': 2048,
+}
+
+VARIANT_QUALITY = {
+    'thumb': 70,
+    'medium': 80,
+    'full': 85,
+}
+
+# 저장하는 원본도 긴 변 4096px 로 제한하고 다시 인코딩함
+ORIGINAL_MAX_EDGE = 4096
+ORIGINAL_QUALITY = 88
+
+# 압축 해제 폭탄 방지 (약 50MP 초과는 거부)
+MAX_IMAGE_PIXELS = 50_000_000
+Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+
+FORMATS = {
+    'JPEG': ('image/jpeg', '.jpg'),
+    'WEBP': ('image/webp', '.webp'),
+}
+
+
+class NormalizedImage:
+    def __init__(self, data, image, image_format):
+        self.data = data
+        self.image = image
+        self.width, self.height = image.size
+        self.content_type, self.extension = FORMATS[image_format]
+
+
+def has_alpha(image):
+    return image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+
+
+def flatten(image):
+    """투명 영역을 흰 배경으로 채워서 RGB 로 변환"""
+    if not has_alpha(image):
+        return image if image.mode in ('RGB', 'L') else image.convert('RGB')
+    rgba = image.convert('RGBA')
+    background = Image.new('RGB', rgba.size, (255, 255, 255))
+    background.paste(rgba, mask=rgba.getchannel('A'))
+    return background
+
+
+def encode(image, image_format, quality):
+    buffered = BytesIO()
+    if image_format == 'WEBP':
+        image.save(buffered, format='WEBP', quality=quality, method=4)
+    else:
+        image.save(buffered, format='JPEG', quality=quality, optimize=True, progressive=True)
+    return buffered.getvalue()
+
+
+def encode_jpeg(image, quality):
+    return encode(image, 'JPEG', quality)
+
+
+def normalize_image(data):
+    """업로드된 원본을 저장용으로 정규화
+
+    - 픽셀 수 제한 초과 시 Image.DecompressionBombError
+    - JPEG 은 draft 모드로 필요한 크기까지만 디코딩해서 메모리 사용을 줄임
+    - EXIF 방향 적용 후 EXIF/ICC 등 메타데이터는 버림
+    - 긴 변을 ORIGINAL_MAX_EDGE 로 줄이고 progressive JPEG (투명 이미지는 WebP) 로 다시 인코딩
+    애니메이션 이미지는 None (원본 그대로 저장), 이미지가 아니면 PIL 예외가 올라감.
+    """
+    image = Image.open(BytesIO(data))
+    if image.width * image.height > MAX_IMAGE_PIXELS:
+        raise Image.DecompressionBombError(
+            f"Image size ({image.width}x{image.height}) exceeds limit of {MAX_IMAGE_PIXELS} pixels"
+        )
+    if getattr(image, 'is_animated', False):
+        return None
+
+    if image.format == 'JPEG':
+        image.draft('RGB', (ORIGINAL_MAX_EDGE, ORIGINAL_MAX_EDGE))
+    image = ImageOps.exif_transpose(image)
+
+    if has_alpha(image):
+        image_format = 'WEBP'
+        image = image.convert('RGBA')
+    else:
+        image_format = 'JPEG'
+        image = flatten(image)
+
+    image.thumbnail((ORIGINAL_MAX_EDGE, ORIGINAL_MAX_EDGE), Image.LANCZOS)
+    return NormalizedImage(encode(image, image_format, ORIGINAL_QUALITY), image, image_format)
+
+
+def make_derivatives(image):
+    """정규화된 이미지로부터 {variant: (bytes, width, height)} 생성
+
+    메모리를 아끼려고 넘겨받은 이미지를 그대로 줄여나가므로 호출 후에는 크기가 바뀜.
+    """
+    image = flatten(image)
+    derivatives = {}
+    # 큰 것부터 줄여나가야 매번 원본에서 리샘플링하지 않음
+    for name, max_edge in sorted(VARIANTS.items(), key=lambda item: -item[1]):
+        image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+        derivatives[name] = (encode_jpeg(image, VARIANT_QUALITY[name]), image.width, image.height)
+    return derivatives
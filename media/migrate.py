@@ -0,0 +1,50 @@
+"""GridFS 에 저장된 이미지를 MEDIA_STORAGE 로 설정한 저장소(local/s3)로 옮기는 스크립트
+
+    MEDIA_STORAGE=s3 python -m media.migrate [--bucket diary] [--delete-source]
+
+_id, 파일 정보, 업로드 시간은 그대로 유지되므로 문서에 저장된 사진 id 는 바꿀 필요 없음.
+"""
+import argparse
+from database import media_buckets
+from .backends import GridFSBackend
+from .storage import storages
+
+
+def migrate_bucket(bucket, delete_source=False):
+    target = storages[bucket]
+    if isinstance(target, GridFSBackend):
+        raise SystemExit("MEDIA_STORAGE 가 gridfs 입니다. local 또는 s3 로 설정하세요.")
+
+    source = GridFSBackend(media_buckets[bucket])
+    copied = 0
+    skipped = 0
+    for grid_out in source.find({}):
+        if target.exists(grid_out._id):
+            skipped += 1
+        else:
+            target.put(
+                grid_out.read(),
+                _id=grid_out._id,
+                filename=grid_out.filename,
+                content_type=grid_out.content_type,
+                metadata=grid_out.metadata,
+                upload_date=grid_out.upload_date
+            )
+            copied += 1
+        if delete_source:
+            source.delete(grid_out._id)
+    print(f"[{bucket}] 복사 {copied}개, 이미 존재 {skipped}개")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GridFS 이미지를 다른 저장소로 이동")
+    parser.add_argument('--bucket', choices=sorted(media_buckets), help="한 버킷만 옮길 때")
+    parser.add_argument('--delete-source', action='store_true', help="복사 후 GridFS 에서 삭제")
+    args = parser.parse_args()
+
+    for bucket in ([args.bucket] if args.bucket else sorted(media_buckets)):
+        migrate_bucket(bucket, args.delete_source)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+from config import Config
+import base64
+import hashlib
+import hmac
+import time
+
+
+def _signing_key():
+    secret = Config.MEDIA_URL_SIGNING_KEY or Config.JWT_SECRET_KEY
+    if not secret:
+        return None
+    # JWT 서명 키를 그대로 쓰지 않도록 용도별 키를 파생
+    return hmac.new(secret.encode('utf-8'), b'media-url', hashlib.sha256).digest()
+
+
+def _signature(key, bucket, file_id, variant, expires):
+    message = f"{bucket}/{file_id}/{variant or ''}/{expires}".encode('utf-8')
+    digest = hmac.new(key, message, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b'=').decode('ascii')
+
+
+def url_expiry(now=None):
+    """MEDIA_URL_TTL 뒤의 만료 시각을 MEDIA_URL_WINDOW 단위로 올림
+
+    같은 구간 안에서 만든 URL 은 모두 같아서 브라우저/CDN 캐시를 그대로 씀.
+    """
+    now = int(now if now is not None else time.time())
+    window = max(Config.MEDIA_URL_WINDOW, 1)
+    return -(-(now + Config.MEDIA_URL_TTL) // window) * window
+
+
+def sign_media(bucket, file_id, variant=None, expires=None):
+    """{"exp": .., "sig": ..} 쿼리 파라미터 반환 (서명 키가 없으면 None)"""
+    key = _signing_key()
+    if key is None:
+        return None
+    expires = expires or url_expiry()
+    return {"exp": expires, "sig": _signature(key, bucket, str(file_id), variant, expires)}
+
+
+def verify_media(bucket, file_id, variant, expires, signature):
+    """서명이 맞으면 남은 유효 시간(초), 아니면 None (DB 조회 없음)"""
+    key = _signing_key()
+    if key is None or not signature:
+        return None
+    try:
+        expires = int(expires)
+    except (TypeError, ValueError):
+        return None
+    remaining = expires - int(time.time())
+    if remaining <= 0:
+        return None
+    expected = _signature(key, bucket, str(file_id), variant, expires)
+    if not hmac.compare_digest(expected, signature):
+        return None
+    return remaining
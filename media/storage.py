@@ -0,0 +1,44 @@
+from config import Config
+from database import db, media_buckets, media_collections
+from functools import lru_cache
+from .backends import GridFSBackend, LocalBackend, S3Backend
+
+
+@lru_cache(maxsize=None)
+def s3_client():
+    import boto3
+    return boto3.client(
+        's3',
+        aws_access_key_id=Config.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=Config.AWS_SECRET_ACCESS_KEY,
+        region_name=Config.AWS_S3_REGION,
+        endpoint_url=Config.AWS_S3_ENDPOINT_URL
+    )
+
+
+def create_storage(bucket, kind=None):
+    """MEDIA_STORAGE 설정에 맞는 버킷 저장소 생성"""
+    kind = kind or Config.MEDIA_STORAGE
+    if kind == 'gridfs':
+        return GridFSBackend(media_buckets[bucket])
+
+    # GridFS 외 저장소는 파일 정보를 <컬렉션>.objects 에 따로 저장
+    files = db[f"{media_collections[bucket]}.objects"]
+    if kind == 'local':
+        return LocalBackend(files, bucket, Config.MEDIA_LOCAL_DIR)
+    if kind == 's3':
+        return S3Backend(
+            files,
+            f"{Config.MEDIA_S3_PREFIX}/{bucket}",
+            s3_client(),
+            Config.AWS_S3_BUCKET,
+            Config.MEDIA_S3_PRESIGN_EXPIRES
+        )
+    raise ValueError(f"Unknown MEDIA_STORAGE: {kind}")
+
+
+storages = {bucket: create_storage(bucket) for bucket in media_collections}
+
+
+def get_storage(bucket):
+    return storages[bucket]
@@ -0,0 +1,323 @@
+from bson import ObjectId
+from config import Config
+import gridfs.errors
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+import threading
+from PIL import Image
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from database import media_blobs
+from .images import normalize_image, make_derivatives
+from .cache import media_cache
+from .storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+# 파생 이미지는 원본과 같은 버킷에 저장하고 metadata 로 서로 연결함
+#   원본:  metadata = {"variants": {"thumb": id, ...}, "width": .., "height": ..}
+#   파생:  metadata = {"original_id": id, "variant": "thumb", "width": .., "height": ..}
+ORIGINALS_ONLY = {"metadata.original_id": {"$exists": False}}
+
+# 같은 내용(정규화된 바이트의 SHA-256)의 이미지는 범위 안에서 한 번만 저장하고 참조 수를 셈
+#   - 방명록/다이어리/이벤트 사진은 문서에서 id 로만 참조하므로 버킷을 넘어 서로 공유
+#   - 프로필(user) 사진은 갤러리 목록에도 나오므로 같은 버킷 안에서만 공유
+#   - 관리자 갤러리(admin)는 업로드 하나가 갤러리 항목 하나라서 공유하지 않음
+# media_blobs 문서:
+#   {"_id": "<범위>:<sha256>", "bucket": 실제 저장 버킷, "file_id": 원본 id,
+#    "file_ids": [원본 + 파생본 id], "variants": {...}, "width", "height", "refs": 참조 수}
+DEDUP_SCOPES = {
+    'guestbook': 'documents',
+    'diary': 'documents',
+    'event': 'documents',
+    'user': 'user',
+}
+
+
+def dedup_scope(bucket):
+    """bucket 의 공유 범위. 서명된 URL 로만 받을 수 있는 버킷(MEDIA_SIGNED_BUCKETS)은 자기 버킷 안에서만 공유
+
+    서명하지 않는 버킷의 주소로 서명 버킷의 이미지를 받을 수 없도록 범위를 나눔.
+    """
+    if bucket in Config.MEDIA_SIGNED_BUCKETS:
+        return bucket
+    return DEDUP_SCOPES.get(bucket)
+
+# 원본 id -> 파생 이미지 id 목록 (목록 조회마다 files 컬렉션을 다시 읽지 않도록)
+VARIANT_INDEX_SIZE = 10000
+_variant_index = OrderedDict()
+_variant_lock = threading.Lock()
+
+# (요청 버킷, 파일 id) -> 실제로 저장된 버킷. 파일 id 는 다시 쓰이지 않으므로 바뀌지 않음
+OWNER_INDEX_SIZE = 20000
+_owner_index = OrderedDict()
+_owner_lock = threading.Lock()
+
+
+def save_image(bucket, file, filename, content_type=None):
+    """정규화한 원본과 파생 이미지(thumb/medium/full)를 함께 저장하고 원본 id 반환
+
+    너무 큰 이미지는 Image.DecompressionBombError 로 거부함.
+    """
+    return store_image(bucket, file, filename, content_type)["_id"]
+
+
+def store_image(bucket, file, filename, content_type=None):
+    """save_image 와 같지만 {"_id", "width", "height", "variants"} 를 반환
+
+    목록 응답에서 파일을 다시 조회하지 않도록 크기를 문서에 같이 저장할 때 사용.
+    같은 내용이 이미 저장돼 있으면 새로 저장하지 않고 기존 id 의 참조 수만 올림.
+    """
+    data = file.read() if hasattr(file, 'read') else file
+    if content_type is None:
+        content_type = getattr(file, 'content_type', None) or 'application/octet-stream'
+
+    stem = os.path.splitext(filename)[0]
+    metadata = {}
+    try:
+        normalized = normalize_image(data)
+    except Image.DecompressionBombError:
+        raise
+    except Exception as e:
+        # 이미지가 아닌 파일은 파생본 없이 원본만 저장
+        logger.warning(f"Failed to normalize {filename}: {str(e)}")
+        normalized = None
+
+    if normalized is not None:
+        # 정규화된 바이트를 원본으로 저장하고 실제 형식에 맞게 이름/타입 지정
+        data = normalized.data
+        content_type = normalized.content_type
+        filename = stem + normalized.extension
+        metadata.update({"width": normalized.width, "height": normalized.height})
+
+    scope = dedup_scope(bucket)
+    blob_key = f"{scope}:{hashlib.sha256(data).hexdigest()}" if scope else None
+    if blob_key:
+        blob = _add_reference(blob_key)
+        if blob is not None:
+            # 파생 이미지 생성과 업로드를 모두 건너뜀
+            return _blob_result(blob)
+
+    derivatives = make_derivatives(normalized.image) if normalized is not None else {}
+    stored = _put_image(bucket, data, stem, filename, content_type, metadata, derivatives)
+    if blob_key:
+        return _register_blob(blob_key, bucket, stored)
+    return stored
+
+
+def _put_image(bucket, data, stem, filename, content_type, metadata, derivatives):
+    storage = get_storage(bucket)
+    original_id = ObjectId()
+    variants = {}
+    for variant, (blob, width, height) in derivatives.items():
+        variants[variant] = storage.put(
+            blob,
+            filename=f"{stem}_{variant}.jpg",
+            content_type='image/jpeg',
+            metadata={
+                "original_id": original_id,
+                "variant": variant,
+                "width": width,
+                "height": height
+            }
+        )
+    if variants:
+        metadata["variants"] = variants
+
+    storage.put(data, _id=original_id, filename=filename, content_type=content_type, metadata=metadata)
+    return {
+        "_id": original_id,
+        "width": metadata.get("width"),
+        "height": metadata.get("height"),
+        "variants": variants
+    }
+
+
+def _blob_result(blob):
+    return {
+        "_id": blob["file_id"],
+        "width": blob.get("width"),
+        "height": blob.get("height"),
+        "variants": blob.get("variants", {})
+    }
+
+
+def _add_reference(blob_key):
+    return media_blobs.find_one_and_update(
+        {"_id": blob_key},
+        {"$inc": {"refs": 1}},
+        return_document=ReturnDocument.AFTER
+    )
+
+
+def _register_blob(blob_key, bucket, stored):
+    """새로 저장한 이미지를 참조 테이블에 등록
+
+    같은 내용이 동시에 업로드돼서 먼저 등록된 것이 있으면 방금 저장한 파일은 지우고 그쪽을 씀.
+    """
+    doc = {
+        "_id": blob_key,
+        "bucket": bucket,
+        "file_id": stored["_id"],
+        "file_ids": [stored["_id"], *stored["variants"].values()],
+        "variants": stored["variants"],
+        "width": stored["width"],
+        "height": stored["height"],
+        "refs": 1
+    }
+    while True:
+        try:
+            media_blobs.insert_one(doc)
+            return stored
+        except DuplicateKeyError:
+            blob = _add_reference(blob_key)
+            if blob is not None:
+                _delete_files(bucket, stored["_id"])
+                return _blob_result(blob)
+            # 그 사이 마지막 참조가 지워졌으면 다시 등록
+
+
+def delete_image(bucket, file_id):
+    """참조 수를 하나 줄이고, 마지막 참조였으면 원본과 파생 이미지를 모두 삭제
+
+    중복 제거 이전에 저장된 파일(참조 테이블에 없음)은 바로 삭제함.
+    """
+    file_id = ObjectId(file_id)
+    blob = media_blobs.find_one_and_update(
+        {"file_ids": file_id, "file_id": file_id, "refs": {"$gt": 0}},
+        {"$inc": {"refs": -1}},
+        return_document=ReturnDocument.AFTER
+    )
+    if blob is None:
+        # 참조가 남지 않은 채 남아 있는 항목이 있으면 함께 정리
+        media_blobs.delete_many({"file_ids": file_id, "file_id": file_id, "refs": {"$lte": 0}})
+        _delete_files(owner_buckets(bucket, [file_id])[str(file_id)], file_id)
+        return
+    if blob["refs"] > 0:
+        return
+    # 삭제 직전에 다른 업로드가 참조를 가져갔으면 지우지 않음
+    if media_blobs.delete_one({"_id": blob["_id"], "refs": 0}).deleted_count == 0:
+        return
+    _delete_files(blob["bucket"], file_id)
+
+
+def release_images(bucket, file_ids):
+    """업로드 뒤 문서 저장이 실패했을 때 방금 올린 이미지의 참조를 되돌림 (실패는 기록만 함)"""
+    for file_id in file_ids:
+        try:
+            delete_image(bucket, file_id)
+        except Exception as e:
+            logger.warning(f"Failed to release {bucket}/{file_id}: {str(e)}")
+
+
+def _delete_files(bucket, file_id):
+    storage = get_storage(bucket)
+    for derivative in list(storage.find({"metadata.original_id": file_id})):
+        storage.delete(derivative._id)
+        media_cache.invalidate(bucket, derivative._id)
+    storage.delete(file_id)
+    media_cache.invalidate(bucket, file_id)
+    with _variant_lock:
+        _variant_index.pop((bucket, str(file_id)), None)
+
+
+def _shares_across_buckets(bucket):
+    scope = dedup_scope(bucket)
+    return scope is not None and sum(1 for other in DEDUP_SCOPES if dedup_scope(other) == scope) > 1
+
+
+def owner_buckets(bucket, file_ids):
+    """파일 id 목록을 실제로 저장된 버킷으로 변환 ({str(id): 버킷})
+
+    다른 버킷과 공유하는 버킷만 참조 테이블을 조회하며, 처음 보는 id 만 한 번의 쿼리로 찾음.
+    참조 테이블에 없는 id 는 요청한 버킷에 있는 것으로 봄.
+    """
+    file_ids = [str(file_id) for file_id in file_ids]
+    if not _shares_across_buckets(bucket):
+        return {file_id: bucket for file_id in file_ids}
+
+    with _owner_lock:
+        missing = [file_id for file_id in file_ids if (bucket, file_id) not in _owner_index]
+    if missing:
+        found = {}
+        for blob in media_blobs.find({"file_ids": {"$in": [ObjectId(file_id) for file_id in missing]}},
+                                     {"bucket": 1, "file_ids": 1}):
+            for blob_file_id in blob["file_ids"]:
+                found[str(blob_file_id)] = blob["bucket"]
+        with _owner_lock:
+            for file_id in missing:
+                _owner_index[(bucket, file_id)] = found.get(file_id, bucket)
+            while len(_owner_index) > OWNER_INDEX_SIZE:
+                _owner_index.popitem(last=False)
+
+    with _owner_lock:
+        return {file_id: _owner_index.get((bucket, file_id), bucket) for file_id in file_ids}
+
+
+def _remember_variants(bucket, file_id, variants):
+    with _variant_lock:
+        _variant_index[(bucket, str(file_id))] = variants
+        _variant_index.move_to_end((bucket, str(file_id)))
+        while len(_variant_index) > VARIANT_INDEX_SIZE:
+            _variant_index.popitem(last=False)
+
+
+def variant_ids(bucket, file_ids, variant):
+    """원본 id 목록을 파생 이미지 id 로 변환
+
+    파생본 정보는 바뀌지 않으므로 메모리에 기억해 두고, 처음 보는 id 만 저장된 버킷별로 한 번씩 조회.
+    파생본이 없는(이전에 업로드된) 파일은 원본 id 를 그대로 돌려줌.
+    """
+    file_ids = [str(file_id) for file_id in file_ids]
+    owners = owner_buckets(bucket, file_ids)
+    with _variant_lock:
+        missing = {}
+        for file_id in file_ids:
+            if (owners[file_id], file_id) not in _variant_index:
+                missing.setdefault(owners[file_id], []).append(ObjectId(file_id))
+    for owner, owner_ids in missing.items():
+        for grid_out in get_storage(owner).find({"_id": {"$in": owner_ids}}):
+            _remember_variants(owner, grid_out._id, (grid_out.metadata or {}).get("variants", {}))
+
+    resolved = {}
+    with _variant_lock:
+        for file_id in file_ids:
+            variants = _variant_index.get((owners[file_id], file_id), {})
+            resolved[file_id] = variants.get(variant, ObjectId(file_id))
+    return resolved
+
+
+def locate_file(bucket, file_id, variant=None):
+    """(실제 저장 버킷, 보낼 파일 id) 반환. 파생본이 없으면 원본 id"""
+    file_id = ObjectId(file_id)
+    target_id = variant_ids(bucket, [file_id], variant)[str(file_id)] if variant else file_id
+    return owner_buckets(bucket, [target_id])[str(target_id)], target_id
+
+
+def open_file(bucket, file_id):
+    """캐시를 거쳐 파일을 연다 (없으면 gridfs.errors.NoFile)
+
+    다른 버킷과 공유하는 이미지는 실제로 저장된 버킷에서 읽고 캐시도 그 버킷 기준으로 공유함.
+    """
+    file_id = ObjectId(file_id)
+    owner = owner_buckets(bucket, [file_id])[str(file_id)]
+    return media_cache.get(owner, file_id, lambda: get_storage(owner).get(file_id))
+
+
+def read_file(bucket, file_id):
+    return open_file(bucket, file_id).read()
+
+
+def open_variant(bucket, file_id, variant=None):
+    """파생 이미지 파일 반환 (variant 가 없거나 파생본이 없으면 원본)"""
+    if not variant:
+        return open_file(bucket, file_id)
+    variant_id = variant_ids(bucket, [file_id], variant)[str(file_id)]
+    try:
+        return open_file(bucket, variant_id)
+    except gridfs.errors.NoFile:
+        if variant_id == ObjectId(file_id):
+            raise
+        return open_file(bucket, file_id)
@@ -0,0 +1,84 @@
+from flask import request
+from werkzeug.wrappers import Response
+from werkzeug.wsgi import FileWrapper
+from urllib.parse import urlencode
+from config import Config
+import hashlib
+from .signing import sign_media
+
+# GridFS 기본 청크 크기(255KB)에 맞춰서 읽어야 청크 하나당 한 번씩만 조회함
+CHUNK_SIZE = 255 * 1024
+
+# GridFS 파일은 한 번 저장되면 내용이 바뀌지 않으므로 1년 동안 캐시 가능
+CACHE_MAX_AGE = 60 * 60 * 24 * 365
+
+
+def make_etag(grid_out):
+    """md5/length/uploadDate 로 강한 ETag 생성 (md5 가 없는 파일은 _id 로 대체)"""
+    upload_date = grid_out.upload_date
+    timestamp = int(upload_date.timestamp() * 1000) if upload_date else 0
+    md5 = getattr(grid_out, 'md5', None) or str(grid_out._id)
+    seed = f"{md5}:{grid_out.length}:{timestamp}"
+    return hashlib.sha1(seed.encode('utf-8')).hexdigest()
+
+
+def send_media(grid_out, max_age=CACHE_MAX_AGE, public=True):
+    """GridOut 을 메모리에 올리지 않고 청크 단위로 스트리밍하는 응답 생성
+
+    Range 요청(206/416), If-None-Match / If-Modified-Since(304)는
+    werkzeug 의 make_conditional 이 처리함.
+    public=False 는 로그인/관리자 전용 라우트용: 프록시/CDN 이 저장하지 않도록 private, no-store.
+    """
+    # gunicorn 의 file_wrapper 는 seek 를 지원하지 않아서 Range 요청 시
+    # 앞부분을 전부 읽게 되므로 werkzeug 의 FileWrapper 를 직접 사용
+    body = FileWrapper(grid_out, CHUNK_SIZE)
+    response = Response(
+        body,
+        mimetype=grid_out.content_type or 'application/octet-stream',
+        direct_passthrough=True
+    )
+    response.content_length = grid_out.length
+    response.accept_ranges = 'bytes'
+    response.set_etag(make_etag(grid_out))
+    if grid_out.upload_date:
+        response.last_modified = grid_out.upload_date
+    if public:
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.private = True
+        response.cache_control.no_store = True
+    if grid_out.filename:
+        response.headers.set('Content-Disposition', 'inline', filename=grid_out.filename)
+
+    return response.make_conditional(
+        request.environ,
+        accept_ranges=True,
+        complete_length=grid_out.length
+    )
+
+
+def media_url(bucket, file_id, variant=None, signed=None):
+    """/api/media 주소. signed 가 None 이면 MEDIA_SIGNED_BUCKETS 에 있는 버킷만 서명"""
+    params = {"variant": variant} if variant else {}
+    if signed is None:
+        signed = bucket in Config.MEDIA_SIGNED_BUCKETS
+    if signed:
+        params.update(sign_media(bucket, file_id, variant) or {})
+    url = f"/api/media/{bucket}/{file_id}"
+    if params:
+        url += f"?{urlencode(params)}"
+    return url
+
+
+def media_ref(bucket, file_id, info=None, signed=None):
+    """목록 응답에 넣는 이미지 참조 (클라이언트가 url 로 지연 로딩)"""
+    info = info or {}
+    return {
+        "id": str(file_id),
+        "url": media_url(bucket, file_id, signed=signed),
+        "thumb_url": media_url(bucket, file_id, 'thumb', signed=signed),
+        "width": info.get("width"),
+        "height": info.get("height")
+    }
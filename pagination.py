@@ -0,0 +1,117 @@
+from bson import json_util
+from bson.errors import InvalidId
+from config import Config
+import base64
+import binascii
+import threading
+import time
+from collections import OrderedDict
+
+# 커서 기반(keyset) 페이지네이션 공통 함수
+# 커서는 (정렬 필드 값, _id) 를 extended JSON 으로 직렬화한 뒤 base64url 로 감싼 문자열
+
+
+def encode_cursor(value, _id):
+    raw = json_util.dumps({"v": value, "id": _id})
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """잘못된 커서는 ValueError"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        data = json_util.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+        return data["v"], data["id"]
+    except (binascii.Error, UnicodeError, KeyError, TypeError, ValueError, InvalidId):
+        raise ValueError("Invalid cursor")
+
+
+def keyset_filter(field, value, _id, direction=-1):
+    """(field, _id) 정렬 기준으로 커서 다음 위치부터 가져오는 조건"""
+    op = '$lt' if direction < 0 else '$gt'
+    return {'$or': [
+        {field: {op: value}},
+        {field: value, '_id': {op: _id}}
+    ]}
+
+
+def parse_limit(value, default=20, maximum=100):
+    try:
+        limit = int(value) if value is not None else default
+    except ValueError:
+        limit = default
+    return max(1, min(limit, maximum))
+
+
+def wants_cursor(args):
+    """cursor/before/limit 중 하나라도 있으면 커서 페이지네이션 (없으면 이전 page/page_size 방식)"""
+    return any(key in args for key in ('cursor', 'before', 'limit'))
+
+
+def keyset_page(collection, query, field, direction=-1, limit=20, after=None, before=None, projection=None):
+    """(field, _id) 순서로 limit 개와 (문서 목록, 다음 커서, 이전 커서) 반환
+
+    after 는 다음 페이지, before 는 이전 페이지 커서 (잘못된 커서는 ValueError).
+    skip 없이 커서 위치부터 인덱스를 읽으므로 몇 번째 페이지든 비용이 같음.
+    """
+    backward = before is not None
+    scan = -direction if backward else direction
+    conditions = [query] if query else []
+    if after or before:
+        value, _id = decode_cursor(before if backward else after)
+        conditions.append(keyset_filter(field, value, _id, scan))
+    filter = {'$and': conditions} if len(conditions) > 1 else (conditions[0] if conditions else {})
+
+    docs = list(collection.find(filter, projection, sort=[(field, scan), ('_id', scan)], limit=limit + 1))
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+    if backward:
+        docs.reverse()
+    if not docs:
+        return docs, None, None
+
+    first = encode_cursor(docs[0].get(field), docs[0]['_id'])
+    last = encode_cursor(docs[-1].get(field), docs[-1]['_id'])
+    if backward:
+        return docs, last, first if has_more else None
+    return docs, last if has_more else None, first if after else None
+
+
+def cursor_page(collection, query, field, direction, args, default_limit=10):
+    """요청 파라미터(cursor, before, limit, total=1)로 keyset_page 실행 -> (문서 목록, 응답에 합칠 dict)"""
+    limit = parse_limit(args.get('limit'), default=default_limit)
+    docs, next_cursor, prev_cursor = keyset_page(
+        collection, query, field, direction, limit, after=args.get('cursor'), before=args.get('before')
+    )
+    meta = {"next_cursor": next_cursor, "prev_cursor": prev_cursor, "limit": limit}
+    if args.get('total') == '1':
+        meta["total_entries"] = cached_count(collection, query)
+    return docs, meta
+
+
+# (컬렉션, 조건) -> (문서 수, 만료 시각). 조건 조합이 많아도 메모리가 늘지 않도록 LRU 로 개수 제한
+COUNT_CACHE_SIZE = 1000
+_counts = OrderedDict()
+_counts_lock = threading.Lock()
+
+
+def cached_count(collection, query):
+    """문서 수. 조건이 없으면 컬렉션 메타데이터의 추정값, 있으면 PAGINATION_COUNT_TTL 초 동안 캐시한 값"""
+    if not query:
+        return collection.estimated_document_count()
+    key = (collection.full_name, json_util.dumps(query, sort_keys=True))
+    now = time.monotonic()
+    with _counts_lock:
+        cached = _counts.get(key)
+        if cached and cached[1] > now:
+            _counts.move_to_end(key)
+            return cached[0]
+    count = collection.count_documents(query)
+    if Config.PAGINATION_COUNT_TTL <= 0:
+        return count
+    with _counts_lock:
+        _counts[key] = (count, now + Config.PAGINATION_COUNT_TTL)
+        _counts.move_to_end(key)
+        while len(_counts) > COUNT_CACHE_SIZE:
+            _counts.popitem(last=False)
+    return count
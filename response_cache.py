@@ -0,0 +1,215 @@
+from collections import OrderedDict
+from config import Config
+from datetime import datetime, timedelta
+from flask import request, make_response
+from functools import wraps
+import threading
+import time
+
+# 관리자만 바꾸는 데이터(일정/스탯/프로필/이벤트/최신 기사)를 읽는 GET 응답 캐시
+# 키는 경로 + 정렬한 쿼리 파라미터, 값은 응답 본문/상태/mimetype/헤더. 항목마다 태그를 붙여 두고
+# 해당 데이터를 바꾸는 엔드포인트가 @invalidates(태그) 로 지움
+#
+# RESPONSE_CACHE_BACKEND:
+#   memory (기본) - 워커 프로세스마다 따로 가진 LRU. 다른 워커의 수정은 TTL 이 지나야 반영됨
+#   mongo         - response_cache 컬렉션을 모든 워커가 함께 사용 (수정 즉시 모든 워커에 반영)
+#   off           - 캐시하지 않음
+
+
+class MemoryBackend:
+    """항목 수 기준 프로세스 내 LRU (태그 -> 키 역색인으로 무효화)"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._tags = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, _, value = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl, tags):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, tags, value)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, tags):
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys |= self._tags.get(tag, set())
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def _remove(self, key):
+        _, tags, _ = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class MongoBackend:
+    """모든 워커가 함께 쓰는 캐시 (response_cache 컬렉션, expires_at TTL 인덱스는 indexes.py)"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def get(self, key):
+        # TTL 인덱스는 1분 간격으로 지우므로 만료 시각을 직접 확인
+        doc = self.collection.find_one({'_id': key, 'expires_at': {'$gt': datetime.utcnow()}})
+        return doc['value'] if doc else None
+
+    def set(self, key, value, ttl, tags):
+        self.collection.replace_one(
+            {'_id': key},
+            {'value': value, 'tags': list(tags), 'expires_at': datetime.utcnow() + timedelta(seconds=ttl)},
+            upsert=True
+        )
+
+    def invalidate(self, tags):
+        return self.collection.delete_many({'tags': {'$in': list(tags)}}).deleted_count
+
+
+class ResponseCache:
+    def __init__(self, backend, default_ttl):
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+
+    def _count(self, counter, amount=1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    @staticmethod
+    def key():
+        """경로 + 이름/값 순으로 정렬한 쿼리 파라미터 (?b=2&a=1 과 ?a=1&b=2 는 같은 키)"""
+        args = sorted((name, value) for name, values in request.args.lists() for value in values)
+        return request.path + '?' + '&'.join(f"{name}={value}" for name, value in args)
+
+    def get(self, key):
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            print(f"응답 캐시 조회 실패: {e}")
+            return None
+        self._count('hits' if value is not None else 'misses')
+        return value
+
+    def set(self, key, value, ttl, tags):
+        try:
+            self.backend.set(key, value, ttl, tags)
+        except Exception as e:
+            print(f"응답 캐시 저장 실패: {e}")
+
+    def invalidate(self, *tags):
+        """tags 중 하나라도 붙은 항목 삭제"""
+        try:
+            removed = self.backend.invalidate(tags)
+        except Exception as e:
+            print(f"응답 캐시 무효화 실패: {e}")
+            return 0
+        self._count('invalidations', removed)
+        return removed
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "invalidations": self.invalidations}
+
+
+def _backend(name):
+    if name == 'memory':
+        return MemoryBackend(Config.RESPONSE_CACHE_MAX_ENTRIES)
+    if name == 'mongo':
+        from database import db
+        return MongoBackend(db['response_cache'])
+    if name == 'off':
+        return None
+    raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND: {name}")
+
+
+# 저장하지 않는 헤더: 본문/mimetype 으로 다시 만들어지는 것과 요청한 사용자에게만 해당하는 쿠키
+_UNSHARED_HEADERS = {'content-length', 'content-type', 'set-cookie'}
+
+
+def response_value(response):
+    """캐시/공유할 수 있는 응답 값 {'body', 'status', 'mimetype', 'headers'}
+
+    headers 는 [이름, 값] 목록 (ETag, Cache-Control, Last-Modified 등, 같은 이름이 여러 번 있어도 유지).
+    """
+    headers = [[name, value] for name, value in response.headers.items() if name.lower() not in _UNSHARED_HEADERS]
+    return {
+        'body': response.get_data(),
+        'status': response.status_code,
+        'mimetype': response.mimetype,
+        'headers': headers
+    }
+
+
+def value_response(value):
+    response = make_response(value['body'], value['status'])
+    response.mimetype = value['mimetype']
+    for name, header in value.get('headers', ()):
+        response.headers.add(name, header)
+    return response
+
+
+response_cache = ResponseCache(_backend(Config.RESPONSE_CACHE_BACKEND), Config.RESPONSE_CACHE_TTL)
+
+
+def cached_response(*tags, ttl=None):
+    """GET 뷰의 200 응답을 캐시 (route 데코레이터 아래에 붙임)
+
+    응답에 X-Cache: HIT/MISS 헤더를 붙임.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if response_cache.backend is None:
+                return view(*args, **kwargs)
+            key = response_cache.key()
+            value = response_cache.get(key)
+            if value is not None:
+                response = value_response(value)
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.direct_passthrough:
+                response_cache.set(key, response_value(response), ttl or response_cache.default_ttl, tags)
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
+
+
+def invalidates(*tags):
+    """뷰가 성공(2xx)하면 tags 캐시 삭제 (route 데코레이터 아래에 붙임)"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            response = make_response(view(*args, **kwargs))
+            if response.status_code < 300:
+                response_cache.invalidate(*tags)
+            return response
+        return wrapper
+    return decorator
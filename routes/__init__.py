@@ -11,6 +11,7 @@ from .newsrookie_routes import newsrookie_bp
 from .newsjump_routes import newsjumpball_bp
 from .news_routes import news_bp
 from .diary_routes import diary_bp
+from .media_routes import media_bp
 
 
 bp = Blueprint('routes', __name__)
@@ -26,3 +27,4 @@ bp.register_blueprint(newsrookie_bp)
 bp.register_blueprint(newsjumpball_bp)
 bp.register_blueprint(news_bp)
 bp.register_blueprint(diary_bp)
+bp.register_blueprint(media_bp)
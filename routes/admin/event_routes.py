@@ -1,10 +1,12 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
-from database import events, fs_event,db
+from database import events, db
 from bson import ObjectId
 import base64
 import gridfs.errors
 import datetime
+from media import save_image, delete_image, release_images, fetch_files
+from response_cache import invalidates
 from .admin_routes import admin_required
 
 admin_event_bp = Blueprint('admin_event', __name__)
@@ -14,6 +16,12 @@ admin_event_bp = Blueprint('admin_event', __name__)
 def get_admin_events():
     try:
         events = list(db.admin_events.find({}))
+
+        # 모든 이벤트의 썸네일을 한 번에 병렬로 가져옴
+        all_photo_ids = [photo_id for event in events for photo_id in event.get("photos", [])]
+        photo_files, _ = fetch_files('event', all_photo_ids, 'thumb')
+        photo_files = iter(photo_files)
+
         for event in events:
             event["_id"] = str(event["_id"])  # ObjectId를 문자열로 변환
             if "check_1" in event or "check_2" in event or "check_3" in event:
@@ -26,15 +34,12 @@ def get_admin_events():
                 event["checkFields"] = check_fields
 
             if "photos" in event:
-                photo_ids = event["photos"]
                 photos = []
-                for photo_id in photo_ids:
-                    try:
-                        photo_file = fs_event.get(ObjectId(photo_id))
-                        photo_data = base64.b64encode(photo_file.read()).decode('utf-8')
-                        photos.append(f"data:{photo_file.content_type};base64,{photo_data}")
-                    except gridfs.errors.NoFile:
+                for photo_file in [next(photo_files) for _ in event["photos"]]:
+                    if photo_file is None:
                         continue
+                    photo_data = base64.b64encode(photo_file.read()).decode('utf-8')
+                    photos.append(f"data:{photo_file.content_type};base64,{photo_data}")
                 event["photos"] = photos
             else:
                 event["photos"] = []
@@ -46,6 +51,7 @@ def get_admin_events():
 
 @admin_event_bp.route('/api/admin/postevents', methods=['POST'])
 @admin_required
+@invalidates('events')
 def post_events():
     try:
         title = request.form.get('title', '')
@@ -69,14 +75,20 @@ def post_events():
 
         files = request.files.getlist("photos")
         photo_ids = []
-        for file in files:
-            file_id = fs_event.put(file, filename=file.filename, content_type=file.content_type)
-            photo_ids.append(str(file_id))
-
-        events.update_one(
-            {"_id": event_id},
-            {"$set": {"photos": photo_ids}}
-        )
+        try:
+            for file in files:
+                file_id = save_image('event', file, filename=file.filename, content_type=file.content_type)
+                photo_ids.append(str(file_id))
+
+            events.update_one(
+                {"_id": event_id},
+                {"$set": {"photos": photo_ids}}
+            )
+        except Exception:
+            # 사진 저장이나 연결이 실패하면 이벤트와 이미 올린 사진 참조를 되돌림
+            release_images('event', photo_ids)
+            events.delete_one({"_id": event_id})
+            raise
 
         return jsonify({"message": "Event and photos uploaded successfully"}), 200
     except Exception as e:
@@ -84,6 +96,7 @@ def post_events():
 
 @admin_event_bp.route('/api/admin/delete/eventphoto', methods=['DELETE'])
 @admin_required
+@invalidates('events')
 def delete_photo():
     try:
         data = request.get_json()
@@ -96,7 +109,7 @@ def delete_photo():
 
         photo_id = event['photos'][photo_index]
 
-        fs_event.delete(ObjectId(photo_id))
+        delete_image('event', photo_id)
 
         events.update_one(
             {"_id": ObjectId(event_id)},
@@ -109,6 +122,7 @@ def delete_photo():
 
 @admin_event_bp.route('/api/admin/delete/event', methods=['DELETE'])
 @admin_required
+@invalidates('events')
 def delete_event():
     try:
         data = request.get_json()
@@ -121,7 +135,7 @@ def delete_event():
         if "photos" in event:
             for photo_id in event["photos"]:
                 try:
-                    fs_event.delete(ObjectId(photo_id))
+                    delete_image('event', photo_id)
                 except gridfs.errors.NoFile:
                     continue
 
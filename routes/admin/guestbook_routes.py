@@ -1,8 +1,11 @@
-from flask import Blueprint, request, jsonify, make_response
+from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
-from database import guestbooks, fs_guestbooks
+from database import guestbooks
 from bson import ObjectId
 import base64
+from media import send_media, delete_image, open_file, fetch_files
+from pagination import wants_cursor, cursor_page, cached_count
+from conditional import changes
 from .admin_routes import admin_required
 
 admin_guestbook_bp = Blueprint('guestbook_bp', __name__)
@@ -20,17 +23,31 @@ def get_admin_guestbook_entries():
         if name_filter:
             query['name'] = name_filter
 
-        entries = guestbooks.find(query).sort('name', 1).skip(skip).limit(page_size)
+        # cursor/before/limit 가 있으면 name/_id 커서로 페이지를 넘김 (skip 없이 같은 비용)
+        page_info = None
+        if wants_cursor(request.args):
+            try:
+                entries, page_info = cursor_page(guestbooks, query, 'name', 1, request.args)
+            except ValueError as e:
+                return jsonify({"message": str(e)}), 400
+        else:
+            entries = list(guestbooks.find(query).sort('name', 1).skip(skip).limit(page_size))
+        # 썸네일을 한 번에 병렬로 가져옴 (없는 파일은 photo_data 없이 반환)
+        photos, _ = fetch_files('guestbook', [entry['photo_id'] for entry in entries if entry.get('photo_id')], 'thumb')
+        photos = iter(photos)
         entry_list = []
         for entry in entries:
             entry['_id'] = str(entry['_id'])
-            if entry.get('photo_id'):
-                photo = fs_guestbooks.get(ObjectId(entry['photo_id']))
+            photo = next(photos) if entry.get('photo_id') else None
+            if photo is not None:
                 photo_data = base64.b64encode(photo.read()).decode('utf-8')
                 entry['photo_data'] = photo_data
             entry_list.append(entry)
 
-        total_entries = guestbooks.count_documents(query)
+        if page_info is not None:
+            return jsonify({"entries": entry_list, **page_info}), 200
+        # 전체 수는 잠시 캐시해서 페이지마다 다시 세지 않음
+        total_entries = cached_count(guestbooks, query)
         return jsonify({"entries": entry_list, "total_entries": total_entries}), 200
     except Exception as e:
         return jsonify({"message": str(e)}), 500
@@ -39,17 +56,15 @@ def get_admin_guestbook_entries():
 @admin_required
 def get_admin_guestbook_photo(photo_id):
     try:
-        photo = fs_guestbooks.get(ObjectId(photo_id))
-        data = photo.read()
-        response = make_response(data)
-        response.headers.set('Content-Type', photo.content_type)
-        response.headers.set('Content-Disposition', 'inline', filename=photo.filename)
-        return response
+        photo = open_file('guestbook', ObjectId(photo_id))
+        # 관리자 전용 응답이므로 공유 캐시에 남기지 않음
+        return send_media(photo, public=False)
     except Exception as e:
         return jsonify({"status": "Failed", "message": str(e)}), 500
 
 @admin_guestbook_bp.route('/api/admin/delete_guestbook_entry/<entry_id>', methods=['DELETE', 'OPTIONS'])
 @admin_required
+@changes('guestbooks')
 def delete_admin_guestbook_entry(entry_id):
     if request.method == 'OPTIONS':
         return jsonify({"message": "CORS preflight request successful"}), 200
@@ -60,7 +75,7 @@ def delete_admin_guestbook_entry(entry_id):
             return jsonify({"message": "Entry not found"}), 404
 
         if entry.get('photo_id'):
-            fs_guestbooks.delete(ObjectId(entry['photo_id']))
+            delete_image('guestbook', entry['photo_id'])
 
         guestbooks.delete_one({"_id": ObjectId(entry_id)})
 
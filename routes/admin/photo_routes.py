@@ -1,9 +1,9 @@
-from flask import Blueprint, request, jsonify, make_response
+from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
-from database import fs_admin, fs_user, fs_event, fs_guestbooks
 from bson import ObjectId
-import base64
 import gridfs.errors
+from pagination import parse_limit
+from media import send_media, save_image, delete_image, list_gallery, parse_buckets, inline_photo_list, open_file, get_storage
 
 admin_photo_bp = Blueprint('admin_photo_bp', __name__)
 
@@ -13,7 +13,7 @@ def post_photo():
     try:
         files = request.files.getlist("photos")
         for file in files:
-            fs_admin.put(file, filename=file.filename, content_type=file.content_type)
+            save_image('admin', file, filename=file.filename, content_type=file.content_type)
         return jsonify({"message": "Photos uploaded successfully"}), 200
     except Exception as e:
         return jsonify({"message": str(e)}), 500
@@ -23,56 +23,39 @@ def post_photo():
 def get_photo(photo_id):
     try:
         try:
-            file = fs_admin.get(ObjectId(photo_id))
+            file = open_file('admin', ObjectId(photo_id))
         except gridfs.errors.NoFile:
-            file = fs_user.get(ObjectId(photo_id))
+            file = open_file('user', ObjectId(photo_id))
 
-        data = file.read()
-
-        response = make_response(data)
-        response.headers.set('Content-Type', file.content_type)
-        response.headers.set('Content-Disposition', 'inline', filename=file.filename)
-        
-        return response
+        # JWT 가 필요한 응답이므로 공유 캐시에 남기지 않음
+        return send_media(file, public=False)
 
     except Exception as e:
         return jsonify({"status": "Failed", "message": str(e)}), 500
 
 @admin_photo_bp.route('/api/admin/get/photos', methods=['GET'])
-# @jwt_required()
+@jwt_required()
 def get_photos():
     try:
-        # token = request.headers.get('Authorization').split()[1]
+        # 이미지는 <img> 로 바로 불러올 수 있도록 /api/media 주소로 내려줌
+        # JWT 로 받은 목록이므로 MEDIA_SIGNED_BUCKETS 와 관계없이 서명된 주소를 씀
+        # (admin/user 를 서명 버킷에 넣어도 관리자 화면은 그대로 동작)
 
-        admin_photos = fs_admin.find()
-        admin_photo_list = []
-        for photo in admin_photos:
-            image_data = fs_admin.get(photo._id).read()
-            base64_img = base64.b64encode(image_data).decode('utf-8')
-            data_url = f"data:image/jpeg;base64,{base64_img}"
-            admin_photo_list.append({
-                "_id": str(photo._id),
-                "filename": photo.filename,
-                "base64": data_url,
-                # "url": f"/api/admin/get/photo/{photo._id}?token={token}"
-                "url": f"/api/admin/get/photo/{photo._id}"
-            })
+        # 이전 클라이언트 호환용: 모든 사진을 base64 로 한 번에 반환
+        if request.args.get('inline') == '1':
+            return jsonify({
+                "admin_photos": inline_photo_list('admin', signed=True),
+                "user_photos": inline_photo_list('user', signed=True)
+            }), 200
 
-        user_photos = fs_user.find()
-        user_photo_list = []
-        for photo in user_photos:
-            image_data = fs_user.get(photo._id).read()
-            base64_img = base64.b64encode(image_data).decode('utf-8')
-            data_url = f"data:image/jpeg;base64,{base64_img}"
-            user_photo_list.append({
-                "_id": str(photo._id),
-                "filename": photo.filename,
-                "base64": data_url,
-                # "url": f"/api/admin/get/photo/{photo._id}?token={token}"
-                "url": f"/api/admin/get/photo/{photo._id}"
-            })
+        try:
+            buckets = parse_buckets(request.args.get('bucket'))
+            limit = parse_limit(request.args.get('limit'), default=30)
+            gallery = list_gallery(buckets, limit, request.args.get('cursor'), signed=True)
+        except ValueError as e:
+            return jsonify({"message": str(e)}), 400
 
-        return jsonify({"admin_photos": admin_photo_list, "user_photos": user_photo_list}), 200
+        return jsonify(gallery), 200
 
     except Exception as e:
         return jsonify({"status": "Failed", "message": str(e)}), 500
@@ -88,10 +71,10 @@ def delete_photos():
             return jsonify({"message": "No photo IDs provided"}), 400
 
         for photo_id in photo_ids:
-            if fs_admin.exists({"_id": ObjectId(photo_id)}):
-                fs_admin.delete(ObjectId(photo_id))
-            elif fs_user.exists({"_id": ObjectId(photo_id)}):
-                fs_user.delete(ObjectId(photo_id))
+            if get_storage('admin').exists(ObjectId(photo_id)):
+                delete_image('admin', photo_id)
+            elif get_storage('user').exists(ObjectId(photo_id)):
+                delete_image('user', photo_id)
             else:
                 return jsonify({"message": f"Photo with ID {photo_id} does not exist"}), 404
 
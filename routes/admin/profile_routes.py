@@ -1,12 +1,14 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from database import profiles
+from response_cache import cached_response, invalidates
 import datetime
 
 profile_bp = Blueprint('profile_bp', __name__)
 
 @profile_bp.route('/api/admin/create_or_update/profile', methods=['POST'])
 @jwt_required()
+@invalidates('profile')
 def admin_create_or_update_profile():
     try:
         data = request.json
@@ -26,6 +28,7 @@ def admin_create_or_update_profile():
         return jsonify({"status": "Failed to create or update profile", "error": str(e)}), 500
 
 @profile_bp.route('/api/admin/get/profile', methods=['GET'])
+@cached_response('profile')
 def get_profile():
     try:
         profile = profiles.find_one({}, {"_id": 0})
@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
 from database import schedules
 from bson import ObjectId
+from response_cache import cached_response, invalidates
+from conditional import changes
 from .admin_routes import admin_required
 
 admin_schedule_bp = Blueprint('schedule_bp', __name__)
@@ -16,6 +18,8 @@ def get_seasons():
 
 @admin_schedule_bp.route('/api/admin/create_update/schedule', methods=['POST'])
 @admin_required
+@invalidates('schedules')
+@changes('admin_schedules')
 def create_or_update_schedule():
     try:
         data = request.json
@@ -49,6 +53,7 @@ def create_or_update_schedule():
 
 
 @admin_schedule_bp.route('/api/admin/get/schedule', methods=['GET'])
+@cached_response('schedules')
 def get_schedules():
     try:
         season = request.args.get("season")
@@ -61,6 +66,8 @@ def get_schedules():
 
 @admin_schedule_bp.route('/api/admin/delete/schedule', methods=['DELETE'])
 @admin_required
+@invalidates('schedules')
+@changes('admin_schedules')
 def delete_schedule():
     try:
         data = request.json
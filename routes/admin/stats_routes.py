@@ -1,12 +1,14 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from database import admin_stats
+from response_cache import cached_response, invalidates
 from .admin_routes import admin_required
 
 admin_stats_bp = Blueprint('admin_stats_bp', __name__)
 
 @admin_stats_bp.route('/api/admin/create_update_stats', methods=['POST'])
 @admin_required
+@invalidates('stats')
 def create_update_stats():
     try:
         data = request.json
@@ -51,6 +53,7 @@ def create_update_stats():
         return jsonify({"status": "Failed to create or update stats", "error": str(e)}), 500
 
 @admin_stats_bp.route('/api/admin/get/stats', methods=['GET'])
+@cached_response('stats')
 def get_stats():
     try:
         stats = list(admin_stats.find({}).sort([("season", -1)]))
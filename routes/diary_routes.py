@@ -1,13 +1,14 @@
-from flask import Blueprint, request, jsonify, session, Flask, current_app
-from database import fs_diary, diaries
+from flask import Blueprint, request, jsonify, Flask, current_app
+from database import diaries
 from bson import ObjectId
-from gridfs import GridFS, errors as gridfs_errors
+from gridfs import errors as gridfs_errors
 from datetime import datetime
 from flask_cors import CORS
 import base64
-from gridfs.errors import NoFile, GridFSError  # Add GridFSError import
 from flask_jwt_extended import jwt_required, get_jwt_identity  # Add this import
-import boto3
+from media import store_image, delete_image, release_images, fetch_files, media_ref
+from media.storage import s3_client
+from pagination import wants_cursor, cursor_page
 
 # Blueprint 설정
 diary_bp = Blueprint('diary_bp', __name__)
@@ -42,15 +43,34 @@ def post_diary():
         if not ticket_photo or not view_photo:
             return jsonify({"error": "Ticket photo and view photo are required"}), 400
 
+        # 사진을 저장하기 전에 입력 검증 (저장 뒤에 실패하면 참조 수만 남음)
+        try:
+            diary_date = datetime.strptime(date, '%Y-%m-%d')
+        except ValueError:
+            return jsonify({"error": "date must be YYYY-MM-DD"}), 400
+
         # GridFS에 이미지 저장
         photo_ids = {}
+        photo_info = {}
+        photos = {
+            'ticket_photo': (ticket_photo, f"{name}_ticket_{date}.jpg"),
+            'view_photo': (view_photo, f"{name}_view_{date}.jpg"),
+            'additional_photo': (additional_photo, f"{name}_additional_{date}.jpg")
+        }
         try:
-            photo_ids['ticket_photo'] = fs_diary.put(ticket_photo, filename=f"{name}_ticket_{date}.jpg")
-            photo_ids['view_photo'] = fs_diary.put(view_photo, filename=f"{name}_view_{date}.jpg")
-            if additional_photo:
-                photo_ids['additional_photo'] = fs_diary.put(additional_photo, filename=f"{name}_additional_{date}.jpg")
+            for photo_type, (photo, filename) in photos.items():
+                if not photo:
+                    continue
+                stored = store_image('diary', photo, filename=filename)
+                photo_ids[photo_type] = stored['_id']
+                # 목록 조회 시 GridFS 를 다시 읽지 않도록 크기도 같이 저장
+                photo_info[photo_type] = {"width": stored['width'], "height": stored['height']}
         except gridfs_errors.GridFSError as e:
+            release_images('diary', photo_ids.values())
             return jsonify({"error": "Failed to save photos"}), 500
+        except Exception:
+            release_images('diary', photo_ids.values())
+            raise
 
         # location에 따른 홈경기 여부 자동 설정
         is_home_game = location in HOME_LOCATIONS
@@ -61,13 +81,14 @@ def post_diary():
         # diaries 컬렉션에 저장할 데이터
         diary_entry = {
             "name": name,
-            "date": datetime.strptime(date, '%Y-%m-%d'),
+            "date": diary_date,
             "weather": weather,
             "location": location,
             "together": together,
             "win_status": win_status,
             "is_home_game": is_home_game,
             "diary_photos": photo_ids,
+            "diary_photo_info": photo_info,
             "diary_message": message,
             "saved_at": saved_at,
             "seat_info": {
@@ -77,8 +98,12 @@ def post_diary():
             }
         }
 
-        # MongoDB에 다이어리 데이터 저장
-        result = diaries.insert_one(diary_entry)
+        # MongoDB에 다이어리 데이터 저장 (실패하면 방금 올린 사진의 참조를 되돌림)
+        try:
+            result = diaries.insert_one(diary_entry)
+        except Exception:
+            release_images('diary', photo_ids.values())
+            raise
         return jsonify({"message": "Diary entry created successfully", "id": str(result.inserted_id)})
 
     except Exception as e:
@@ -86,6 +111,31 @@ def post_diary():
 
 
 
+def inline_diary_photos(diary_list):
+    """이전 응답 형식: diary_photos 를 원본 이미지 base64 로 교체 (?inline=1)
+
+    페이지에 있는 모든 다이어리의 사진을 한 번에 병렬로 가져오고, 가져오지 못한 사진 id 목록을 반환함.
+    """
+    slots = [
+        (diary, photo_type, photo_id)
+        for diary in diary_list if diary.get('diary_photos')
+        for photo_type, photo_id in diary['diary_photos'].items()
+    ]
+    photo_files, missing = fetch_files('diary', [photo_id for _, _, photo_id in slots])
+    for (diary, photo_type, _), photo_file in zip(slots, photo_files):
+        diary['diary_photos'][photo_type] = base64.b64encode(photo_file.read()).decode('utf-8') if photo_file else None
+    return missing
+
+
+def diary_photo_refs(diary):
+    """diary_photos 를 id/url/크기 참조로 교체 (GridFS 조회 없음)"""
+    photo_info = diary.get('diary_photo_info', {})
+    diary['diary_photos'] = {
+        photo_type: media_ref('diary', photo_id, photo_info.get(photo_type))
+        for photo_type, photo_id in diary['diary_photos'].items()
+    }
+
+
 @diary_bp.route('/api/get_diary_personal', methods=['GET'])
 def get_diary_personal():
     try:
@@ -93,27 +143,37 @@ def get_diary_personal():
         page_size = int(request.args.get('page_size', 10))
         skip = (page - 1) * page_size
         user = request.args.get('user', None)
+        inline = request.args.get('inline') == '1'
 
         if not user:
             return jsonify({"error": "User parameter is required"}), 400
 
-        # saved_at 기준으로 정렬 변경 (-1은 내림차순, 즉 최신순)
-        user_diaries = list(diaries.find({"name": user}).sort('saved_at', -1).skip(skip).limit(page_size))
+        # cursor/before/limit 가 있으면 saved_at/_id 커서로 페이지를 넘김 (skip 없이 같은 비용)
+        page_info = None
+        if wants_cursor(request.args):
+            try:
+                user_diaries, page_info = cursor_page(diaries, {"name": user}, 'saved_at', -1, request.args)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+        else:
+            # saved_at 기준으로 정렬 변경 (-1은 내림차순, 즉 최신순)
+            user_diaries = list(diaries.find({"name": user}).sort('saved_at', -1).skip(skip).limit(page_size))
+
+        # 기본은 이미지 참조만 반환하고, inline=1 이면 원본 Base64 포함
+        if inline:
+            missing = inline_diary_photos(user_diaries)
+            if missing:
+                print(f"Error retrieving diary photos: {missing}")
 
         # ObjectId를 문자열로 변환 (JSON 직렬화 가능하게) 및 이미지 처리
         for diary in user_diaries:
             diary['_id'] = str(diary['_id'])
+            if diary.get('diary_photos') and not inline:
+                diary_photo_refs(diary)
+            diary.pop('diary_photo_info', None)
 
-            # GridFS에서 이미지를 가져와서 Base64로 변환
-            if diary.get('diary_photos'):
-                for photo_type, photo_id in diary['diary_photos'].items():
-                    try:
-                        photo_file = fs_diary.get(ObjectId(photo_id))
-                        diary['diary_photos'][photo_type] = base64.b64encode(photo_file.read()).decode('utf-8')
-                    except (NoFile, GridFSError) as e:
-                        print(f"Error retrieving {photo_type} {photo_id}: {str(e)}")
-                        diary['diary_photos'][photo_type] = None
-
+        if page_info is not None:
+            return jsonify({"entries": user_diaries, **page_info}), 200
         return jsonify(user_diaries), 200
 
     except Exception as e:
@@ -128,23 +188,32 @@ def get_diary_entries():
         page = int(request.args.get('page', 1))
         page_size = int(request.args.get('page_size', 10))
         skip = (page - 1) * page_size
+        inline = request.args.get('inline') == '1'
+
+        # cursor/before/limit 가 있으면 saved_at/_id 커서로 페이지를 넘김 (skip 없이 같은 비용)
+        page_info = None
+        if wants_cursor(request.args):
+            try:
+                all_diaries, page_info = cursor_page(diaries, {}, 'saved_at', -1, request.args)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+        else:
+            # saved_at 기준으로 정렬 변경
+            all_diaries = list(diaries.find().sort('saved_at', -1).skip(skip).limit(page_size))
 
-        # saved_at 기준으로 정렬 변경
-        all_diaries = list(diaries.find().sort('saved_at', -1).skip(skip).limit(page_size))
+        # inline=1 이면 원본 Base64 포함
+        if inline:
+            missing = inline_diary_photos(all_diaries)
+            if missing:
+                print(f"Error retrieving diary photos: {missing}")
 
         for diary in all_diaries:
             diary['_id'] = str(diary['_id'])
 
-            # diary_photos가 존재할 때만 GridFS에서 이미지 가져오기
-            if 'diary_photos' in diary:
-                for photo_type, photo_id in diary['diary_photos'].items():
-                    try:
-                        file = fs_diary.get(ObjectId(photo_id))
-                        base64_data = base64.b64encode(file.read()).decode('utf-8')
-                        diary['diary_photos'][photo_type] = base64_data
-                    except (NoFile, GridFSError) as e:
-                        print(f"Error retrieving {photo_type} {photo_id}: {str(e)}")
-                        diary['diary_photos'][photo_type] = None
+            # diary_photos가 존재할 때만 이미지 참조로 변환
+            if 'diary_photos' in diary and not inline:
+                diary_photo_refs(diary)
+            diary.pop('diary_photo_info', None)
 
             # datetime 객체를 문자열로 변환
             if 'date' in diary:
@@ -152,6 +221,8 @@ def get_diary_entries():
             if 'saved_at' in diary:
                 diary['saved_at'] = diary['saved_at'].isoformat()
 
+        if page_info is not None:
+            return jsonify({"entries": all_diaries, **page_info}), 200
         return jsonify(all_diaries), 200
 
     except Exception as e:
@@ -279,7 +350,7 @@ def delete_diary():
         if diary_entry.get('diary_photos'):
             for photo_type, photo_id in diary_entry['diary_photos'].items():
                 try:
-                    fs_diary.delete(ObjectId(photo_id))
+                    delete_image('diary', photo_id)
                 except gridfs_errors.NoFile:
                     pass  # If the file is not found, ignore the error
 
@@ -293,15 +364,10 @@ def delete_diary():
 def test_s3_connection():
     try:
         # S3 클라이언트 생성
-        s3_client = boto3.client(
-            's3',
-            aws_access_key_id=current_app.config['AWS_ACCESS_KEY_ID'],
-            aws_secret_access_key=current_app.config['AWS_SECRET_ACCESS_KEY'],
-            region_name=current_app.config['AWS_S3_REGION']
-        )
+        client = s3_client()
         
         # 버킷 리스트 가져오기 시도
-        response = s3_client.list_buckets()
+        response = client.list_buckets()
         
         # 설정된 버킷이 존재하는지 확인
         buckets = [bucket['Name'] for bucket in response['Buckets']]
@@ -1,12 +1,14 @@
 from flask import Blueprint, request, jsonify
-from database import events, fs_event
+from database import events
 from bson import ObjectId
 import base64
-import gridfs.errors
+from media import media_url, fetch_files
+from response_cache import cached_response
 
 event_bp = Blueprint('event', __name__)
 
 @event_bp.route('/api/get/event-list', methods=['GET'])
+@cached_response('events')
 def get_event_list():
     try:
         # date 필드를 기준으로 최신순으로 정렬 (-1)
@@ -54,19 +56,26 @@ def get_event_photos(event_id):
             start = (page - 1) * page_size
             end = start + page_size
 
-            photos = []
-            for photo_id in photo_ids[start:end]:
-                try:
-                    photo_file = fs_event.get(ObjectId(photo_id))
+            page_ids = photo_ids[start:end]
+            # 기본은 주소만 반환 (photos: medium, photo_urls: 원본). inline=1 이면 photos 에 Base64 data URI
+            photos = [media_url('event', photo_id, 'medium') for photo_id in page_ids]
+            photo_urls = [media_url('event', photo_id) for photo_id in page_ids]
+            if request.args.get('inline') == '1':
+                photo_files, _ = fetch_files('event', page_ids, 'medium')
+                photos = []
+                photo_urls = []
+                for photo_id, photo_file in zip(page_ids, photo_files):
+                    if photo_file is None:
+                        continue
                     photo_data = base64.b64encode(photo_file.read()).decode('utf-8')
                     photos.append(f"data:{photo_file.content_type};base64,{photo_data}")
-                except gridfs.errors.NoFile:
-                    continue
+                    photo_urls.append(media_url('event', photo_id))
 
             total_pages = (total_photos + page_size - 1) // page_size
 
             return jsonify({
                 "photos": photos,
+                "photo_urls": photo_urls,
                 "total_photos": total_photos,
                 "total_pages": total_pages,
                 "page": page,
@@ -75,6 +84,7 @@ def get_event_photos(event_id):
         else:
             return jsonify({
                 "photos": [],
+                "photo_urls": [],
                 "total_photos": 0,
                 "total_pages": 0,
                 "page": 1,
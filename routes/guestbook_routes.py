@@ -1,8 +1,12 @@
-from flask import Blueprint, request, jsonify, make_response
+from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from database import guestbooks, fs_guestbooks
+from database import guestbooks
 from bson import ObjectId
 import base64
+from media import save_image, delete_image, release_images, fetch_files
+from pagination import wants_cursor, cursor_page, cached_count
+from singleflight import single_flight
+from conditional import conditional, changes
 
 guestbook_bp = Blueprint('guestbook', __name__)
 
@@ -24,25 +28,36 @@ def post_guestbook():
 
         photo = request.files.get('photo')
         if photo:
-            photo_id = fs_guestbooks.put(photo, filename=f"{name}_photo.jpg")
+            photo_id = save_image('guestbook', photo, filename=f"{name}_photo.jpg")
             guestbook_entry["photo_id"] = str(photo_id)
 
-        guestbooks.insert_one(guestbook_entry)
+        try:
+            guestbooks.insert_one(guestbook_entry)
+        except Exception:
+            # 글이 저장되지 않았으면 방금 올린 사진의 참조를 되돌림
+            if photo:
+                release_images('guestbook', [guestbook_entry["photo_id"]])
+            raise
         return jsonify({"status": "Guestbook entry added"}), 200
     except Exception as e:
         return jsonify({"message": str(e)}), 500
 
 @guestbook_bp.route('/api/get_guestbook_entries', methods=['GET'])
+@conditional('guestbooks', 'date')
+@single_flight()
 def get_guestbook_entries():
     try:
-        entries = guestbooks.find().sort('date', -1)
+        entries = list(guestbooks.find().sort('date', -1))
+        # 썸네일을 한 번에 병렬로 가져옴 (없는 파일은 사진 없는 글로 분류)
+        photos, _ = fetch_files('guestbook', [entry['photo_id'] for entry in entries if entry.get('photo_id')], 'thumb')
+        photos = iter(photos)
         photo_entries = []
         no_photo_entries = []
 
         for entry in entries:
             entry['_id'] = str(entry['_id'])
-            if entry.get('photo_id'):
-                photo = fs_guestbooks.get(ObjectId(entry['photo_id']))
+            photo = next(photos) if entry.get('photo_id') else None
+            if photo is not None:
                 photo_data = base64.b64encode(photo.read()).decode('utf-8')
                 entry['photo_data'] = photo_data
                 photo_entries.append(entry)
@@ -55,6 +70,7 @@ def get_guestbook_entries():
 
 @guestbook_bp.route('/api/delete/guestbook', methods=['DELETE'])
 @jwt_required()
+@changes('guestbooks')
 def delete_guestbook():
     try:
         nickname = get_jwt_identity()
@@ -69,7 +85,7 @@ def delete_guestbook():
             return jsonify({"message": "Guestbook entry not found or you do not have permission to delete this entry"}), 404
 
         if "photo_id" in guestbook_entry:
-            fs_guestbooks.delete(ObjectId(guestbook_entry["photo_id"]))
+            delete_image('guestbook', guestbook_entry["photo_id"])
 
         guestbooks.delete_one({"_id": ObjectId(entry_id)})
 
@@ -89,22 +105,37 @@ def get_user_guestbook_entries():
         if user:
             query['name'] = user
 
-        entries = guestbooks.find(query).sort('date', -1).skip(skip).limit(page_size)
+        # cursor/before/limit 가 있으면 date/_id 커서로 페이지를 넘김 (skip 없이 같은 비용)
+        page_info = None
+        if wants_cursor(request.args):
+            try:
+                entries, page_info = cursor_page(guestbooks, query, 'date', -1, request.args)
+            except ValueError as e:
+                return jsonify({"message": str(e)}), 400
+        else:
+            entries = list(guestbooks.find(query).sort('date', -1).skip(skip).limit(page_size))
+        # 썸네일을 한 번에 병렬로 가져옴 (없는 파일은 photo_data 없이 반환)
+        photos, _ = fetch_files('guestbook', [entry['photo_id'] for entry in entries if entry.get('photo_id')], 'thumb')
+        photos = iter(photos)
         entry_list = []
         for entry in entries:
             entry['_id'] = str(entry['_id'])
-            if entry.get('photo_id'):
-                photo = fs_guestbooks.get(ObjectId(entry['photo_id']))
+            photo = next(photos) if entry.get('photo_id') else None
+            if photo is not None:
                 photo_data = base64.b64encode(photo.read()).decode('utf-8')
                 entry['photo_data'] = photo_data
             entry_list.append(entry)
 
-        total_entries = guestbooks.count_documents(query)
+        if page_info is not None:
+            return jsonify({"entries": entry_list, **page_info}), 200
+        # 전체 수는 잠시 캐시해서 페이지마다 다시 세지 않음
+        total_entries = cached_count(guestbooks, query)
         return jsonify({"entries": entry_list, "total_entries": total_entries}), 200
     except Exception as e:
         return jsonify({"message": str(e)}), 500
 
 @guestbook_bp.route('/api/update_guestbook_entry', methods=['PUT'])
+@changes('guestbooks')
 def update_guestbook_entry():
     try:
         entry_id = request.form.get('id')
@@ -128,19 +159,27 @@ def update_guestbook_entry():
             if old_entry is None:
                 return jsonify({"message": "Entry not found"}), 404
 
-            # 기존 photo_id가 있으면 삭제 후 새로 업로드
-            if old_entry.get('photo_id'):
-                fs_guestbooks.delete(ObjectId(old_entry['photo_id']))
-            photo_id = fs_guestbooks.put(photo, filename=f"{old_entry['name']}_photo.jpg")
+            # 새 사진을 먼저 저장하고, 글 수정이 끝난 뒤 기존 사진 참조를 지움
+            # (같은 사진을 다시 올리면 저장된 파일을 그대로 재사용)
+            photo_id = save_image('guestbook', photo, filename=f"{old_entry['name']}_photo.jpg")
             updated_entry['photo_id'] = str(photo_id)
 
-        result = guestbooks.update_one(
-            {"_id": ObjectId(entry_id)},
-            {"$set": updated_entry}
-        )
+        try:
+            result = guestbooks.update_one(
+                {"_id": ObjectId(entry_id)},
+                {"$set": updated_entry}
+            )
+        except Exception:
+            if photo:
+                release_images('guestbook', [updated_entry['photo_id']])
+            raise
 
         if result.matched_count == 0:
+            if photo:
+                release_images('guestbook', [updated_entry['photo_id']])
             return jsonify({"message": "Entry not found"}), 404
+        if photo and old_entry.get('photo_id'):
+            delete_image('guestbook', old_entry['photo_id'])
 
         return jsonify({"message": "Entry updated successfully"}), 200
     except Exception as e:
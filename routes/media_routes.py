@@ -0,0 +1,67 @@
+from flask import Blueprint, request, jsonify, redirect
+from bson import ObjectId
+from bson.errors import InvalidId
+from werkzeug.exceptions import HTTPException
+import gridfs.errors
+from media import send_media, open_variant, locate_file, verify_media, media_cache, storages
+from media.streaming import CACHE_MAX_AGE
+from config import Config
+from .admin.admin_routes import admin_required
+
+media_bp = Blueprint('media_bp', __name__)
+
+@media_bp.route('/api/media/<bucket>/<file_id>', methods=['GET'])
+def get_media(bucket, file_id):
+    """모든 미디어 버킷의 이미지를 스트리밍 (Range, ETag, 304 지원)"""
+    storage = storages.get(bucket)
+    if storage is None:
+        return jsonify({"message": f"Unknown bucket: {bucket}"}), 404
+
+    # ?variant=thumb|medium|full 로 업로드 시 만들어 둔 파생 이미지 요청
+    variant = request.args.get('variant')
+    try:
+        file_id = ObjectId(file_id)
+    except InvalidId:
+        return jsonify({"message": "Photo not found"}), 404
+
+    # 서명된 URL(?exp=&sig=)은 DB 조회 없이 먼저 검증하고, 만료 시각까지만 캐시하게 함
+    # (위조된 요청은 참조 테이블/파일을 조회하기 전에 거절)
+    max_age = CACHE_MAX_AGE
+    signature = request.args.get('sig')
+    if signature or bucket in Config.MEDIA_SIGNED_BUCKETS:
+        remaining = verify_media(bucket, file_id, variant, request.args.get('exp'), signature)
+        if remaining is None:
+            return jsonify({"message": "Invalid or expired media signature"}), 403
+        max_age = remaining
+
+    # 다른 버킷과 공유하는 이미지는 실제로 저장된 버킷(owner)에서 읽음
+    owner, target_id = locate_file(bucket, file_id, variant)
+    # 서명 버킷에 저장된 이미지는 다른 버킷 주소로 받을 수 없음 (서명 없는 버킷 주소로 우회 방지)
+    if owner != bucket and owner in Config.MEDIA_SIGNED_BUCKETS:
+        return jsonify({"message": "Photo not found"}), 404
+
+    # S3 처럼 직접 내려받을 수 있는 저장소는 presigned URL 로 보냄
+    url = storages[owner].url(target_id)
+    if url:
+        return redirect(url)
+
+    try:
+        grid_out = open_variant(bucket, file_id, variant)
+    except gridfs.errors.NoFile:
+        return jsonify({"message": "Photo not found"}), 404
+
+    try:
+        return send_media(grid_out, max_age)
+    except HTTPException:
+        # 416 Range Not Satisfiable 등은 그대로 전달
+        grid_out.close()
+        raise
+    except Exception as e:
+        grid_out.close()
+        return jsonify({"status": "Failed", "message": str(e)}), 500
+
+@media_bp.route('/api/admin/media/cache-stats', methods=['GET'])
+@admin_required
+def get_media_cache_stats():
+    """미디어 캐시 적중/미스/제거 카운터 (현재 워커 기준)"""
+    return jsonify(media_cache.stats()), 200
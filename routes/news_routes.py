@@ -1,9 +1,16 @@
 from flask import Blueprint, jsonify, current_app
 from datetime import datetime, timedelta
+from crawler.dedup import cluster_links
+from crawler.engine import http_client
+from response_cache import cached_response
+from singleflight import single_flight
+from .admin.admin_routes import admin_required
 
 news_bp = Blueprint('news_bp', __name__)
 
 @news_bp.route('/api/latest', methods=['GET'])
+@cached_response('news')
+@single_flight()
 def get_latest_news():
     db = current_app.config['db']
     news_rookie = db['news_rookie']
@@ -37,9 +44,16 @@ def get_latest_news():
             'link': main_article['link'],
             'summary': main_article['summary'],
             'image_url': main_article['image_url'],
-            'created_at': main_article['created_at']  # 이 시간은 기사 작성 시간이어야 함
+            'created_at': main_article['created_at'],  # 이 시간은 기사 작성 시간이어야 함
+            # 다른 사이트에 올라온 같은 기사 링크 (crawler/dedup.py)
+            'duplicates': cluster_links(db, main_article)
         }
     }
 
     return jsonify(data)
 
+@news_bp.route('/api/admin/crawler/stats', methods=['GET'])
+@admin_required
+def get_crawler_stats():
+    """크롤러 HTTP 요청 수/304/재시도/응답 바이트/소요 시간 (현재 워커 기준, 호스트별)"""
+    return jsonify(http_client.stats()), 200
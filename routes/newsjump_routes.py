@@ -1,46 +1,31 @@
 from flask import Blueprint, request, jsonify, current_app
-import requests
-import re
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
-import time
+from config import Config
+from crawler.engine import crawl_engine
+from crawler.scheduler import crawl_due, trigger_crawl
+from crawler.sites import JUMPBALL_LISTING, JUMPBALL_ARTICLE, background_image, parse_jumpball_date, SITE_TIMEZONE
+from crawler.sources import crawl_source, match_keywords
+from crawler.dedup import collapse_filter, signature_fields, cluster_articles, SIGNATURE_PROJECTION
+from crawler.store import keyword_filter
+from response_cache import invalidates
+from conditional import conditional, changes, bump_version
 
 newsjumpball_bp = Blueprint('newsjumpball_bp', __name__)
 
-def parse_date(date_string):
-    try:
-        pattern = r"(\d{4}-\d{2}-\d{2}\s*\d{2}:\d{2}:\d{2})"
-        match = re.search(pattern, date_string)
-        if match:
-            return datetime.strptime(match.group(1), "%Y-%m-%d %H:%M:%S")
-        else:
-            return None
-    except ValueError:
-        return None
-
-def get_total_pages(soup):
-    pagination = soup.select('.pagination a')
-    if pagination:
-        last_page = pagination[-1].get('href')
-        total_pages = re.search(r'pagenum=(\d+)', last_page).group(1)
-        return int(total_pages)
-    return 1
-
-def should_crawl(db):
-    last_crawl = db['crawl_info'].find_one({'name': 'jumpball_last_crawl'})
-    if not last_crawl:
-        return True
-    last_crawl_date = last_crawl['date']
-    return datetime.now() - last_crawl_date > timedelta(days=1)
-
 @newsjumpball_bp.route('/api/jumpball/search/', strict_slashes=False)
+@conditional('news_jumpball', 'created_at', tz=SITE_TIMEZONE)
 def search_jumpball():
     try:
         db = current_app.config['db']
         news_jumpball = db['news_jumpball']
         
-        # 모든 기사를 최신순으로 가져오기
-        articles = list(news_jumpball.find().sort('created_at', -1))
+        # 모든 기사를 최신순으로 가져오기 (?keyword= 가 있으면 해당 키워드 태그 기사만)
+        keyword = request.args.get('keyword')
+        query = keyword_filter(keyword) if keyword else {}
+        # ?collapse=true 면 다른 사이트와 같은 기사는 묶음 대표만 (crawler/dedup.py)
+        if request.args.get('collapse', 'false').lower() == 'true':
+            query = {'$and': [query, collapse_filter()]}
+        articles = list(news_jumpball.find(query, SIGNATURE_PROJECTION).sort('created_at', -1))
         
         # ObjectId를 문자열로 변환
         for article in articles:
@@ -55,182 +40,60 @@ def search_jumpball():
         print(f"에러 발생: {str(e)}")
         return jsonify({'error': 'Database error'}), 500
 
-def get_latest_article_date(db):
-    """DB에서 가장 최신 기사의 날짜를 가져옴"""
-    latest_article = db['news_jumpball'].find_one(
-        {},  # 모든 문서 대상
-        sort=[('created_at', -1)]  # created_at 기준 내림차순
-    )
-    if latest_article:
-        print(f"Latest article in DB: {latest_article['title']} ({latest_article['created_at']})")
-        return latest_article['created_at']
-    return None
-
 def crawl_data(query, db):
+    """query 로 점프볼 검색 결과를 크롤링해서 기준 날짜 이후 새 기사 저장 (여러 키워드는 crawl_source)"""
     print(f"\n=== 크롤링 시작 ===")
-    
-    news_jumpball = db['news_jumpball']
-    new_articles = []
-    
-    # 11월 12일 이후 기사만 가져오기 위한 기준 날짜
-    cutoff_date = datetime(2024, 11, 12)
-    
-    articles = crawl_jumpball(query, None, db)
-    
-    for article in articles:
-        # 11월 12일 이후이고, 제목에 "이소희"가 있는 기사만 처리
-        if article['created_at'] > cutoff_date and query in article['title']:
-            # 중복 체크
-            if not news_jumpball.find_one({'link': article['link']}):
-                new_articles.append(article)
-                print(f"새 기사 발견: {article['title']} ({article['created_at']})")
-    
+    new_articles = crawl_source('jumpball', db, keywords=[query])
+
     if new_articles:
-        try:
-            news_jumpball.insert_many(new_articles)
-            print(f"\n총 {len(new_articles)}개의 새로운 기사 저장됨")
-            for article in new_articles:
-                print(f"- {article['title']}")
-        except Exception as e:
-            print(f"저장 중 에러 발생: {str(e)}")
+        print(f"\n총 {len(new_articles)}개의 새로운 기사 저장됨")
+        for article in new_articles:
+            print(f"- {article['title']} ({article['created_at']})")
     else:
         print("\n새로운 기사가 없습니다.")
     
     return new_articles
 
-def crawl_jumpball(query, year, db):
-    base_url = 'https://jumpball.co.kr/news/search.php'
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
-    params = {
-        'q': query,
-        'sfld': 'subj',
-        'x': '0',
-        'y': '0'
-    }
+def parse_article_date(content):
+    """상세 페이지에서 정확한 작성 시간 추출 ("입력 : 2024-12-05 16:22:51")"""
+    article = JUMPBALL_ARTICLE.extract_one(JUMPBALL_ARTICLE.parse(content))
+    if not article or not article['date_text']:
+        return None
+    return parse_jumpball_date(article['date_text'])
 
-    try:
-        print(f"\n=== 검색 URL: {base_url}?q={query} ===")
-        response = requests.get(base_url, headers=headers, params=params, timeout=10)
+def find_in_search(url, **params):
+    """추적 중인 키워드로 점프볼을 검색해서 url 기사의 목록 항목과 검색 키워드 반환 (없으면 (None, None))"""
+    for keyword in Config.CRAWL_KEYWORDS:
+        response = crawl_engine.fetch('https://jumpball.co.kr/news/search.php', params={'q': keyword, **params})
         if response.status_code != 200:
-            print(f"Failed to retrieve data: {response.status_code}")
-            return []
-
-        soup = BeautifulSoup(response.content, 'html.parser')
-        articles = []
-        
-        for item in soup.select('.listPhoto'):
-            try:
-                # 제목과 링크 추출
-                title_tag = item.select_one('dt a')
-                if not title_tag:
-                    continue
-                    
-                title = title_tag.text.strip()
-                if query not in title:
-                    continue
-                    
-                link = 'https://jumpball.co.kr' + title_tag['href']
-                
-                # 상세 페이지에서 정확한 작성 시간 가져오기
-                article_response = requests.get(link, headers=headers, timeout=10)
-                article_soup = BeautifulSoup(article_response.content, 'html.parser')
-                date_tag = article_soup.select_one('#main > div.viewTitle > dl > dd')
-                
-                if date_tag:
-                    date_text = date_tag.text.strip()
-                    # "입력 : 2024-12-05 16:22:51" 형식에서 날짜와 ��� 추출
-                    date_match = re.search(r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})', date_text)
-                    if date_match:
-                        created_at = datetime.strptime(date_match.group(1), '%Y-%m-%d %H:%M:%S')
-                    else:
-                        continue
-                else:
-                    continue
-                
-                # 이미지 URL 추출
-                img_div = item.select_one('.img a')
-                image_url = None
-                if img_div and 'style' in img_div.attrs:
-                    style = img_div['style']
-                    if "url('" in style:
-                        image_url = style.split("url('")[1].split("')")[0]
-                
-                # 요약 추출
-                summary_tag = item.select_one('.conts')
-                summary = summary_tag.text.strip() if summary_tag else ""
-
-                article = {
-                    'title': title,
-                    'link': link,
-                    'summary': summary,
-                    'image_url': image_url,
-                    'created_at': created_at
-                }
-                
-                articles.append(article)
-                print(f"Found article: {title} ({created_at})")
-                time.sleep(1)  # 서버 부하 방지
-                
-            except Exception as e:
-                print(f"Error extracting article: {str(e)}")
-                continue
-
-        return articles
-
-    except Exception as e:
-        print(f"Error in crawl_jumpball: {str(e)}")
-        return []
+            continue
+        for item in JUMPBALL_LISTING.extract(JUMPBALL_LISTING.parse(response.content)):
+            if item['href'] and 'https://jumpball.co.kr' + item['href'] == url:
+                return item, keyword
+    return None, None
 
 def crawl_specific_article(url):
     try:
-        # 1. 먼저 검색 페이지에서 해당 기사의 정보를 찾습니다
-        search_url = "https://jumpball.co.kr/news/search.php?q=이소희&sfld=all&period=MONTH|12"
-        search_response = requests.get(search_url, headers={'User-Agent': 'Mozilla/5.0'})
-        search_soup = BeautifulSoup(search_response.content, 'html.parser')
+        # 1. 먼저 추적 중인 키워드로 검색해서 해당 URL을 가진 기사 찾기
+        item, keyword = find_in_search(url, sfld='all', period='MONTH|12')
         
-        # 2. 검색 결과에서 해당 URL을 진 기사 찾기
-        article_items = search_soup.select('.listPhoto')
-        target_article = None
-        
-        for item in article_items:
-            link_tag = item.select_one('dt a')
-            if link_tag and link_tag.get('href'):
-                article_url = 'https://jumpball.co.kr' + link_tag['href']
-                if article_url == url:
-                    # 썸네일 이미지 찾기
-                    img_div = item.select_one('.img')
-                    if img_div and img_div.select_one('a'):
-                        style = img_div.select_one('a').get('style', '')
-                        image_url = style.split("url('")[-1].split("')")[0] if "url('" in style else None
-                    
-                    # 요약 텍스트 찾기
-                    summary = item.select_one('.txt')
-                    summary_text = summary.text.strip() if summary else ""
-                    
-                    target_article = {
-                        'image_url': image_url,
-                        'summary': summary_text
-                    }
-                    break
+        # 2. 썸네일 이미지와 요약 텍스트
+        target_article = {
+            'image_url': background_image(item['image_style']),
+            'summary': item['text'] or ""
+        } if item else None
         
         if not target_article:
             print("검색 결과에서 해당 기사를 찾을 수 없습니다.")
             return None
             
         # 3. 기사 상세 페이지 크롤링
-        response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'})
+        response = crawl_engine.fetch(url)
         if response.status_code == 200:
-            soup = BeautifulSoup(response.content, 'html.parser')
+            detail = JUMPBALL_ARTICLE.extract_one(JUMPBALL_ARTICLE.parse(response.content)) or {}
             
-            title_tag = soup.select_one('.viewTitle h3')
-            title = title_tag.text.strip() if title_tag else None
-            
-            date_tag = soup.select_one('.viewTitle > dl > dd')
-            date_text = date_tag.text.strip() if date_tag else None
-            created_at = parse_date(date_text)
+            title = detail.get('title')
+            created_at = parse_jumpball_date(detail.get('date_text') or "")
             
             if title and created_at:
                 article = {
@@ -239,7 +102,8 @@ def crawl_specific_article(url):
                     'summary': target_article['summary'],
                     'image_url': target_article['image_url'],
                     'created_at': created_at,
-                    'keyword_count': target_article['summary'].lower().count('이소희')
+                    'keyword_count': target_article['summary'].lower().count(keyword.lower()),
+                    'keywords': match_keywords(title, Config.CRAWL_KEYWORDS) or [keyword]
                 }
                 
                 print(f"\n크롤링 완료:")
@@ -253,6 +117,7 @@ def crawl_specific_article(url):
         return None
 
 @newsjumpball_bp.route('/api/jumpball/add-article/', methods=['POST'])
+@invalidates('news')
 def add_specific_article():
     url = request.json.get('url')
     if not url:
@@ -282,8 +147,11 @@ def add_specific_article():
                         'article': existing
                     })
                 
-                # 새 문서 저장
+                # 새 문서 저장 (크롤링과 같은 MinHash 서명을 붙이고 비슷한 기사의 묶음에 넣음)
+                article.update(signature_fields(article))
                 result = news_jumpball.insert_one(article)
+                if cluster_articles(db, [article]):
+                    bump_version('news_rookie', 'news_jumpball', database=db)
                 
                 # 저장 확인
                 saved = news_jumpball.find_one({'_id': result.inserted_id})
@@ -318,26 +186,20 @@ def add_specific_article():
 @newsjumpball_bp.route('/api/jumpball/crawl/', methods=['POST'])
 def start_crawl():
     try:
-        db = current_app.config['db']
-        query = "이소희"  # 기본 검색어
-        
-        if should_crawl(db):
-            crawl_data(query, db)
-            # 크롤링 완료 후 마지막 크롤링 시간 업데이트
-            db['crawl_info'].update_one(
-                {'name': 'jumpball_last_crawl'},
-                {'$set': {'date': datetime.now()}},
-                upsert=True
-            )
-            return jsonify({'message': 'Crawling completed successfully'})
+        if crawl_due('jumpball'):
+            # 크롤링은 스케줄러가 요청 밖에서 수행 (crawler/scheduler.py)
+            trigger_crawl('jumpball')
+            return jsonify({'message': 'Crawling requested'}), 202
         else:
-            return jsonify({'message': 'Crawling skipped - last crawl was within 30 days'})
+            return jsonify({'message': 'Crawling skipped - last crawl was within 1 day'})
 
     except Exception as e:
         print(f"Crawling error: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
 @newsjumpball_bp.route('/api/jumpball/delete-specific/', methods=['POST'])
+@invalidates('news')
+@changes('news_jumpball')
 def delete_specific_article():
     try:
         db = current_app.config['db']
@@ -370,83 +232,55 @@ def delete_specific_article():
         return jsonify({'error': str(e)}), 500
 
 @newsjumpball_bp.route('/api/jumpball/restore-specific/', methods=['POST'])
+@invalidates('news')
+@changes('news_jumpball')
 def restore_specific_article():
     try:
         db = current_app.config['db']
         news_jumpball = db['news_jumpball']
         
-        # 먼저 검색 페이지에서 기� 정보 가져오기
-        search_url = "https://jumpball.co.kr/news/search.php"
+        # 먼저 추적 중인 키워드로 검색 페이지에서 기사 정보 가져오기
         target_url = "https://jumpball.co.kr/news/newsview.php?ncode=1065539839641968"
-        
-        params = {
-            'q': '이소희',
-            'sfld': 'all',
-            'period': 'MONTH|12'
-        }
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        response = requests.get(search_url, headers=headers, params=params, timeout=10)
-        if response.status_code != 200:
-            return jsonify({'error': 'Failed to fetch search page'}), 500
+        item, keyword = find_in_search(target_url, sfld='all', period='MONTH|12')
+        if item:
+            link = target_url
+            title = item['title']
+            image_url = background_image(item['image_style'])
+            summary = item['summary'] or ""
             
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # 검색 결과에서 해당 기사 찾기
-        for item in soup.select('.listPhoto'):
-            link_tag = item.select_one('dt a')
-            if not link_tag:
-                continue
-                
-            link = 'https://jumpball.co.kr' + link_tag['href']
-            if link == target_url:
-                title = link_tag.text.strip()
-                
-                # 이미지 URL 추출
-                img_div = item.select_one('.img a')
-                image_url = None
-                if img_div and 'style' in img_div.attrs:
-                    style = img_div['style']
-                    if "url('" in style:
-                        image_url = style.split("url('")[1].split("')")[0]
-                
-                # 요약 추출
-                summary_tag = item.select_one('.conts')
-                summary = summary_tag.text.strip() if summary_tag else ""
-                
-                # 상세 페이지에서 정확한 작성 시간 가져오기
-                article_response = requests.get(link, headers=headers, timeout=10)
-                if article_response.status_code == 200:
-                    article_soup = BeautifulSoup(article_response.content, 'html.parser')
-                    date_tag = article_soup.select_one('#main > div.viewTitle > dl > dd')
-                    if date_tag:
-                        date_text = date_tag.text.strip()
-                        date_match = re.search(r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})', date_text)
-                        if date_match:
-                            created_at = datetime.strptime(date_match.group(1), '%Y-%m-%d %H:%M:%S')
-                
-                article = {
-                    'title': title,
-                    'link': link,
-                    'summary': summary,
-                    'image_url': image_url,
-                    'created_at': created_at
-                }
-                
-                # DB에 저장
-                result = news_jumpball.update_one(
-                    {'link': link},
-                    {'$set': article},
-                    upsert=True
-                )
-                
-                print(f"\n=== 기사 복구 완료 ===")
-                print(f"제목: {title}")
-                print(f"작성일시: {created_at}")
-                
-                return jsonify({'message': 'Article restored successfully'})
+            # 상세 페이지에서 정확한 작성 시간 가져오기
+            created_at = None
+            article_response = crawl_engine.fetch(link)
+            if article_response.status_code == 200:
+                created_at = parse_article_date(article_response.content)
+            
+            article = {
+                'title': title,
+                'link': link,
+                'summary': summary,
+                'image_url': image_url,
+                'keywords': match_keywords(title, Config.CRAWL_KEYWORDS) or [keyword]
+            }
+            # 작성 시간을 못 읽었으면 저장된 값을 지우지 않음
+            if created_at:
+                article['created_at'] = created_at
+            article.update(signature_fields(article))
+            
+            # DB에 저장
+            result = news_jumpball.update_one(
+                {'link': link},
+                {'$set': article},
+                upsert=True
+            )
+            # 묶음은 루키 기사에도 걸침 (news_jumpball 버전은 @changes 가 올림)
+            if cluster_articles(db, [news_jumpball.find_one({'link': link})]):
+                bump_version('news_rookie', database=db)
+            
+            print(f"\n=== 기사 복구 완료 ===")
+            print(f"제목: {title}")
+            print(f"작성일시: {created_at}")
+            
+            return jsonify({'message': 'Article restored successfully'})
         
         return jsonify({'error': 'Article not found in search results'}), 404
 
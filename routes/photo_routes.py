@@ -1,43 +1,28 @@
 from flask import Blueprint, request, jsonify
-from database import fs_admin, fs_user
-import base64
+from pagination import parse_limit
+from media import list_gallery, parse_buckets, inline_photo_list
+from singleflight import single_flight
 
 photo_bp = Blueprint('photo', __name__)
 
 @photo_bp.route('/api/get/photos', methods=['GET'])
+@single_flight()
 def get_photos_public():
     try:
         # token = request.headers.get('Authorization').split()[1]
 
-        admin_photos = fs_admin.find()
-        admin_photo_list = []
-        for photo in admin_photos:
-            image_data = fs_admin.get(photo._id).read()
-            base64_img = base64.b64encode(image_data).decode('utf-8')
-            data_url = f"data:image/jpeg;base64,{base64_img}"
-            admin_photo_list.append({
-                "_id": str(photo._id),
-                "filename": photo.filename,
-                "base64": data_url,
-                # "url": f"/api/admin/get/photo/{photo._id}?token={token}"
-                "url": f"/api/admin/get/photo/{photo._id}"
-            })
+        # 이전 클라이언트 호환용: 모든 사진을 base64 로 한 번에 반환
+        if request.args.get('inline') == '1':
+            return jsonify({"admin_photos": inline_photo_list('admin'), "user_photos": inline_photo_list('user')}), 200
 
-        user_photos = fs_user.find()
-        user_photo_list = []
-        for photo in user_photos:
-            image_data = fs_user.get(photo._id).read()
-            base64_img = base64.b64encode(image_data).decode('utf-8')
-            data_url = f"data:image/jpeg;base64,{base64_img}"
-            user_photo_list.append({
-                "_id": str(photo._id),
-                "filename": photo.filename,
-                "base64": data_url,
-                # "url": f"/api/admin/get/photo/{photo._id}?token={token}"
-                "url": f"/api/admin/get/photo/{photo._id}"
-            })
+        try:
+            buckets = parse_buckets(request.args.get('bucket'))
+            limit = parse_limit(request.args.get('limit'), default=30)
+            gallery = list_gallery(buckets, limit, request.args.get('cursor'))
+        except ValueError as e:
+            return jsonify({"message": str(e)}), 400
 
-        return jsonify({"admin_photos": admin_photo_list, "user_photos": user_photo_list}), 200
+        return jsonify(gallery), 200
 
     except Exception as e:
         return jsonify({"status": "Failed", "message": str(e)}), 500
\ No newline at end of file
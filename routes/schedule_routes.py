@@ -1,9 +1,13 @@
 from flask import Blueprint, jsonify
 from database import schedules
+from response_cache import cached_response
+from conditional import conditional
 
 schedule_bp = Blueprint('schedule', __name__)
 
 @schedule_bp.route('/api/get_schedules', methods=['GET'])
+@conditional('admin_schedules')
+@cached_response('schedules')
 def get_user_schedules():
     try:
         schedule_list = []
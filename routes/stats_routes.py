@@ -1,9 +1,11 @@
 from flask import Blueprint, request, jsonify
 from database import admin_stats
+from response_cache import cached_response
 
 stats_bp = Blueprint('stats_bp', __name__)
 
 @stats_bp.route('/api/admin/get/stats', methods=['GET'])
+@cached_response('stats')
 def get_stats():
     try:
         stats = list(admin_stats.find({}).sort([("season", -1)]))
@@ -1,12 +1,13 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from database import users, fs_user
+from database import users
 from bson import ObjectId
 from PIL import Image
 from io import BytesIO
 import base64
 import gridfs.errors
 import logging
+from media import save_image, delete_image, release_images, open_variant
 
 user_bp = Blueprint('user', __name__)
 logger = logging.getLogger(__name__)
@@ -37,34 +38,43 @@ def update_profile():
         if description:
             update_data["description"] = description
         if photo:
-            # 기존 사진 ID 가져오기
-            existing_photo_id = user.get("photo")
-            if existing_photo_id:
-                try:
-                    # 기존 사진 삭제
-                    photo_id_str = existing_photo_id.split('/')[-1]
-                    photo_id = ObjectId(photo_id_str)
-                    fs_user.delete(photo_id)
-                    logger.debug(f"Deleted existing photo with ID: {photo_id}")
-                except Exception as e:
-                    logger.error(f"Error deleting existing photo: {str(e)}")
-
-            # 새로운 사진 저장
-            photo_id = fs_user.put(photo, filename=f"{nickname}_profile_photo.jpg")
-            update_data["photo"] = f"/api/photo/{photo_id}"
+            # 새로운 사진을 먼저 저장 (같은 사진이면 기존 파일을 재사용)
+            new_photo_id = save_image('user', photo, filename=f"{nickname}_profile_photo.jpg")
+            update_data["photo"] = f"/api/photo/{new_photo_id}"
 
         logger.debug(f"Update query: {{'_id': user['_id']}}")
         logger.debug(f"Update data: {update_data}")
 
-        result = users.update_one({"_id": user['_id']}, {"$set": update_data})
+        try:
+            result = users.update_one({"_id": user['_id']}, {"$set": update_data})
+        except Exception:
+            # 프로필이 바뀌지 않았으면 방금 올린 사진의 참조를 되돌림
+            if photo:
+                release_images('user', [new_photo_id])
+            raise
         logger.debug(f"Update result: {result.raw_result}")
 
         # Check if the update was acknowledged and matched a document
         if result.matched_count == 0:
             logger.error("No document matched the query. Update failed.")
+            if photo:
+                release_images('user', [new_photo_id])
             return jsonify({"message": "Update failed"}), 500
 
-        if result.modified_count == 0:
+        # 프로필이 바뀐 뒤에 기존 사진 참조 삭제
+        existing_photo_id = user.get("photo")
+        if photo and existing_photo_id:
+            try:
+                photo_id_str = existing_photo_id.split('/')[-1]
+                photo_id = ObjectId(photo_id_str)
+                delete_image('user', photo_id)
+                logger.debug(f"Deleted existing photo with ID: {photo_id}")
+            except Exception as e:
+                logger.error(f"Error deleting existing photo: {str(e)}")
+
+        # 같은 사진을 다시 올리면 값이 그대로라 수정된 문서가 없을 수 있음
+        unchanged = all(user.get(key) == value for key, value in update_data.items())
+        if result.modified_count == 0 and not unchanged:
             logger.error("Document was not modified. Update might have failed.")
             return jsonify({"message": "Update might have failed"}), 500
 
@@ -93,14 +103,19 @@ def get_user_info():
             try:
                 photo_id_str = user["photo"].split('/')[-1]
                 photo_id = ObjectId(photo_id_str)
-                photo_file = fs_user.get(photo_id)
-
-                image = Image.open(photo_file)
-                if image.mode == 'RGBA':
-                    image = image.convert('RGB')
-                buffered = BytesIO()
-                image.save(buffered, format="JPEG", quality=50)
-                photo_data = base64.b64encode(buffered.getvalue()).decode('utf-8')
+                photo_file = open_variant('user', photo_id, 'thumb')
+
+                if (photo_file.metadata or {}).get('variant'):
+                    # 업로드 시 만들어 둔 썸네일을 그대로 사용
+                    photo_data = base64.b64encode(photo_file.read()).decode('utf-8')
+                else:
+                    # 파생 이미지가 없는 이전 업로드 사진
+                    image = Image.open(photo_file)
+                    if image.mode == 'RGBA':
+                        image = image.convert('RGB')
+                    buffered = BytesIO()
+                    image.save(buffered, format="JPEG", quality=50)
+                    photo_data = base64.b64encode(buffered.getvalue()).decode('utf-8')
 
                 user_info["photoUrl"] = f"data:image/jpeg;base64,{photo_data}"
             except gridfs.errors.NoFile:
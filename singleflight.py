@@ -0,0 +1,236 @@
+from bson import json_util
+from config import Config
+from datetime import datetime, timedelta, timezone
+from flask import make_response
+from functools import wraps
+from pymongo.errors import DuplicateKeyError
+from response_cache import response_cache, response_value, value_response
+import fcntl
+import hashlib
+import os
+import tempfile
+import threading
+import time
+
+# 같은 키(경로 + 쿼리 파라미터)의 무거운 GET 을 동시에 여러 번 계산하지 않도록 묶음 (single-flight)
+# 한 요청(leader)만 뷰를 실행하고 그동안 들어온 같은 키의 요청은 그 결과를 받음.
+# 캐시가 만료되거나 배포 직후처럼 요청이 몰릴 때 GridFS/Mongo 작업이 요청 수만큼 늘어나지 않게 함
+#
+# SINGLEFLIGHT_LOCK:
+#   none (기본) - 같은 프로세스의 스레드끼리만 묶음
+#   file        - 같은 서버의 gunicorn 워커끼리도 묶음 (SINGLEFLIGHT_LOCK_DIR 의 파일 lock)
+#   mongo       - 여러 서버의 워커끼리도 묶음 (singleflight 컬렉션의 lock 문서)
+# SINGLEFLIGHT_TIMEOUT 초 안에 leader 결과를 못 받으면 기다리던 요청이 직접 계산함
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.failed = False
+
+
+class SingleFlight:
+    """프로세스 안에서 키별로 계산 하나만 실행"""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.shared = 0
+        self.timeouts = 0
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def do(self, key, fn, timeout):
+        """(값, 다른 요청의 결과를 받았는지). leader 가 실패하거나 timeout 이 지나면 직접 fn() 실행"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if call.done.wait(timeout) and not call.failed:
+                self._count('shared')
+                return call.value, True
+            self._count('timeouts')
+            return fn(), False
+
+        self._count('leaders')
+        try:
+            call.value = fn()
+            return call.value, False
+        except BaseException:
+            call.failed = True
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class FileFlightLock:
+    """같은 서버의 워커끼리 쓰는 lock: <키 해시>.lock 에 flock, 결과는 <키 해시>.result 에 저장
+
+    result 파일은 본문을 뺀 응답 값(상태/mimetype/헤더)의 JSON 한 줄 + 본문.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key, suffix):
+        return os.path.join(self.directory, hashlib.sha1(key.encode('utf-8')).hexdigest() + suffix)
+
+    def acquire(self, key, ttl):
+        """lock 을 얻으면 해제용 핸들, 다른 워커가 가지고 있으면 None (프로세스가 죽으면 OS 가 해제)"""
+        f = open(self._path(key, '.lock'), 'a')
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            f.close()
+            return None
+        return f
+
+    def result(self, key, since):
+        """since(time.time()) 이후에 저장된 결과"""
+        path = self._path(key, '.result')
+        try:
+            if os.stat(path).st_mtime < since:
+                return None
+            with open(path, 'rb') as f:
+                value = json_util.loads(f.readline().decode('utf-8'))
+                value['body'] = f.read()
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"single-flight 결과 읽기 실패 {path}: {e}")
+            return None
+        return value
+
+    def release(self, key, handle, value=None):
+        if value is not None:
+            header = json_util.dumps({name: field for name, field in value.items() if name != 'body'}) + '\n'
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(header.encode('utf-8'))
+                    f.write(value['body'])
+                os.replace(tmp_path, self._path(key, '.result'))
+            except OSError as e:
+                print(f"single-flight 결과 저장 실패: {e}")
+        handle.close()
+
+
+class MongoFlightLock:
+    """여러 서버가 함께 쓰는 lock: singleflight 컬렉션의 {_id: 키, owner, expires_at, value, finished_at}
+
+    leader 가 죽어도 expires_at(ttl) 이 지나면 다른 요청이 lock 을 가져감.
+    오래된 문서는 TTL 인덱스(indexes.py)로 지워짐.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def acquire(self, key, ttl):
+        now = datetime.utcnow()
+        owner = f"{os.getpid()}:{threading.get_ident()}:{time.monotonic_ns()}"
+        try:
+            self.collection.find_one_and_update(
+                {'_id': key, 'expires_at': {'$lte': now}},
+                {'$set': {'owner': owner, 'expires_at': now + timedelta(seconds=ttl)}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            # 만료되지 않은 다른 leader 가 있음
+            return None
+        return owner
+
+    def result(self, key, since):
+        doc = self.collection.find_one(
+            {'_id': key, 'finished_at': {'$gte': datetime.fromtimestamp(since, timezone.utc).replace(tzinfo=None)}},
+            {'value': 1}
+        )
+        return doc['value'] if doc else None
+
+    def release(self, key, handle, value=None):
+        now = datetime.utcnow()
+        fields = {'expires_at': now}
+        if value is not None:
+            fields.update(value=value, finished_at=now)
+        self.collection.update_one({'_id': key, 'owner': handle}, {'$set': fields})
+
+
+def _process_lock(name):
+    if name == 'none':
+        return None
+    if name == 'file':
+        return FileFlightLock(Config.SINGLEFLIGHT_LOCK_DIR)
+    if name == 'mongo':
+        from database import db
+        return MongoFlightLock(db['singleflight'])
+    raise ValueError(f"Unknown SINGLEFLIGHT_LOCK: {name}")
+
+
+flights = SingleFlight()
+process_lock = _process_lock(Config.SINGLEFLIGHT_LOCK)
+
+_POLL_INTERVAL = 0.05
+
+
+def _across_processes(key, compute, timeout):
+    """다른 워커가 같은 키를 계산 중이면 그 결과를 기다림. lock 을 얻으면 직접 계산하고 결과를 남김"""
+    started = time.time()
+    deadline = time.monotonic() + timeout
+    while True:
+        handle = process_lock.acquire(key, timeout)
+        if handle is not None:
+            break
+        value = process_lock.result(key, started)
+        if value is not None:
+            return value
+        if time.monotonic() >= deadline:
+            return compute()
+        time.sleep(_POLL_INTERVAL)
+
+    # lock 을 얻기 직전에 끝난 다른 워커의 결과가 있으면 그대로 사용
+    value = process_lock.result(key, started)
+    if value is not None:
+        process_lock.release(key, handle)
+        return value
+    value = None
+    try:
+        value = compute()
+    finally:
+        process_lock.release(key, handle, value if value is not None and value['status'] == 200 else None)
+    return value
+
+
+def single_flight(timeout=None):
+    """같은 키의 동시 요청을 묶는 데코레이터 (route/cached_response 데코레이터 아래에 붙임)
+
+    다른 요청의 결과를 받은 응답에는 X-Single-Flight: shared 헤더를 붙임.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = response_cache.key()
+            wait = timeout or Config.SINGLEFLIGHT_TIMEOUT
+
+            def compute():
+                return response_value(make_response(view(*args, **kwargs)))
+
+            if process_lock is None:
+                run = compute
+            else:
+                run = lambda: _across_processes(key, compute, wait)
+            value, shared = flights.do(key, run, wait)
+            response = value_response(value)
+            if shared:
+                response.headers['X-Single-Flight'] = 'shared'
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,82 @@
+"""테스트 공통 설정
+
+MongoDB 없이 돌도록 database 모듈을 import 하기 전에 MongoClient 를 mongomock 으로 바꾸고,
+캐시/보관소처럼 테스트 사이에 상태가 남는 기능은 환경 변수로 끔.
+
+    pip install -r requirements-dev.txt
+    python -m pytest -q
+"""
+import os
+
+os.environ.update({
+    'JWT_SECRET_KEY': 'test-secret-key-for-pytest-only-0123456789',
+    'MEDIA_STORAGE': 'gridfs',
+    'MEDIA_CACHE_DISK_DIR': '',
+    'CRAWL_ARCHIVE_DIR': '',
+    'CRAWL_SCHEDULER_ENABLED': 'false',
+    'RESPONSE_CACHE_BACKEND': 'memory',
+    'SINGLEFLIGHT_LOCK': 'none',
+    'PAGINATION_COUNT_TTL': '0',
+})
+
+import mongomock
+import mongomock.gridfs
+import pymongo.mongo_client
+import pytest
+
+
+class InMemoryClient(mongomock.MongoClient):
+    def __init__(self, *args, **kwargs):
+        # MONGO_URI/tls 같은 pymongo 연결 옵션은 무시
+        super().__init__()
+
+
+def _create_indexes(self, indexes, session=None):
+    # mongomock 의 create_indexes 는 partialFilterExpression 같은 옵션을 버리므로 IndexModel 옵션을 그대로 넘김
+    names = []
+    for index in indexes:
+        document = dict(index.document)
+        names.append(self.create_index(list(document.pop('key').items()), session=session, **document))
+    return names
+
+
+mongomock.gridfs.enable_gridfs_integration()
+mongomock.Collection.create_indexes = _create_indexes
+pymongo.mongo_client.MongoClient = InMemoryClient
+
+from app import app as flask_app  # noqa: E402
+from config import Config  # noqa: E402
+from database import db as app_db  # noqa: E402
+from response_cache import response_cache, MemoryBackend  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    return flask_app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def admin_headers(app):
+    from flask_jwt_extended import create_access_token
+    with app.app_context():
+        token = create_access_token(identity={"username": "admin", "role": "admin"})
+    return {'Authorization': f"Bearer {token}"}
+
+
+@pytest.fixture
+def db():
+    return app_db
+
+
+@pytest.fixture(autouse=True)
+def clean_state(monkeypatch):
+    """테스트마다 빈 응답 캐시로 시작하고 끝나면 문서를 모두 지움 (인덱스는 유지)"""
+    monkeypatch.setattr(response_cache, 'backend', MemoryBackend(Config.RESPONSE_CACHE_MAX_ENTRIES))
+    yield
+    for name in app_db.list_collection_names():
+        app_db[name].delete_many({})
@@ -0,0 +1,41 @@
+import argparse
+import os
+import re
+
+import pymongo.mongo_client
+import pytest
+
+from crawler import bench_crawl
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'crawler', 'bench_fixtures')
+
+
+def test_fixtures_still_extract_the_same(capsys):
+    assert bench_crawl.check(argparse.Namespace(fixtures=FIXTURES)) == 0
+    assert '5/5' in capsys.readouterr().out
+
+
+def test_run_against_fixtures_offline(capsys):
+    args = argparse.Namespace(
+        fixtures=FIXTURES, site=['rookie', 'jumpball'], keywords='이소희', latency=0.0, error_rate=0.0,
+        workers=2, rate=1000.0, repeat=1, backfill=True, incremental=False, db='fanpage_bench', mongomock=True
+    )
+    client_class = pymongo.mongo_client.MongoClient
+    assert bench_crawl.run(args) == 0
+    # --mongomock 은 실행하는 동안만 MongoClient 를 바꿈
+    assert pymongo.mongo_client.MongoClient is client_class
+
+    out = capsys.readouterr().out
+    new = {site: int(count) for site, count in re.findall(r'\] (\w+)\s+pages.*?new\s+(\d+)', out)}
+    # 루키: 키워드 기사 4개 중 제외 제목 1개, 점프볼: 기준 날짜 이후 기사 1개
+    assert new == {'rookie': 3, 'jumpball': 1}
+    assert 'fixture 에 없는 URL' not in out
+
+
+def test_use_mongomock_restores_the_client_on_error():
+    client_class = pymongo.mongo_client.MongoClient
+    with pytest.raises(RuntimeError):
+        with bench_crawl.use_mongomock():
+            assert pymongo.mongo_client.MongoClient is not client_class
+            raise RuntimeError('bench failed')
+    assert pymongo.mongo_client.MongoClient is client_class
@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+
+from conditional import _utc, bump_version
+from crawler.sites import SITE_TIMEZONE
+
+
+def test_utc_conversion():
+    naive = datetime(2024, 12, 5, 21, 10)
+    assert _utc(naive) == naive
+    assert _utc(naive, SITE_TIMEZONE) == datetime(2024, 12, 5, 12, 10)
+    assert _utc(datetime(2024, 12, 5, 21, 10, tzinfo=SITE_TIMEZONE)) == datetime(2024, 12, 5, 12, 10)
+    # tz 가 붙어 있는 값은 tz 인자를 무시
+    assert _utc(datetime(2024, 12, 5, 12, 10, tzinfo=timezone.utc), SITE_TIMEZONE) == datetime(2024, 12, 5, 12, 10)
+    assert _utc('2024-12-05') is None
+
+
+def test_if_none_match_skips_the_view(client):
+    first = client.get('/api/get_schedules')
+    etag = first.headers['ETag']
+    assert first.status_code == 200
+    assert etag.startswith('W/')
+    assert first.headers['Cache-Control'] == 'no-cache'
+
+    response = client.get('/api/get_schedules', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+    # 뷰(와 그 아래 응답 캐시)를 실행하지 않음
+    assert 'X-Cache' not in response.headers
+
+
+def test_changes_produce_a_new_etag(client, admin_headers):
+    etag = client.get('/api/get_schedules').headers['ETag']
+
+    client.post('/api/admin/create_update/schedule', json={'date': '2024-12-05', 'opponent': 'KB'}, headers=admin_headers)
+    created = client.get('/api/get_schedules', headers={'If-None-Match': etag})
+    assert created.status_code == 200
+    schedule_id = created.get_json()[0]['_id']
+
+    # 제자리 수정도 @changes 로 버전이 올라감
+    etag = created.headers['ETag']
+    client.post('/api/admin/create_update/schedule', json={'_id': schedule_id, 'opponent': 'Woori'}, headers=admin_headers)
+    updated = client.get('/api/get_schedules', headers={'If-None-Match': etag})
+    assert updated.status_code == 200
+    assert updated.get_json()[0]['opponent'] == 'Woori'
+
+
+def test_etag_depends_on_query(client):
+    assert client.get('/api/rookie/search/').headers['ETag'] != client.get('/api/rookie/search/?keyword=x').headers['ETag']
+
+
+def test_bump_version_invalidates_etag(client):
+    etag = client.get('/api/get_schedules').headers['ETag']
+    bump_version('admin_schedules')
+    assert client.get('/api/get_schedules', headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_if_modified_since(client, db):
+    db['news_rookie'].insert_one({
+        '_id': ObjectId.from_datetime(datetime(2024, 1, 1, tzinfo=timezone.utc)),
+        'title': '이소희 20점', 'summary': '', 'link': 'https://rookie/1', 'created_at': datetime(2024, 12, 5, 21, 10)
+    })
+    db['collection_versions'].delete_many({})
+    last_modified = client.get('/api/rookie/search/').headers['Last-Modified']
+
+    assert client.get('/api/rookie/search/', headers={'If-Modified-Since': last_modified}).status_code == 304
+    assert client.get('/api/rookie/search/', headers={'If-Modified-Since': 'Thu, 05 Dec 2024 12:00:00 GMT'}).status_code == 200
+
+
+def test_crawler_dates_are_read_as_korea_time(client, db):
+    created_at = datetime.now().replace(microsecond=0) + timedelta(days=1)
+    db['news_rookie'].insert_one({
+        'title': '이소희 20점', 'summary': '', 'link': 'https://rookie/1', 'created_at': created_at
+    })
+
+    response = client.get('/api/rookie/search/')
+    # created_at 은 한국 시간이므로 UTC 로는 9시간 전
+    assert response.last_modified.replace(tzinfo=None) == created_at - timedelta(hours=9)
+
+
+def test_errors_are_not_marked_cacheable(client, db):
+    # summary 가 없는 문서는 목록을 만들다가 500
+    db['news_rookie'].insert_one({'title': '이소희', 'link': 'https://rookie/1', 'created_at': datetime(2024, 12, 5)})
+    response = client.get('/api/rookie/search/')
+    assert response.status_code == 500
+    assert 'ETag' not in response.headers
+
+
+def test_conditional_reads_naive_dates_in_the_given_timezone(db):
+    from flask import Flask
+    from conditional import conditional
+
+    created_at = datetime(2024, 12, 5, 21, 10)
+    db['conditional_test'].insert_one({
+        '_id': ObjectId.from_datetime(datetime(2024, 1, 1, tzinfo=timezone.utc)), 'created_at': created_at
+    })
+    db['collection_versions'].delete_many({})
+
+    app = Flask(__name__)
+
+    @app.route('/kst')
+    @conditional('conditional_test', 'created_at', tz=SITE_TIMEZONE)
+    def kst():
+        return 'ok'
+
+    @app.route('/utc')
+    @conditional('conditional_test', 'created_at')
+    def utc():
+        return 'ok'
+
+    client = app.test_client()
+    kst_response = client.get('/kst')
+    assert kst_response.headers['Last-Modified'] == 'Thu, 05 Dec 2024 12:10:00 GMT'
+    assert client.get('/utc').headers['Last-Modified'] == 'Thu, 05 Dec 2024 21:10:00 GMT'
+
+    # 한국 시간 21:10 은 UTC 12:10 이므로 그 시각 이후로 바뀌지 않았으면 304
+    assert client.get('/kst', headers={'If-Modified-Since': 'Thu, 05 Dec 2024 12:10:00 GMT'}).status_code == 304
+    assert client.get('/kst', headers={'If-Modified-Since': 'Thu, 05 Dec 2024 12:09:59 GMT'}).status_code == 200
@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import pytest
+from pymongo.errors import BulkWriteError
+from pymongo.results import BulkWriteResult
+
+from crawler.store import save_articles, DUPLICATE_KEY
+
+
+def _articles(*numbers):
+    return [
+        {'link': f'https://rookie/{number}', 'title': f'기사 {number}', 'created_at': datetime(2024, 12, number)}
+        for number in numbers
+    ]
+
+
+def _links(articles):
+    return [article['link'] for article in articles]
+
+
+def test_overlapping_batches_only_insert_new_links(db):
+    collection = db['news_rookie']
+
+    assert _links(save_articles(collection, _articles(1, 2, 3))) == _links(_articles(1, 2, 3))
+    # 같은 배치 안의 중복 링크도 한 번만 저장
+    saved = save_articles(collection, _articles(2, 3, 4, 5, 4))
+    assert _links(saved) == _links(_articles(4, 5))
+    assert collection.count_documents({}) == 5
+    assert save_articles(collection, _articles(1, 5)) == []
+    assert save_articles(collection, []) == []
+
+
+class RacingCollection:
+    """조회 뒤 다른 워커가 먼저 저장한 상황을 흉내 내는 컬렉션
+
+    조회에서는 아무것도 보이지 않고, bulk_write 는 실제 MongoDB 처럼 작업 순번(index) 기준으로
+    upsert 결과나 동시 upsert 의 중복 키 오류를 돌려줌 (mongomock 은 upserted index 를 upsert 순번으로 셈).
+    """
+
+    def __init__(self, write_errors=None, upserted=()):
+        self.write_errors = write_errors
+        self.upserted = list(upserted)
+
+    def find(self, *args, **kwargs):
+        return iter([])
+
+    def bulk_write(self, operations, ordered=True):
+        assert ordered is False
+        if self.write_errors is not None:
+            raise BulkWriteError({'writeErrors': self.write_errors, 'upserted': self.upserted})
+        return BulkWriteResult({'upserted': self.upserted}, True)
+
+
+def test_links_matched_by_upsert_are_not_reported():
+    # 첫 번째 기사는 이미 저장돼 있어서 upsert 가 기존 문서와 맞음 (오류 없음)
+    collection = RacingCollection(upserted=[{'index': 1, '_id': 'b'}])
+    assert _links(save_articles(collection, _articles(1, 2))) == _links(_articles(2))
+
+
+def test_duplicate_key_errors_are_skipped():
+    collection = RacingCollection(
+        write_errors=[{'index': 0, 'code': DUPLICATE_KEY, 'errmsg': 'E11000'}],
+        upserted=[{'index': 1, '_id': 'b'}, {'index': 2, '_id': 'c'}]
+    )
+    assert _links(save_articles(collection, _articles(1, 2, 3))) == _links(_articles(2, 3))
+
+
+def test_other_write_errors_are_raised():
+    collection = RacingCollection(
+        write_errors=[{'index': 0, 'code': DUPLICATE_KEY}, {'index': 1, 'code': 121, 'errmsg': 'validation'}],
+        upserted=[]
+    )
+    with pytest.raises(BulkWriteError):
+        save_articles(collection, _articles(1, 2))
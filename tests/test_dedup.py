@@ -0,0 +1,94 @@
+from datetime import datetime
+
+from crawler.dedup import (
+    shingles, minhash, lsh_keys, similarity, signature_fields, cluster_articles, find_similar,
+    NUM_PERM, BANDS, THRESHOLD
+)
+from crawler.replay import reconcile
+
+ROOKIE_TITLE = '[BK 리뷰] 이소희 20점 맹활약, BNK 3연승 질주'
+JUMPBALL_TITLE = '[WKBL] 이소희 20점 맹활약, BNK 3연승 질주'
+SUMMARY = 'BNK가 이소희의 20점 활약을 앞세워 3연승을 달렸다.'
+
+
+def _article(link, title, created_at, summary=SUMMARY):
+    article = {'link': link, 'title': title, 'summary': summary, 'created_at': created_at}
+    article.update(signature_fields(article))
+    return article
+
+
+def test_shingles_ignore_spacing_and_punctuation():
+    assert shingles('이소희, 20점!') == shingles('이소희 20점')
+    assert shingles('') == set()
+    assert shingles('ab') == {'ab'}
+
+
+def test_signature_shape_and_determinism():
+    signature = minhash(ROOKIE_TITLE)
+    assert len(signature) == NUM_PERM
+    assert signature == minhash(ROOKIE_TITLE)
+    assert len(lsh_keys(signature)) == BANDS
+    assert minhash('') is None
+    assert signature_fields({'title': '', 'summary': ''}) == {}
+
+
+def test_similarity_separates_copies_from_other_articles():
+    same = similarity(minhash(f"{ROOKIE_TITLE} {SUMMARY}"), minhash(f"{JUMPBALL_TITLE} {SUMMARY}"))
+    other = similarity(minhash(f"{ROOKIE_TITLE} {SUMMARY}"), minhash('신인 드래프트 1순위는 누구? 구단별 지명 결과 정리'))
+    assert same >= THRESHOLD
+    assert other < THRESHOLD
+    assert similarity(minhash(ROOKIE_TITLE), minhash(ROOKIE_TITLE)) == 1.0
+
+
+def test_copies_join_one_cluster_led_by_the_earliest(db):
+    rookie = _article('https://rookie/1', ROOKIE_TITLE, datetime(2024, 12, 5, 21, 10))
+    unrelated = _article('https://rookie/2', '신인 드래프트 결과 정리', datetime(2024, 12, 5, 10), summary='드래프트')
+    db['news_rookie'].insert_many([rookie, unrelated])
+    jumpball = _article('https://jumpball/1', JUMPBALL_TITLE, datetime(2024, 12, 5, 21, 25))
+    db['news_jumpball'].insert_one(jumpball)
+
+    assert cluster_articles(db, [jumpball]) == 1
+    saved_rookie = db['news_rookie'].find_one({'link': rookie['link']})
+    saved_jumpball = db['news_jumpball'].find_one({'link': jumpball['link']})
+    assert saved_rookie['cluster'] == saved_jumpball['cluster'] == rookie['link']
+    assert 'duplicate_of' not in saved_rookie
+    assert saved_jumpball['duplicate_of'] == rookie['link']
+    assert 'cluster' not in db['news_rookie'].find_one({'link': unrelated['link']})
+
+
+def test_lsh_lookup_only_returns_band_matches(db):
+    rookie = _article('https://rookie/1', ROOKIE_TITLE, datetime(2024, 12, 5))
+    db['news_rookie'].insert_one(rookie)
+
+    unrelated = _article('https://jumpball/9', '올스타 팬 투표 중간 집계 발표', datetime(2024, 12, 6), summary='팬 투표')
+    assert find_similar(db, unrelated) == []
+    matches = find_similar(db, _article('https://jumpball/1', JUMPBALL_TITLE, datetime(2024, 12, 6)))
+    assert [candidate['link'] for _, candidate in matches] == [rookie['link']]
+
+
+def test_collapse_hides_duplicates_and_signatures(client, db):
+    rookie = _article('https://rookie/1', ROOKIE_TITLE, datetime(2024, 12, 5, 21, 10))
+    db['news_rookie'].insert_one(rookie)
+    jumpball = _article('https://jumpball/1', JUMPBALL_TITLE, datetime(2024, 12, 5, 21, 25))
+    jumpball['image_url'] = None
+    db['news_jumpball'].insert_one(jumpball)
+    cluster_articles(db, [jumpball])
+
+    assert len(client.get('/api/jumpball/search/').get_json()) == 1
+    assert client.get('/api/jumpball/search/?collapse=true').get_json() == []
+    listed = client.get('/api/rookie/search/?collapse=true').get_json()
+    assert [article['link'] for article in listed] == [rookie['link']]
+    assert 'minhash' not in listed[0] and 'lsh' not in listed[0]
+
+
+def test_replay_reconcile_signs_and_clusters(db):
+    rookie = _article('https://rookie/1', ROOKIE_TITLE, datetime(2024, 12, 5, 21, 10))
+    db['news_rookie'].insert_one(rookie)
+
+    replayed = {'link': 'https://jumpball/1', 'title': JUMPBALL_TITLE, 'summary': SUMMARY,
+                'created_at': datetime(2024, 12, 5, 21, 25), 'keywords': ['이소희']}
+    assert reconcile(db['news_jumpball'], [replayed]) == (1, 0, 1)
+
+    saved = db['news_jumpball'].find_one({'link': replayed['link']})
+    assert saved['lsh'] == signature_fields(replayed)['lsh']
+    assert saved['duplicate_of'] == rookie['link']
@@ -0,0 +1,49 @@
+import base64
+import io
+
+from PIL import Image
+
+from media import read_file
+
+
+def _jpeg(color, size=(800, 600)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, 'JPEG')
+    buffer.seek(0)
+    return buffer
+
+
+def _post_diary(client):
+    response = client.post('/api/post_diary', data={
+        'name': 'kim',
+        'date': '2024-12-05',
+        'ticket_photo': (_jpeg('red'), 'ticket.jpg'),
+        'view_photo': (_jpeg('blue'), 'view.jpg'),
+    }, content_type='multipart/form-data')
+    assert response.status_code == 200
+    return response
+
+
+def test_inline_diaries_embed_the_original_photos(client, db):
+    _post_diary(client)
+    diary = db['diaries'].find_one({'name': 'kim'})
+
+    entries = client.get('/api/get_diary_personal?user=kim&inline=1').get_json()
+    photos = entries[0]['diary_photos']
+    for photo_type, photo_id in diary['diary_photos'].items():
+        data = base64.b64decode(photos[photo_type])
+        assert data == read_file('diary', photo_id)
+        assert Image.open(io.BytesIO(data)).size == (800, 600)
+
+
+def test_inline_diaries_with_a_missing_photo(client, db, capsys):
+    _post_diary(client)
+    diary = db['diaries'].find_one({'name': 'kim'})
+    db['diary_photo.files'].delete_one({'_id': diary['diary_photos']['view_photo']})
+
+    response = client.get('/api/get_diary_entries?inline=1')
+    assert response.status_code == 200
+    photos = response.get_json()[0]['diary_photos']
+    assert photos['view_photo'] is None
+    assert photos['ticket_photo']
+    assert 'Error retrieving diary photos' in capsys.readouterr().out
@@ -0,0 +1,249 @@
+import threading
+from datetime import datetime
+
+import pytest
+import requests
+
+import crawler.engine
+import crawler.sources
+from config import Config
+from crawler.engine import TokenBucket, CrawlEngine
+from crawler.sources import RookieSource
+
+
+class FakeTime:
+    """crawler.engine 의 time 대신 쓰는 시계. sleep 하면 기다리지 않고 시각만 앞으로 감
+
+    실제 시계처럼 최소 RESOLUTION 만큼은 흐르게 해서 부동소수점 오차로 남은 아주 작은 대기도 끝나게 함.
+    """
+
+    RESOLUTION = 1e-9
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+        self._lock = threading.Lock()
+
+    def monotonic(self):
+        with self._lock:
+            return self.now
+
+    def sleep(self, seconds):
+        with self._lock:
+            self.sleeps.append(seconds)
+            self.now += max(seconds, self.RESOLUTION)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeTime()
+    monkeypatch.setattr(crawler.engine, 'time', clock)
+    return clock
+
+
+def test_burst_is_available_immediately(clock):
+    bucket = TokenBucket(rate=10, burst=3)
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert clock.sleeps == []
+
+
+def test_rate_limits_after_burst(clock):
+    rate, burst, count = 100, 2, 12
+    bucket = TokenBucket(rate=rate, burst=burst)
+    started = clock.now
+    waited = [bucket.acquire() for _ in range(count)]
+
+    # 버킷이 비고 나면 1/rate 초마다 하나씩
+    assert waited[:burst] == [0.0] * burst
+    assert all(delay == pytest.approx(1 / rate) for delay in waited[burst:])
+    assert clock.now - started == pytest.approx((count - burst) / rate)
+
+
+def test_rate_is_shared_between_threads(clock):
+    rate, burst, threads, each = 200, 1, 4, 10
+    bucket = TokenBucket(rate=rate, burst=burst)
+    started = clock.now
+    granted = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(each):
+            bucket.acquire()
+            with lock:
+                granted.append(clock.monotonic())
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    assert len(granted) == threads * each
+    # 어느 시점까지 나간 토큰 수는 burst + 흐른 시간 * rate 를 넘지 않음
+    for count, at in enumerate(sorted(granted), start=1):
+        assert count <= burst + (at - started) * rate + 1e-6
+
+
+def test_tokens_refill_up_to_burst(clock):
+    bucket = TokenBucket(rate=1000, burst=2)
+    bucket.acquire()
+    bucket.acquire()
+    clock.sleep(10)
+    assert bucket.acquire() == 0.0
+    assert bucket.tokens == 1
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() > 0
+
+
+class FakeClient:
+    """요청한 URL 과 시각을 기록하는 HttpClient 대신 쓰는 객체"""
+
+    def __init__(self, fail=(), clock=None):
+        self.fail = set(fail)
+        self.clock = clock
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, conditional=True, throttle=None):
+        if throttle is not None:
+            throttle()
+        with self._lock:
+            self.calls.append((url, self.clock.monotonic() if self.clock else None))
+        if url in self.fail:
+            raise ConnectionError(url)
+        return url
+
+
+def test_buckets_are_per_host():
+    engine = CrawlEngine(FakeClient(), max_workers=2, rate=5, burst=1)
+    assert engine._bucket('https://a.example/x') is engine._bucket('https://a.example/y')
+    assert engine._bucket('https://a.example/x') is not engine._bucket('https://b.example/x')
+
+
+def test_fetch_all_keeps_order_and_reports_failures():
+    client = FakeClient(fail={'https://a.example/2'})
+    engine = CrawlEngine(client, max_workers=4, rate=1000, burst=10)
+    urls = [f'https://a.example/{index}' for index in range(5)]
+
+    responses = engine.fetch_all(urls)
+    assert responses == ['https://a.example/0', 'https://a.example/1', None, 'https://a.example/3', 'https://a.example/4']
+
+
+def test_fetch_all_respects_host_rate(clock):
+    rate = 50
+    client = FakeClient(clock=clock)
+    engine = CrawlEngine(client, max_workers=8, rate=rate, burst=1)
+    urls = [f'https://a.example/{index}' for index in range(6)] + [f'https://b.example/{index}' for index in range(6)]
+
+    engine.fetch_all(urls)
+    for host in ('a.example', 'b.example'):
+        times = sorted(at for url, at in client.calls if host in url)
+        # 같은 호스트의 요청은 동시 요청 수와 관계없이 1/rate 간격 이상
+        assert all(later - earlier >= 1 / rate - 1e-9 for earlier, later in zip(times, times[1:]))
+
+
+class PageClient:
+    """?page= 별 응답을 돌려주는 클라이언트. gate 가 있으면 그 페이지는 gate 가 열릴 때까지 멈춤"""
+
+    def __init__(self, pages=None, fail=(), gate=None, gated=()):
+        self.pages = pages or {}
+        self.fail = set(fail)
+        self.gate = gate
+        self.gated = set(gated)
+        self.requested = []
+        self.entered = threading.Event()
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, conditional=True, throttle=None):
+        page = params['page']
+        with self._lock:
+            self.requested.append(page)
+        if page in self.gated:
+            self.entered.set()
+            self.gate.wait(5)
+        if page in self.fail:
+            raise ConnectionError(page)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = self.pages.get(page, f'page {page}'.encode('utf-8'))
+        return response
+
+
+def _page_params(page):
+    return {'page': page}
+
+
+def test_walk_pages_yields_in_order_and_reuses_first_page():
+    client = PageClient(fail={3})
+    engine = CrawlEngine(client, max_workers=4, rate=1000, burst=10)
+    first = requests.Response()
+    first._content = b'first'
+
+    pages = list(engine.walk_pages('https://a.example/list', _page_params, 5, first=first, prefetch=2))
+    assert [page for page, _ in pages] == [1, 2, 3, 4, 5]
+    assert pages[0][1] is first
+    assert pages[2][1] is None
+    assert pages[1][1].content == b'page 2'
+    assert sorted(client.requested) == [2, 3, 4, 5]
+
+
+def test_walk_pages_only_prefetches_ahead():
+    client = PageClient()
+    engine = CrawlEngine(client, max_workers=4, rate=1000, burst=10)
+    pages = engine.walk_pages('https://a.example/list', _page_params, 10, prefetch=2)
+
+    assert next(pages)[0] == 1
+    engine._executor.shutdown(wait=True)
+    # 1페이지를 처리하는 동안에는 3페이지까지만 요청
+    assert sorted(client.requested) == [1, 2, 3]
+    pages.close()
+
+
+def test_walk_pages_cancels_queued_pages_when_closed():
+    gate = threading.Event()
+    client = PageClient(gate=gate, gated={2})
+    engine = CrawlEngine(client, max_workers=1, rate=1000, burst=10)
+    first = requests.Response()
+
+    pages = engine.walk_pages('https://a.example/list', _page_params, 10, first=first, prefetch=5)
+    assert next(pages)[0] == 1
+    # 2페이지 요청이 시작될 때까지 기다린 뒤 중단
+    assert client.entered.wait(5)
+    pages.close()
+    gate.set()
+    engine._executor.shutdown(wait=True)
+
+    # 2페이지는 이미 시작돼서 끝까지 가고, 대기 중이던 3~6페이지는 취소됨
+    assert client.requested == [2]
+
+
+def _rookie_listing(articles, page_count):
+    """ROOKIE_LISTING 선택자에 맞는 검색 목록 페이지. articles: [(번호, '2024.12.05 16:22')]"""
+    items = ''.join(
+        f'<li><div class="titles"><a href="/news/articleView.html?idxno={number}">이소희 기사 {number}</a></div>'
+        f'<div class="lead"><a>요약 {number}</a></div>'
+        f'<div class="byline"><em>기자</em><em>{date_text}</em></div></li>'
+        for number, date_text in articles
+    )
+    return (
+        f'<html><body><div id="section-list"><ul>{items}</ul></div>'
+        f'<div class="pagination"><a href="?page={page_count}">끝</a></div></body></html>'
+    ).encode('utf-8')
+
+
+def test_rookie_search_stops_at_a_page_without_new_articles(monkeypatch):
+    page_count = 10
+    client = PageClient(pages={
+        1: _rookie_listing([(1, '2024.12.05 16:22'), (2, '2024.12.05 10:00')], page_count),
+        2: _rookie_listing([(3, '2024.12.01 09:00'), (4, '2024.11.30 09:00')], page_count),
+        # 멈추지 않으면 저장되는 기사
+        3: _rookie_listing([(5, '2024.12.06 09:00')], page_count),
+    })
+    monkeypatch.setattr(crawler.sources, 'crawl_engine', CrawlEngine(client, max_workers=2, rate=1000, burst=10))
+
+    found = {}
+    RookieSource().search('이소희', ['이소희'], datetime(2024, 12, 3), found)
+
+    assert sorted(article['title'] for article in found.values()) == ['이소희 기사 1', '이소희 기사 2']
+    # 2페이지에서 멈추므로 그 뒤로는 미리 요청해 둔 페이지(CRAWL_PREFETCH_PAGES)까지만 요청
+    assert max(client.requested) <= 2 + Config.CRAWL_PREFETCH_PAGES
@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta
+
+import pytest
+import requests
+
+import crawler.http
+from crawler.http import HttpClient, ValidatorStore
+
+URL = 'https://example.com/list?page=1'
+
+
+def _response(status, body=b'', headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers.update(headers or {})
+    response.url = URL
+    return response
+
+
+class FakeSession:
+    """정해 둔 응답(또는 예외)을 차례로 돌려주고 받은 요청 헤더를 기록"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(headers or {})
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(crawler.http.time, 'sleep', sleeps.append)
+    return sleeps
+
+
+def _client(session, store=None, retries=2):
+    client = HttpClient(store, retries=retries, backoff_base=1, backoff_max=4)
+    client.session = lambda host: session
+    return client
+
+
+def test_retries_then_succeeds(sleeps):
+    session = FakeSession(requests.ConnectionError('reset'), _response(503), _response(200, b'ok'))
+    client = _client(session)
+
+    response = client.get(URL)
+    assert response.status_code == 200
+    assert response.content == b'ok'
+    assert len(session.requests) == 3
+    assert len(sleeps) == 2
+    stats = client.stats()['example.com']
+    assert (stats['requests'], stats['retries'], stats['errors']) == (3, 2, 1)
+
+
+def test_retry_after_is_honoured(sleeps):
+    session = FakeSession(_response(429, headers={'Retry-After': '3'}), _response(200))
+    _client(session).get(URL)
+    assert sleeps == [3.0]
+
+
+def test_gives_up_after_max_retries(sleeps):
+    session = FakeSession(*[requests.ConnectionError('down')] * 3)
+    with pytest.raises(requests.ConnectionError):
+        _client(session).get(URL)
+    assert len(session.requests) == 3
+    assert len(sleeps) == 2
+
+    # 재시도할 수 있는 응답이 계속 오면 마지막 응답을 그대로 돌려줌
+    session = FakeSession(*[_response(502)] * 3)
+    assert _client(session).get(URL).status_code == 502
+
+
+def test_not_modified_returns_the_stored_body(db, sleeps):
+    store = ValidatorStore(db['crawl_http_cache'])
+    session = FakeSession(
+        _response(200, '<html>목록</html>'.encode('utf-8'), {'ETag': '"v1"', 'Content-Type': 'text/html; charset=utf-8'}),
+        _response(304)
+    )
+    client = _client(session, store)
+
+    first = client.get(URL)
+    assert first.from_cache is False
+    second = client.get(URL)
+
+    assert session.requests[1]['If-None-Match'] == '"v1"'
+    assert second.status_code == 200
+    assert second.from_cache is True
+    assert second.content == first.content
+    assert second.headers['Content-Type'] == 'text/html; charset=utf-8'
+    assert client.stats()['example.com']['not_modified'] == 1
+
+
+def test_unconditional_requests_are_not_stored(db, sleeps):
+    store = ValidatorStore(db['crawl_http_cache'])
+    _client(FakeSession(_response(200, b'detail', {'ETag': '"v1"'})), store).get(URL, conditional=False)
+    assert db['crawl_http_cache'].count_documents({}) == 0
+
+
+def test_validators_expire(db):
+    store = ValidatorStore(db['crawl_http_cache'], ttl=60)
+    store.save(URL, _response(200, b'body', {'Last-Modified': 'Thu, 05 Dec 2024 12:00:00 GMT'}))
+
+    entry = store.get(URL)
+    assert entry['last_modified'] == 'Thu, 05 Dec 2024 12:00:00 GMT'
+    assert timedelta(seconds=59) < entry['expires_at'] - datetime.utcnow() <= timedelta(seconds=60)
+
+    # TTL 인덱스가 지우기 전이라도 만료된 항목은 쓰지 않음
+    db['crawl_http_cache'].update_one({'_id': URL}, {'$set': {'expires_at': datetime.utcnow() - timedelta(seconds=1)}})
+    assert store.get(URL) is None
+
+
+def test_responses_without_validators_are_not_stored(db):
+    store = ValidatorStore(db['crawl_http_cache'])
+    store.save(URL, _response(200, b'body'))
+    assert db['crawl_http_cache'].count_documents({}) == 0
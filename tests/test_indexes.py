@@ -0,0 +1,26 @@
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from indexes import INDEXES, QUERIES
+
+
+def test_crawl_info_name_is_unique_only_when_present(db):
+    crawl_info = db['crawl_info']
+    # lease/마지막 크롤링 문서처럼 name 이 없는 문서는 여러 개 있어도 됨
+    crawl_info.insert_one({'_id': 'crawl_lease'})
+    crawl_info.insert_one({'_id': 'last:rookie'})
+
+    crawl_info.insert_one({'name': 'rookie_crawl_request'})
+    with pytest.raises(DuplicateKeyError):
+        crawl_info.insert_one({'name': 'rookie_crawl_request'})
+
+
+def test_admin_guestbook_cursor_has_an_index(db):
+    keys = [list(info['key']) for info in db['guestbooks'].index_information().values()]
+    assert [('name', 1), ('_id', 1)] in keys
+    assert any(sort == [('name', 1), ('_id', 1)] for _, collection, _, sort, _ in QUERIES if collection == 'guestbooks')
+
+
+def test_queries_target_indexed_collections():
+    for name, collection, _, _, _ in QUERIES:
+        assert collection in INDEXES, name
@@ -0,0 +1,110 @@
+import io
+import os
+
+import gridfs.errors
+import pytest
+from bson import ObjectId
+
+from media import media_cache, storages
+from media.backends import LocalBackend, S3Backend, FileNotFound
+
+DATA = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def local(db, tmp_path):
+    return LocalBackend(db['test_photo.objects'], 'event', str(tmp_path))
+
+
+def test_local_round_trip(local, tmp_path):
+    file_id = local.put(DATA, filename='a.jpg', content_type='image/jpeg', metadata={'width': 1})
+
+    assert local.exists(file_id)
+    assert os.path.exists(tmp_path / 'event' / str(file_id))
+    stored = local.get(file_id)
+    assert stored.read() == DATA
+    assert (stored.filename, stored.content_type, stored.length) == ('a.jpg', 'image/jpeg', len(DATA))
+    assert stored.metadata == {'width': 1}
+    assert [found._id for found in local.find({'metadata.width': 1})] == [file_id]
+
+    local.delete(file_id)
+    assert not local.exists(file_id)
+    assert not os.path.exists(tmp_path / 'event' / str(file_id))
+    with pytest.raises(gridfs.errors.NoFile):
+        local.get(file_id)
+    # 없는 파일 삭제는 무시
+    local.delete(file_id)
+
+
+def test_missing_file_is_nofile(local):
+    with pytest.raises(FileNotFound):
+        local.get(ObjectId())
+
+
+def test_stored_file_seek_and_partial_reads(local):
+    stored = local.get(local.put(DATA, filename='a.jpg'))
+
+    assert stored.read(10) == DATA[:10]
+    assert stored.tell() == 10
+    assert stored.seek(100) == 100
+    assert stored.read(5) == DATA[100:105]
+    assert stored.seek(-4, os.SEEK_END) == len(DATA) - 4
+    assert stored.read() == DATA[-4:]
+    assert stored.read() == b''
+    assert stored.seek(-10, os.SEEK_CUR) == len(DATA) - 10
+    assert stored.read(100) == DATA[-10:]
+    stored.close()
+
+
+class FakeS3:
+    """Range 요청을 기록하고 그 위치부터의 바이트를 돌려주는 S3 클라이언트"""
+
+    def __init__(self):
+        self.objects = {}
+        self.ranges = []
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[Key] = Body
+
+    def get_object(self, Bucket, Key, Range):
+        self.ranges.append(Range)
+        start = int(Range[len('bytes='):].rstrip('-'))
+        return {'Body': io.BytesIO(self.objects[Key][start:])}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop(Key, None)
+
+
+def test_stored_file_opens_range_requests_lazily(db):
+    client = FakeS3()
+    s3 = S3Backend(db['test_photo.objects'], 'media/event', client, 'bucket', 60)
+    stored = s3.get(s3.put(DATA, filename='a.jpg', content_type='image/jpeg'))
+
+    # 처음 읽을 때만 스트림을 열고, 같은 위치에서 이어 읽으면 다시 열지 않음
+    assert client.ranges == []
+    assert stored.read(10) == DATA[:10]
+    assert stored.read(10) == DATA[10:20]
+    assert client.ranges == ['bytes=0-']
+
+    stored.seek(500)
+    assert stored.read(20) == DATA[500:520]
+    assert client.ranges == ['bytes=0-', 'bytes=500-']
+
+    # 끝에서는 요청하지 않음
+    stored.seek(0, os.SEEK_END)
+    assert stored.read() == b''
+    assert client.ranges == ['bytes=0-', 'bytes=500-']
+
+
+def test_range_response_from_local_storage(client, local, monkeypatch):
+    monkeypatch.setitem(storages, 'event', local)
+    # 캐시하지 않고 StoredFile 을 그대로 스트리밍하게 함
+    monkeypatch.setattr(media_cache, 'max_item_bytes', 0)
+    file_id = local.put(DATA, filename='a.jpg', content_type='image/jpeg')
+
+    response = client.get(f'/api/media/event/{file_id}', headers={'Range': 'bytes=100-199'})
+    assert response.status_code == 206
+    assert response.data == DATA[100:200]
+    assert response.headers['Content-Range'] == f'bytes 100-199/{len(DATA)}'
+
+    assert client.get(f'/api/media/event/{file_id}').data == DATA
@@ -0,0 +1,150 @@
+import os
+
+import pytest
+
+import media.cache
+from media.cache import CachedFile, DiskLRU, MediaCache, MemoryLRU
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(media.cache.time, 'monotonic', clock)
+    return clock
+
+
+def _info(file_id):
+    return {'_id': file_id, 'filename': f'{file_id}.jpg', 'content_type': 'image/jpeg'}
+
+
+def _loader(file_id, data, calls):
+    def load():
+        calls.append(file_id)
+        return CachedFile(data, _info(file_id))
+    return load
+
+
+def test_memory_lru_evicts_least_recently_used_within_budget(clock):
+    cache = MemoryLRU(max_bytes=10, ttl=60)
+    cache.set('a', _info('a'), b'aaaa')
+    cache.set('b', _info('b'), b'bbbb')
+    # a 를 최근에 썼으므로 예산을 넘으면 b 가 먼저 밀려남
+    assert cache.get('a')[1] == b'aaaa'
+    cache.set('c', _info('c'), b'cccc')
+
+    assert cache.get('b') is None
+    assert cache.get('a')[1] == b'aaaa'
+    assert cache.get('c')[1] == b'cccc'
+    assert cache.size == 8
+    assert cache.evictions == 1
+
+    # 예산보다 큰 항목은 넣지 않음
+    cache.set('big', _info('big'), b'x' * 11)
+    assert cache.get('big') is None
+    assert cache.size == 8
+
+
+def test_memory_lru_replaces_existing_key(clock):
+    cache = MemoryLRU(max_bytes=10, ttl=60)
+    cache.set('a', _info('a'), b'aaaa')
+    cache.set('a', _info('a'), b'aa')
+    assert cache.get('a')[1] == b'aa'
+    assert cache.size == 2
+
+
+def test_memory_lru_expires_entries(clock):
+    cache = MemoryLRU(max_bytes=10, ttl=60)
+    cache.set('a', _info('a'), b'aaaa')
+
+    clock.now += 59
+    assert cache.get('a') is not None
+    clock.now += 2
+    assert cache.get('a') is None
+    assert cache.size == 0
+    assert cache.evictions == 0
+
+
+def test_disk_lru_round_trip_and_eviction(tmp_path):
+    cache = DiskLRU(str(tmp_path), max_bytes=450)
+    cache.set('event/a', _info('a'), b'a' * 100)
+    cache.set('event/b', _info('b'), b'b' * 100)
+    info, data = cache.get('event/a')
+    assert info['filename'] == 'a.jpg'
+    assert data == b'a' * 100
+
+    # 헤더까지 합쳐 예산을 넘으면 mtime 이 가장 오래된(가장 오래 안 쓴) b 부터 지움
+    os.utime(cache._path('event/b'), (1, 1))
+    cache.set('event/c', _info('c'), b'c' * 100)
+
+    assert cache.get('event/b') is None
+    assert cache.get('event/a') is not None
+    assert cache.get('event/c') is not None
+    assert cache.evictions == 1
+
+
+def test_disk_lru_drops_broken_entries(tmp_path):
+    cache = DiskLRU(str(tmp_path), max_bytes=1000)
+    with open(cache._path('event/a'), 'wb') as f:
+        f.write(b'not json\n')
+
+    assert cache.get('event/a') is None
+    assert not os.path.exists(cache._path('event/a'))
+
+
+def test_media_cache_counts_hits_and_misses(clock):
+    cache = MediaCache(memory_bytes=1000, memory_ttl=60, disk_dir='', disk_bytes=0, max_item_bytes=100)
+    calls = []
+    load = _loader('a', b'a' * 10, calls)
+
+    first = cache.get('event', 'a', load)
+    second = cache.get('event', 'a', load)
+    assert first.read() == second.read() == b'a' * 10
+    assert second.filename == 'a.jpg'
+    assert calls == ['a']
+    assert cache.stats()['misses'] == 1
+    assert cache.stats()['memory_hits'] == 1
+
+    cache.invalidate('event', 'a')
+    cache.get('event', 'a', load)
+    assert calls == ['a', 'a']
+    assert cache.stats()['invalidations'] == 1
+    assert cache.stats()['misses'] == 2
+
+
+def test_media_cache_streams_large_files_without_caching(clock):
+    cache = MediaCache(memory_bytes=1000, memory_ttl=60, disk_dir='', disk_bytes=0, max_item_bytes=5)
+    calls = []
+    load = _loader('big', b'b' * 10, calls)
+
+    assert cache.get('event', 'big', load).read() == b'b' * 10
+    cache.get('event', 'big', load)
+    assert calls == ['big', 'big']
+    assert cache.stats()['memory_items'] == 0
+
+
+def test_media_cache_falls_back_to_disk_and_promotes(clock, tmp_path):
+    cache = MediaCache(memory_bytes=1000, memory_ttl=60, disk_dir=str(tmp_path), disk_bytes=1000, max_item_bytes=100)
+    calls = []
+    load = _loader('a', b'a' * 10, calls)
+    cache.get('event', 'a', load)
+
+    # 메모리 항목이 만료돼도(다른 워커라고 보고) 디스크에서 읽고 메모리로 다시 올림
+    clock.now += 61
+    assert cache.get('event', 'a', load).read() == b'a' * 10
+    assert cache.stats()['disk_hits'] == 1
+    assert cache.get('event', 'a', load).read() == b'a' * 10
+    assert cache.stats()['memory_hits'] == 1
+    assert calls == ['a']
+
+    # 무효화하면 두 단계 모두에서 지워짐
+    cache.invalidate('event', 'a')
+    cache.get('event', 'a', load)
+    assert calls == ['a', 'a']
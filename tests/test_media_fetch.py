@@ -0,0 +1,81 @@
+import io
+
+import gridfs.errors
+from bson import ObjectId
+from PIL import Image
+
+import media.fetch
+from media import save_image, fetch_files
+
+
+def _jpeg(color):
+    buffer = io.BytesIO()
+    Image.new('RGB', (32, 32), color).save(buffer, 'JPEG')
+    buffer.seek(0)
+    return buffer
+
+
+def _photos(*colors):
+    return [save_image('event', _jpeg(color), f'{color}.jpg') for color in colors]
+
+
+def _counting_open(monkeypatch):
+    calls = []
+    open_file = media.fetch.open_file
+
+    def counting_open_file(bucket, file_id):
+        calls.append(str(file_id))
+        return open_file(bucket, file_id)
+
+    monkeypatch.setattr(media.fetch, 'open_file', counting_open_file)
+    return calls
+
+
+def test_results_keep_input_order():
+    red, green, blue = _photos('red', 'green', 'blue')
+    files, missing = fetch_files('event', [blue, red, green])
+
+    assert [file._id for file in files] == [blue, red, green]
+    assert missing == []
+
+
+def test_repeated_ids_are_read_once_and_copied(monkeypatch):
+    red, green = _photos('red', 'green')
+    calls = _counting_open(monkeypatch)
+
+    files, missing = fetch_files('event', [red, green, red])
+    assert sorted(calls) == sorted([str(red), str(green)])
+    assert missing == []
+    assert files[0] is not files[2]
+    # 한 쪽을 읽어도 다른 쪽의 읽기 위치는 그대로
+    assert files[0].read() == files[2].read()
+
+
+def test_missing_and_broken_files_become_none(monkeypatch):
+    red, green, blue = _photos('red', 'green', 'blue')
+    absent = ObjectId()
+    open_file = media.fetch.open_file
+
+    def flaky_open_file(bucket, file_id):
+        if file_id == str(green):
+            raise gridfs.errors.CorruptGridFile('broken chunk')
+        if file_id == str(blue):
+            raise RuntimeError('storage error')
+        return open_file(bucket, file_id)
+
+    monkeypatch.setattr(media.fetch, 'open_file', flaky_open_file)
+    files, missing = fetch_files('event', [red, 'not-an-id', green, absent, blue])
+
+    assert files[0]._id == red
+    assert files[1:] == [None, None, None, None]
+    assert missing == ['not-an-id', str(green), str(absent), str(blue)]
+
+
+def test_single_file_is_read_inline(monkeypatch):
+    red, = _photos('red')
+    files, missing = fetch_files('event', [red], 'thumb')
+
+    assert files[0] is not None
+    assert files[0]._id != red
+    assert files[0].metadata['original_id'] == red
+    assert missing == []
@@ -0,0 +1,104 @@
+import io
+
+import pytest
+from PIL import Image
+
+import media.images
+from media.images import normalize_image, make_derivatives, MAX_IMAGE_PIXELS, ORIGINAL_MAX_EDGE, VARIANTS
+
+
+def _encode(image, image_format, **kwargs):
+    buffer = io.BytesIO()
+    image.save(buffer, image_format, **kwargs)
+    return buffer.getvalue()
+
+
+def _open(data):
+    return Image.open(io.BytesIO(data))
+
+
+def test_jpeg_is_reencoded_without_metadata():
+    image = Image.new('RGB', (120, 80), 'red')
+    exif = image.getexif()
+    exif[0x010F] = 'camera'  # Make
+    normalized = normalize_image(_encode(image, 'JPEG', exif=exif))
+
+    assert normalized.content_type == 'image/jpeg'
+    assert normalized.extension == '.jpg'
+    assert (normalized.width, normalized.height) == (120, 80)
+    stored = _open(normalized.data)
+    assert stored.format == 'JPEG'
+    assert not stored.getexif()
+
+
+def test_exif_orientation_is_applied():
+    image = Image.new('RGB', (120, 80), 'red')
+    exif = image.getexif()
+    exif[0x0112] = 6  # 시계 방향 90도 회전해서 보여야 함
+    normalized = normalize_image(_encode(image, 'JPEG', exif=exif))
+
+    assert (normalized.width, normalized.height) == (80, 120)
+    assert _open(normalized.data).size == (80, 120)
+
+
+def test_transparent_images_become_webp():
+    image = Image.new('RGBA', (64, 64), (255, 0, 0, 128))
+    normalized = normalize_image(_encode(image, 'PNG'))
+
+    assert normalized.content_type == 'image/webp'
+    assert normalized.extension == '.webp'
+    assert _open(normalized.data).format == 'WEBP'
+
+
+def test_opaque_png_becomes_jpeg():
+    normalized = normalize_image(_encode(Image.new('RGB', (64, 64), 'blue'), 'PNG'))
+    assert normalized.content_type == 'image/jpeg'
+
+
+def test_large_originals_are_scaled_down(monkeypatch):
+    monkeypatch.setattr(media.images, 'ORIGINAL_MAX_EDGE', 100)
+    normalized = normalize_image(_encode(Image.new('RGB', (400, 200), 'red'), 'PNG'))
+    assert (normalized.width, normalized.height) == (100, 50)
+    assert ORIGINAL_MAX_EDGE == 4096
+
+
+def test_decompression_limit(monkeypatch):
+    assert MAX_IMAGE_PIXELS == 50_000_000
+    data = _encode(Image.new('RGB', (100, 100), 'red'), 'PNG')
+    monkeypatch.setattr(media.images, 'MAX_IMAGE_PIXELS', 100 * 100 - 1)
+
+    with pytest.raises(Image.DecompressionBombError):
+        normalize_image(data)
+
+
+def test_animated_images_are_not_normalized():
+    frames = [Image.new('RGB', (32, 32), color) for color in ('red', 'blue')]
+    data = _encode(frames[0], 'GIF', save_all=True, append_images=frames[1:])
+    assert normalize_image(data) is None
+
+
+def test_non_images_raise():
+    with pytest.raises(Exception):
+        normalize_image(b'not an image')
+
+
+def test_derivative_sizes():
+    image = Image.new('RGB', (3000, 1500), 'red')
+    derivatives = make_derivatives(image)
+
+    assert set(derivatives) == set(VARIANTS)
+    for name, (data, width, height) in derivatives.items():
+        assert max(width, height) == VARIANTS[name]
+        assert width == 2 * height
+        stored = _open(data)
+        assert stored.format == 'JPEG'
+        assert stored.size == (width, height)
+
+
+def test_small_images_are_not_upscaled():
+    image = Image.new('RGBA', (200, 100), (0, 0, 0, 0))
+    derivatives = make_derivatives(image)
+
+    assert {(width, height) for _, width, height in derivatives.values()} == {(200, 100)}
+    # 투명 영역은 흰 배경으로 채움
+    assert _open(derivatives['thumb'][0]).convert('RGB').getpixel((0, 0)) > (250, 250, 250)
@@ -0,0 +1,186 @@
+import io
+
+import pytest
+from bson import ObjectId
+from PIL import Image
+
+import media.store
+from database import diaries, users, media_blobs
+from media import store_image, delete_image, release_images
+
+
+def _jpeg(color='red', size=(640, 480)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+def _files(db, collection):
+    return db[f"{collection}.files"].count_documents({})
+
+
+def test_same_bytes_share_one_blob(db):
+    first = store_image('guestbook', _jpeg(), 'a.jpg')
+    second = store_image('event', _jpeg(), 'b.jpg')
+
+    assert first['_id'] == second['_id']
+    blob = media_blobs.find_one({'file_id': first['_id']})
+    assert blob['refs'] == 2
+    assert blob['bucket'] == 'guestbook'
+    stored = _files(db, 'guestbooks_photo')
+    assert stored == 1 + len(first['variants'])
+    assert _files(db, 'event_photo') == 0
+
+    # 한 쪽을 지워도 다른 문서가 참조하므로 파일은 남음
+    delete_image('event', second['_id'])
+    assert media_blobs.find_one({'file_id': first['_id']})['refs'] == 1
+    assert _files(db, 'guestbooks_photo') == stored
+
+    # 마지막 참조를 지우면 원본과 파생 이미지가 모두 삭제됨
+    delete_image('guestbook', first['_id'])
+    assert media_blobs.count_documents({}) == 0
+    assert _files(db, 'guestbooks_photo') == 0
+
+
+def test_signed_bucket_does_not_share_with_public_buckets(db):
+    public = store_image('guestbook', _jpeg(), 'a.jpg')
+    signed = store_image('diary', _jpeg(), 'b.jpg')
+
+    assert public['_id'] != signed['_id']
+    assert _files(db, 'diary_photo') == 1 + len(signed['variants'])
+
+
+def test_register_race_reuses_the_winner(db, monkeypatch):
+    winner = store_image('guestbook', _jpeg(), 'winner.jpg')
+    winner_files = _files(db, 'guestbooks_photo')
+
+    # 먼저 참조를 찾을 때는 없었던 것처럼 보이게 해서, 등록 시점에 DuplicateKeyError 가 나게 함
+    add_reference = media.store._add_reference
+    calls = []
+
+    def racing_add_reference(blob_key):
+        calls.append(blob_key)
+        if len(calls) == 1:
+            return None
+        return add_reference(blob_key)
+
+    monkeypatch.setattr(media.store, '_add_reference', racing_add_reference)
+    loser = store_image('event', _jpeg(), 'loser.jpg')
+
+    assert len(calls) == 2
+    assert loser['_id'] == winner['_id']
+    assert media_blobs.find_one({'file_id': winner['_id']})['refs'] == 2
+    # 진 쪽이 올린 원본과 파생 이미지는 지워짐
+    assert _files(db, 'event_photo') == 0
+    assert _files(db, 'guestbooks_photo') == winner_files
+
+
+def test_release_images_ignores_failures(db):
+    stored = store_image('guestbook', _jpeg(), 'a.jpg')
+    release_images('guestbook', [stored['_id'], 'not-an-object-id'])
+
+    assert media_blobs.count_documents({}) == 0
+    assert _files(db, 'guestbooks_photo') == 0
+
+
+def _diary_form():
+    return {
+        'name': 'kim',
+        'date': '2024-12-05',
+        'location': 'busan',
+        'ticket_photo': (io.BytesIO(_jpeg('red')), 'ticket.jpg'),
+        'view_photo': (io.BytesIO(_jpeg('blue')), 'view.jpg'),
+    }
+
+
+def test_post_diary_releases_photos_when_insert_fails(client, db, monkeypatch):
+    def failing_insert(*args, **kwargs):
+        raise RuntimeError('insert failed')
+
+    monkeypatch.setattr(diaries, 'insert_one', failing_insert)
+    response = client.post('/api/post_diary', data=_diary_form(), content_type='multipart/form-data')
+
+    assert response.status_code == 500
+    assert media_blobs.count_documents({}) == 0
+    assert _files(db, 'diary_photo') == 0
+
+
+def test_post_diary_keeps_photos_shared_with_an_existing_diary(client, db, monkeypatch):
+    existing = store_image('diary', _jpeg('red'), 'ticket.jpg')
+
+    def failing_insert(*args, **kwargs):
+        raise RuntimeError('insert failed')
+
+    monkeypatch.setattr(diaries, 'insert_one', failing_insert)
+    response = client.post('/api/post_diary', data=_diary_form(), content_type='multipart/form-data')
+
+    assert response.status_code == 500
+    # 기존 다이어리의 참조만 남고 새로 올린 사진은 지워짐
+    blob = media_blobs.find_one({})
+    assert blob['file_id'] == existing['_id']
+    assert blob['refs'] == 1
+    assert _files(db, 'diary_photo') == 1 + len(existing['variants'])
+
+
+def test_post_events_releases_photos_when_linking_fails(client, db, admin_headers, monkeypatch):
+    from database import events
+
+    def failing_update(*args, **kwargs):
+        raise RuntimeError('update failed')
+
+    monkeypatch.setattr(events, 'update_one', failing_update)
+    response = client.post(
+        '/api/admin/postevents',
+        data={'title': 'event', 'photos': [(io.BytesIO(_jpeg()), 'photo.jpg')]},
+        content_type='multipart/form-data',
+        headers=admin_headers
+    )
+
+    assert response.status_code == 500
+    assert events.count_documents({}) == 0
+    assert media_blobs.count_documents({}) == 0
+    assert _files(db, 'event_photo') == 0
+
+
+@pytest.fixture
+def user_headers(app):
+    from flask_jwt_extended import create_access_token
+    users.insert_one({'_id': ObjectId(), 'nickname': 'kim', 'description': 'old'})
+    with app.app_context():
+        token = create_access_token(identity='kim')
+    return {'Authorization': f"Bearer {token}"}
+
+
+def test_update_profile_releases_photo_when_update_fails(client, db, user_headers, monkeypatch):
+    def failing_update(*args, **kwargs):
+        raise RuntimeError('update failed')
+
+    monkeypatch.setattr(users, 'update_one', failing_update)
+    response = client.put(
+        '/api/put/userinfo',
+        data={'photo': (io.BytesIO(_jpeg()), 'me.jpg')},
+        content_type='multipart/form-data',
+        headers=user_headers
+    )
+
+    assert response.status_code == 500
+    assert media_blobs.count_documents({}) == 0
+    assert _files(db, 'user_photo') == 0
+
+
+def test_update_profile_replaces_the_old_photo(client, db, user_headers):
+    old = store_image('user', _jpeg('blue'), 'old.jpg')
+    users.update_one({'nickname': 'kim'}, {'$set': {'photo': f"/api/photo/{old['_id']}"}})
+
+    response = client.put(
+        '/api/put/userinfo',
+        data={'photo': (io.BytesIO(_jpeg('red')), 'me.jpg')},
+        content_type='multipart/form-data',
+        headers=user_headers
+    )
+
+    assert response.status_code == 200
+    new_id = ObjectId(response.get_json()['photo'].split('/')[-1])
+    assert media_blobs.find_one({'file_id': old['_id']}) is None
+    assert media_blobs.find_one({'file_id': new_id})['refs'] == 1
+    assert db['user_photo.files'].find_one({'_id': old['_id']}) is None
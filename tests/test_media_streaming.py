@@ -0,0 +1,100 @@
+import io
+
+from PIL import Image
+
+from media import save_image, media_url
+
+
+def _jpeg(color='red', size=(640, 480)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, 'JPEG')
+    buffer.seek(0)
+    return buffer
+
+
+def _event_photo():
+    return save_image('event', _jpeg(), 'photo.jpg')
+
+
+def test_full_response_is_cacheable(client):
+    file_id = _event_photo()
+    response = client.get(media_url('event', file_id))
+
+    assert response.status_code == 200
+    assert response.mimetype == 'image/jpeg'
+    assert response.headers['Accept-Ranges'] == 'bytes'
+    assert response.headers['ETag']
+    assert response.last_modified is not None
+    assert response.cache_control.public
+    assert response.cache_control.max_age > 0
+    assert 'immutable' in response.headers['Cache-Control']
+    assert int(response.headers['Content-Length']) == len(response.data)
+
+
+def test_range_request_returns_partial_content(client):
+    file_id = _event_photo()
+    full = client.get(media_url('event', file_id)).data
+
+    response = client.get(media_url('event', file_id), headers={'Range': 'bytes=10-99'})
+    assert response.status_code == 206
+    assert response.data == full[10:100]
+    assert response.headers['Content-Range'] == f"bytes 10-99/{len(full)}"
+
+    response = client.get(media_url('event', file_id), headers={'Range': f"bytes=-{len(full) - 5}"})
+    assert response.status_code == 206
+    assert response.data == full[5:]
+
+
+def test_unsatisfiable_range(client):
+    file_id = _event_photo()
+    response = client.get(media_url('event', file_id), headers={'Range': 'bytes=99999999-'})
+    assert response.status_code == 416
+
+
+def test_if_none_match_returns_304(client):
+    file_id = _event_photo()
+    etag = client.get(media_url('event', file_id)).headers['ETag']
+
+    response = client.get(media_url('event', file_id), headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+
+    response = client.get(media_url('event', file_id), headers={'If-None-Match': '"other"'})
+    assert response.status_code == 200
+
+
+def test_if_modified_since_returns_304(client):
+    file_id = _event_photo()
+    last_modified = client.get(media_url('event', file_id)).headers['Last-Modified']
+
+    response = client.get(media_url('event', file_id), headers={'If-Modified-Since': last_modified})
+    assert response.status_code == 304
+
+    response = client.get(media_url('event', file_id), headers={'If-Modified-Since': 'Mon, 01 Jan 2001 00:00:00 GMT'})
+    assert response.status_code == 200
+
+
+def test_variant_is_served_from_same_url(client):
+    file_id = _event_photo()
+    original = client.get(media_url('event', file_id))
+    thumb = client.get(media_url('event', file_id, 'thumb'))
+
+    assert thumb.status_code == 200
+    assert len(thumb.data) < len(original.data)
+    assert thumb.headers['ETag'] != original.headers['ETag']
+
+
+def test_unknown_bucket_and_id(client):
+    assert client.get('/api/media/nope/000000000000000000000000').status_code == 404
+    assert client.get('/api/media/event/not-an-id').status_code == 404
+    assert client.get('/api/media/event/000000000000000000000000').status_code == 404
+
+
+def test_authenticated_media_is_private(client, admin_headers):
+    file_id = save_image('admin', _jpeg('blue'), 'admin.jpg')
+
+    response = client.get(f"/api/admin/get/photo/{file_id}", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.cache_control.private
+    assert response.cache_control.no_store
+    assert not response.cache_control.public
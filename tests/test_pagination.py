@@ -0,0 +1,192 @@
+from datetime import datetime, timedelta
+import io
+
+import pytest
+from bson import ObjectId
+from PIL import Image
+
+from media import save_image
+from pagination import encode_cursor, decode_cursor, keyset_page, parse_limit, wants_cursor
+
+
+def test_cursor_round_trip():
+    _id = ObjectId()
+    value = datetime(2024, 12, 5, 16, 22)
+    assert decode_cursor(encode_cursor(value, _id)) == (value, _id)
+    assert decode_cursor(encode_cursor('2024-12-05', _id)) == ('2024-12-05', _id)
+
+
+@pytest.mark.parametrize('cursor', ['', 'not-base64!', 'e30', 'bm90IGpzb24'])
+def test_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_parse_limit():
+    assert parse_limit(None) == 20
+    assert parse_limit('5') == 5
+    assert parse_limit('abc') == 20
+    assert parse_limit('0') == 1
+    assert parse_limit('1000') == 100
+
+
+def test_wants_cursor():
+    assert not wants_cursor({'page': '2'})
+    assert wants_cursor({'limit': '10'})
+    assert wants_cursor({'cursor': 'x'})
+
+
+@pytest.fixture
+def entries(db):
+    collection = db['pagination_test']
+    start = datetime(2024, 1, 1)
+    # 같은 날짜가 섞여 있어도 _id 로 순서가 정해짐
+    docs = [{'_id': ObjectId(), 'date': start + timedelta(days=index // 2), 'n': index} for index in range(7)]
+    collection.insert_many(docs)
+    return collection
+
+
+def _walk(collection, limit):
+    pages = []
+    docs, next_cursor, prev_cursor = keyset_page(collection, {}, 'date', -1, limit)
+    assert prev_cursor is None
+    pages.append(docs)
+    while next_cursor:
+        docs, next_cursor, prev_cursor = keyset_page(collection, {}, 'date', -1, limit, after=next_cursor)
+        assert prev_cursor is not None
+        pages.append(docs)
+    return pages
+
+
+def test_keyset_pages_cover_every_document_once(entries):
+    pages = _walk(entries, 3)
+    numbers = [doc['n'] for page in pages for doc in page]
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert sorted(numbers) == list(range(7))
+    expected = [doc['n'] for doc in entries.find(sort=[('date', -1), ('_id', -1)])]
+    assert numbers == expected
+
+
+def test_keyset_previous_page(entries):
+    first, next_cursor, _ = keyset_page(entries, {}, 'date', -1, 3)
+    second, _, prev_cursor = keyset_page(entries, {}, 'date', -1, 3, after=next_cursor)
+
+    back, back_next, back_prev = keyset_page(entries, {}, 'date', -1, 3, before=prev_cursor)
+    assert [doc['_id'] for doc in back] == [doc['_id'] for doc in first]
+    assert back_prev is None
+    assert keyset_page(entries, {}, 'date', -1, 3, after=back_next)[0] == second
+
+
+def test_keyset_page_with_query(entries):
+    docs, next_cursor, _ = keyset_page(entries, {'n': {'$gte': 4}}, 'date', -1, 10)
+    assert sorted(doc['n'] for doc in docs) == [4, 5, 6]
+    assert next_cursor is None
+
+
+def _jpeg(color):
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 64), color).save(buffer, 'JPEG')
+    buffer.seek(0)
+    return buffer
+
+
+def test_gallery_cursor_across_buckets(client):
+    colors = ['red', 'green', 'blue', 'yellow', 'purple']
+    for index, color in enumerate(colors):
+        save_image('admin' if index % 2 else 'user', _jpeg(color), f'{color}.jpg')
+
+    seen = []
+    cursor = None
+    while True:
+        query = "/api/get/photos?limit=2" + (f"&cursor={cursor}" if cursor else '')
+        response = client.get(query)
+        assert response.status_code == 200
+        body = response.get_json()
+        assert len(body['photos']) <= 2
+        seen.extend(photo['_id'] for photo in body['photos'])
+        cursor = body['next_cursor']
+        if not cursor:
+            break
+
+    assert len(seen) == len(set(seen)) == len(colors)
+
+
+def test_gallery_rejects_bad_input(client):
+    assert client.get('/api/get/photos?cursor=garbage').status_code == 400
+    assert client.get('/api/get/photos?bucket=diary').status_code == 400
+
+
+def _walk_endpoint(client, url, limit):
+    pages = []
+    response = client.get(f"{url}?limit={limit}&total=1")
+    while True:
+        assert response.status_code == 200
+        body = response.get_json()
+        pages.append(body)
+        if not body['next_cursor']:
+            return pages
+        response = client.get(f"{url}?limit={limit}&cursor={body['next_cursor']}")
+
+
+def test_guestbook_cursor_endpoint(client, db):
+    db['guestbooks'].insert_many([
+        {'name': f'fan{index}', 'message': 'hi', 'date': f'2024-12-{index + 1:02d}'} for index in range(5)
+    ])
+
+    pages = _walk_endpoint(client, '/api/get_user_guestbook_entries', 2)
+    dates = [entry['date'] for page in pages for entry in page['entries']]
+
+    assert pages[0]['total_entries'] == 5
+    assert pages[0]['prev_cursor'] is None
+    assert dates == sorted(dates, reverse=True)
+    assert len(dates) == len(set(dates)) == 5
+    assert client.get('/api/get_user_guestbook_entries?cursor=garbage').status_code == 400
+
+
+def test_diary_cursor_endpoint_keeps_page_size_mode(client, db):
+    start = datetime(2024, 12, 1)
+    db['diaries'].insert_many([
+        {'name': 'fan', 'date': start, 'saved_at': start + timedelta(hours=index)} for index in range(5)
+    ])
+
+    pages = _walk_endpoint(client, '/api/get_diary_entries', 3)
+    saved = [entry['saved_at'] for page in pages for entry in page['entries']]
+    assert [len(page['entries']) for page in pages] == [3, 2]
+    assert saved == sorted(saved, reverse=True)
+
+    # cursor/limit 가 없으면 이전 page/page_size 응답 (목록 그대로)
+    legacy = client.get('/api/get_diary_entries?page=2&page_size=3').get_json()
+    assert [entry['saved_at'] for entry in legacy] == saved[3:]
+
+
+def test_cached_count_is_bounded(db, monkeypatch):
+    import pagination
+    from config import Config
+
+    monkeypatch.setattr(Config, 'PAGINATION_COUNT_TTL', 60)
+    monkeypatch.setattr(pagination, 'COUNT_CACHE_SIZE', 3)
+    monkeypatch.setattr(pagination, '_counts', pagination.OrderedDict())
+    collection = db['guestbooks']
+    collection.insert_many([{'name': f'user{i}'} for i in range(5)])
+
+    for i in range(5):
+        assert pagination.cached_count(collection, {'name': f'user{i}'}) == 1
+    assert len(pagination._counts) == 3
+
+    # 캐시된 값은 TTL 동안 그대로 씀
+    collection.insert_one({'name': 'user4'})
+    assert pagination.cached_count(collection, {'name': 'user4'}) == 1
+    # 가장 오래전에 쓴 조건부터 밀려남
+    assert pagination.cached_count(collection, {'name': 'user0'}) == 1
+    assert len(pagination._counts) == 3
+    assert not any("user1" in key[1] for key in pagination._counts)
+
+
+def test_cached_count_is_not_stored_without_ttl(db, monkeypatch):
+    import pagination
+
+    monkeypatch.setattr(pagination, '_counts', pagination.OrderedDict())
+    db['guestbooks'].insert_one({'name': 'kim'})
+    assert pagination.cached_count(db['guestbooks'], {'name': 'kim'}) == 1
+    assert len(pagination._counts) == 0
@@ -0,0 +1,155 @@
+import time
+
+import pytest
+from flask import Flask, jsonify, make_response
+
+from response_cache import (
+    MemoryBackend, MongoBackend, ResponseCache, cached_response, invalidates, response_cache,
+    response_value, value_response
+)
+
+
+def test_memory_backend_lru_eviction():
+    backend = MemoryBackend(max_entries=2)
+    backend.set('a', 1, 60, ['x'])
+    backend.set('b', 2, 60, ['x'])
+    assert backend.get('a') == 1  # a 를 최근에 쓴 항목으로
+    backend.set('c', 3, 60, ['y'])
+
+    assert backend.get('b') is None
+    assert backend.get('a') == 1
+    assert backend.get('c') == 3
+
+
+def test_memory_backend_expiry():
+    backend = MemoryBackend(max_entries=10)
+    backend.set('a', 1, 0.01, [])
+    time.sleep(0.02)
+    assert backend.get('a') is None
+
+
+def test_memory_backend_invalidates_by_tag():
+    backend = MemoryBackend(max_entries=10)
+    backend.set('a', 1, 60, ['events'])
+    backend.set('b', 2, 60, ['events', 'news'])
+    backend.set('c', 3, 60, ['news'])
+
+    assert backend.invalidate(['events']) == 2
+    assert backend.get('a') is None and backend.get('b') is None
+    assert backend.get('c') == 3
+    # b 를 지우면서 news 역색인에서도 빠짐
+    assert backend.invalidate(['news']) == 1
+
+
+def test_mongo_backend(db):
+    backend = MongoBackend(db['response_cache'])
+    backend.set('a', {'body': b'1'}, 60, ['events'])
+    backend.set('b', {'body': b'2'}, -1, ['news'])
+
+    assert backend.get('a') == {'body': b'1'}
+    # TTL 인덱스가 지우기 전이라도 만료된 항목은 돌려주지 않음
+    assert backend.get('b') is None
+    assert backend.invalidate(['events']) == 1
+    assert backend.get('a') is None
+
+
+def test_stats_count_hits_misses_and_invalidations():
+    cache = ResponseCache(MemoryBackend(10), 60)
+    cache.get('a')
+    cache.set('a', 1, 60, ['t'])
+    cache.get('a')
+    cache.invalidate('t')
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'invalidations': 1}
+
+
+def test_schedule_list_is_cached_until_an_admin_change(client, admin_headers):
+    first = client.get('/api/get_schedules')
+    assert first.headers['X-Cache'] == 'MISS'
+    assert first.get_json() == []
+    assert client.get('/api/get_schedules').headers['X-Cache'] == 'HIT'
+
+    response = client.post('/api/admin/create_update/schedule', json={'date': '2024-12-05', 'opponent': 'KB'},
+                           headers=admin_headers)
+    assert response.status_code == 200
+
+    after = client.get('/api/get_schedules')
+    assert after.headers['X-Cache'] == 'MISS'
+    assert [schedule['opponent'] for schedule in after.get_json()] == ['KB']
+
+
+def test_cache_key_ignores_parameter_order():
+    app = Flask(__name__)
+    with app.test_request_context('/x?b=2&a=1'):
+        first = response_cache.key()
+    with app.test_request_context('/x?a=1&b=2'):
+        assert response_cache.key() == first
+    with app.test_request_context('/x?a=1&b=3'):
+        assert response_cache.key() != first
+
+
+@pytest.fixture
+def cached_app():
+    app = Flask(__name__)
+    calls = []
+
+    @app.route('/items')
+    @cached_response('items')
+    def items():
+        calls.append(1)
+        response = make_response(jsonify(count=len(calls)))
+        response.headers['Cache-Control'] = 'public, max-age=30'
+        response.set_etag('items-v1')
+        return response
+
+    @app.route('/fail')
+    @cached_response('items')
+    def fail():
+        calls.append(1)
+        return jsonify(message='boom'), 500
+
+    @app.route('/items', methods=['POST'])
+    @invalidates('items')
+    def change():
+        return jsonify(status='ok')
+
+    return app, calls
+
+
+def test_hit_replays_body_and_headers(cached_app):
+    app, calls = cached_app
+    client = app.test_client()
+    first = client.get('/items')
+    hit = client.get('/items')
+
+    assert hit.headers['X-Cache'] == 'HIT'
+    assert hit.get_json() == first.get_json() == {'count': 1}
+    assert hit.headers['Cache-Control'] == 'public, max-age=30'
+    assert hit.headers['ETag'] == first.headers['ETag']
+    assert hit.mimetype == 'application/json'
+    assert len(calls) == 1
+
+    client.post('/items')
+    assert client.get('/items').get_json() == {'count': 2}
+
+
+def test_errors_are_not_cached(cached_app):
+    app, calls = cached_app
+    client = app.test_client()
+    client.get('/fail')
+    assert client.get('/fail').headers['X-Cache'] == 'MISS'
+    assert len(calls) == 2
+
+
+def test_value_round_trip_skips_cookies():
+    app = Flask(__name__)
+    with app.test_request_context('/'):
+        response = make_response('body', 201)
+        response.headers.add('Vary', 'Accept')
+        response.headers.add('Vary', 'Origin')
+        response.set_cookie('session', 'secret')
+        restored = value_response(response_value(response))
+
+    assert restored.status_code == 201
+    assert restored.get_data() == b'body'
+    assert restored.headers.getlist('Vary') == ['Accept', 'Origin']
+    assert 'Set-Cookie' not in restored.headers
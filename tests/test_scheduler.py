@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from crawler import scheduler
+from crawler.scheduler import Lease, record_crawl, run_pending, JOBS, LEASE_NAME
+
+
+@pytest.fixture
+def crawl_info(db):
+    return db['crawl_info']
+
+
+def _expire(collection, name):
+    collection.update_one({'_id': name}, {'$set': {'expires_at': datetime.now(timezone.utc) - timedelta(seconds=1)}})
+
+
+def test_only_one_owner_holds_the_lease(crawl_info):
+    first = Lease(crawl_info, 'test_lease', ttl=60, owner='a')
+    second = Lease(crawl_info, 'test_lease', ttl=60, owner='b')
+
+    assert first.acquire() == 1
+    assert second.acquire() is None
+    assert crawl_info.count_documents({'_id': 'test_lease'}) == 1
+
+
+def test_expired_lease_is_taken_over_with_a_higher_token(crawl_info):
+    first = Lease(crawl_info, 'test_lease', ttl=60, owner='a')
+    second = Lease(crawl_info, 'test_lease', ttl=60, owner='b')
+    first.acquire()
+
+    _expire(crawl_info, 'test_lease')
+    assert second.acquire() == 2
+    # 이전 소유자는 lease 를 잃었으므로 연장/해제가 새 소유자에게 영향을 주지 않음
+    assert first.heartbeat() is False
+    first.release()
+    assert crawl_info.find_one({'_id': 'test_lease'})['owner'] == 'b'
+    assert second.heartbeat() is True
+
+
+def test_release_lets_the_next_owner_in(crawl_info):
+    first = Lease(crawl_info, 'test_lease', ttl=60, owner='a')
+    second = Lease(crawl_info, 'test_lease', ttl=60, owner='b')
+    first.acquire()
+    first.release()
+
+    assert second.acquire() == 2
+
+
+def test_same_owner_reacquires(crawl_info):
+    lease = Lease(crawl_info, 'test_lease', ttl=60, owner='a')
+    assert lease.acquire() == 1
+    assert lease.acquire() == 2
+
+
+def test_record_crawl_is_fenced_by_token(crawl_info):
+    assert record_crawl('rookie', 2) is True
+    recorded = crawl_info.find_one({'_id': JOBS['rookie']})
+    assert recorded['token'] == 2
+
+    # 더 작은 token(먼저 lease 를 잃은 소유자)은 기록하지 못함
+    assert record_crawl('rookie', 1) is False
+    assert crawl_info.find_one({'_id': JOBS['rookie']})['date'] == recorded['date']
+
+    assert record_crawl('rookie', 3) is True
+    assert crawl_info.find_one({'_id': JOBS['rookie']})['token'] == 3
+    assert crawl_info.count_documents({'_id': JOBS['rookie']}) == 1
+
+
+@pytest.fixture
+def crawled(monkeypatch):
+    jobs = []
+
+    def fake_crawl_source(name, database, keywords=None, backfill=False):
+        jobs.append(name)
+        return [{'link': f'{name}-1'}]
+
+    monkeypatch.setattr(scheduler, 'crawl_source', fake_crawl_source)
+    return jobs
+
+
+def test_run_pending_runs_due_jobs_once(crawl_info, crawled):
+    assert run_pending(owner='worker-1') == {'rookie': 1, 'jumpball': 1}
+    assert sorted(crawled) == ['jumpball', 'rookie']
+    assert crawl_info.find_one({'_id': JOBS['rookie']})['token'] == 1
+
+    # 방금 크롤링했으므로 주기가 지나기 전에는 실행하지 않음
+    assert run_pending(owner='worker-2') == {}
+    assert len(crawled) == 2
+
+
+def test_run_pending_skips_without_the_lease(crawl_info, crawled):
+    Lease(crawl_info, LEASE_NAME, ttl=60, owner='other').acquire()
+
+    assert run_pending(owner='worker-1', force=True) == {}
+    assert crawled == []
+
+
+def test_requested_job_runs_before_interval(crawl_info, crawled):
+    run_pending(owner='worker-1')
+    scheduler.request_crawl('rookie')
+
+    assert run_pending(owner='worker-1') == {'rookie': 1}
+    assert not scheduler.crawl_requested('rookie')
+
+
+def test_failed_job_keeps_its_request_and_others_still_run(crawl_info, monkeypatch):
+    crawled = []
+
+    def flaky_crawl_source(name, database, keywords=None, backfill=False):
+        crawled.append(name)
+        if name == 'rookie':
+            raise RuntimeError('site down')
+        return [{'link': f'{name}-1'}]
+
+    monkeypatch.setattr(scheduler, 'crawl_source', flaky_crawl_source)
+    scheduler.request_crawl('rookie')
+
+    assert run_pending(owner='worker-1') == {'jumpball': 1}
+    assert sorted(crawled) == ['jumpball', 'rookie']
+    # 실패한 작업은 기록하지 않고 요청도 남아 있어 다음 확인 때 다시 실행
+    assert scheduler.crawl_requested('rookie')
+    assert crawl_info.find_one({'_id': JOBS['rookie']}) is None
+    assert crawl_info.find_one({'_id': JOBS['jumpball']})['token'] == 1
+
+
+def test_last_crawl_does_not_depend_on_the_name_index(crawl_info):
+    from indexes import ensure_indexes
+    crawl_info.drop_indexes()
+    try:
+        assert record_crawl('rookie', 2) is True
+        assert record_crawl('rookie', 1) is False
+        assert crawl_info.count_documents({'_id': JOBS['rookie']}) == 1
+    finally:
+        ensure_indexes(crawl_info.database, ['crawl_info'])
@@ -0,0 +1,111 @@
+import io
+import time
+
+from PIL import Image
+
+from config import Config
+from media import save_image, media_url
+from media.signing import sign_media, verify_media, url_expiry
+
+
+def _jpeg(color='green'):
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 64), color).save(buffer, 'JPEG')
+    buffer.seek(0)
+    return buffer
+
+
+def test_signature_round_trip():
+    params = sign_media('diary', 'abc', 'thumb')
+    remaining = verify_media('diary', 'abc', 'thumb', params['exp'], params['sig'])
+    assert 0 < remaining <= Config.MEDIA_URL_TTL + Config.MEDIA_URL_WINDOW
+
+
+def test_signature_is_bound_to_bucket_id_and_variant():
+    params = sign_media('diary', 'abc', 'thumb')
+    assert verify_media('user', 'abc', 'thumb', params['exp'], params['sig']) is None
+    assert verify_media('diary', 'abd', 'thumb', params['exp'], params['sig']) is None
+    assert verify_media('diary', 'abc', None, params['exp'], params['sig']) is None
+    assert verify_media('diary', 'abc', 'thumb', params['exp'] + 1, params['sig']) is None
+    assert verify_media('diary', 'abc', 'thumb', 'soon', params['sig']) is None
+    assert verify_media('diary', 'abc', 'thumb', params['exp'], None) is None
+
+
+def test_expired_signature():
+    expires = int(time.time()) - 1
+    params = sign_media('diary', 'abc', expires=expires)
+    assert verify_media('diary', 'abc', None, params['exp'], params['sig']) is None
+
+
+def test_expiry_is_rounded_to_window():
+    now = 1_700_000_123
+    expires = url_expiry(now)
+    assert expires % Config.MEDIA_URL_WINDOW == 0
+    assert now + Config.MEDIA_URL_TTL <= expires < now + Config.MEDIA_URL_TTL + Config.MEDIA_URL_WINDOW
+    # 같은 구간 안에서는 같은 URL
+    assert url_expiry(now + 1) == expires
+
+
+def test_signed_bucket_requires_signature(client):
+    assert 'diary' in Config.MEDIA_SIGNED_BUCKETS
+    file_id = save_image('diary', _jpeg(), 'diary.jpg')
+
+    assert client.get(f"/api/media/diary/{file_id}").status_code == 403
+    assert client.get(f"/api/media/diary/{file_id}?exp=1&sig=bogus").status_code == 403
+
+    response = client.get(media_url('diary', file_id))
+    assert response.status_code == 200
+    # 서명 만료 시각까지만 캐시
+    assert 0 < response.cache_control.max_age <= Config.MEDIA_URL_TTL + Config.MEDIA_URL_WINDOW
+
+
+def test_signed_url_for_variant(client):
+    file_id = save_image('diary', _jpeg(), 'diary.jpg')
+    assert client.get(media_url('diary', file_id, 'thumb')).status_code == 200
+    # 원본 서명으로 파생 이미지는 받을 수 없음
+    params = sign_media('diary', file_id)
+    response = client.get(f"/api/media/diary/{file_id}?variant=thumb&exp={params['exp']}&sig={params['sig']}")
+    assert response.status_code == 403
+
+
+def test_signed_bucket_is_not_shared_with_unsigned_buckets(client):
+    diary_id = save_image('diary', _jpeg('navy'), 'diary.jpg')
+    guestbook_id = save_image('guestbook', _jpeg('navy'), 'guestbook.jpg')
+
+    # 같은 내용이어도 서명 버킷의 이미지는 다른 버킷과 공유하지 않음
+    assert diary_id != guestbook_id
+    # 서명 없는 버킷 주소로 다이어리 이미지를 받을 수 없음
+    assert client.get(f"/api/media/guestbook/{diary_id}").status_code == 404
+    assert client.get(media_url('guestbook', guestbook_id)).status_code == 200
+
+
+def test_unsigned_bucket_is_public(client):
+    file_id = save_image('event', _jpeg(), 'event.jpg')
+    assert media_url('event', file_id) == f"/api/media/event/{file_id}"
+    assert client.get(media_url('event', file_id)).status_code == 200
+
+
+def test_forged_signature_is_rejected_before_lookup(client, monkeypatch):
+    import routes.media_routes
+
+    def unexpected_lookup(*args, **kwargs):
+        raise AssertionError('locate_file called for a forged request')
+
+    monkeypatch.setattr(routes.media_routes, 'locate_file', unexpected_lookup)
+    file_id = save_image('diary', _jpeg(), 'diary.jpg')
+    assert client.get(f"/api/media/diary/{file_id}?exp=1&sig=bogus").status_code == 403
+    assert client.get(f"/api/media/diary/{file_id}").status_code == 403
+
+
+def test_admin_gallery_uses_signed_urls(client, admin_headers):
+    file_id = save_image('admin', _jpeg(), 'admin.jpg')
+
+    response = client.get('/api/admin/get/photos', headers=admin_headers)
+    assert response.status_code == 200
+    photo = response.get_json()['photos'][0]
+    assert photo['_id'] == str(file_id)
+    assert 'sig=' in photo['url'] and 'sig=' in photo['thumb_url']
+    assert client.get(photo['url']).status_code == 200
+    assert client.get(photo['thumb_url']).status_code == 200
+
+    assert client.get('/api/admin/get/photos').status_code == 401
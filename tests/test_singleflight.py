@@ -0,0 +1,168 @@
+from datetime import datetime, timedelta
+import threading
+import time
+
+import pytest
+from flask import Flask, make_response
+
+import singleflight
+from singleflight import SingleFlight, FileFlightLock, MongoFlightLock, single_flight, _across_processes
+
+
+def _run_together(count, target):
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def run(index):
+        barrier.wait()
+        results[index] = target()
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_calls_share_one_computation():
+    flights = SingleFlight()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return 'value'
+
+    results = _run_together(5, lambda: flights.do('key', compute, timeout=5))
+
+    assert len(calls) == 1
+    assert [value for value, _ in results] == ['value'] * 5
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert (flights.leaders, flights.shared) == (1, 4)
+
+
+def test_different_keys_are_not_shared():
+    flights = SingleFlight()
+    assert flights.do('a', lambda: 1, 1) == (1, False)
+    assert flights.do('b', lambda: 2, 1) == (2, False)
+
+
+def test_waiters_compute_themselves_when_the_leader_fails():
+    flights = SingleFlight()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.1)
+            raise RuntimeError('leader failed')
+        return 'retry'
+
+    def call():
+        try:
+            return flights.do('key', compute, timeout=5)
+        except RuntimeError:
+            return 'failed'
+
+    results = _run_together(3, call)
+    assert results.count('failed') == 1
+    assert results.count(('retry', False)) == 2
+
+
+def test_waiter_gives_up_after_timeout():
+    flights = SingleFlight()
+    release = threading.Event()
+    leader = threading.Thread(target=lambda: flights.do('key', lambda: release.wait(5) and 'slow', 5))
+    leader.start()
+    time.sleep(0.05)
+
+    assert flights.do('key', lambda: 'own', timeout=0.05) == ('own', False)
+    assert flights.timeouts == 1
+    release.set()
+    leader.join()
+
+
+def _value(body=b'body'):
+    return {'body': body, 'status': 200, 'mimetype': 'application/json',
+            'headers': [['ETag', '"v1"'], ['Cache-Control', 'no-cache']]}
+
+
+def test_file_lock(tmp_path):
+    lock = FileFlightLock(str(tmp_path))
+    started = time.time() - 1
+    handle = lock.acquire('key', 10)
+
+    assert handle is not None
+    assert lock.acquire('key', 10) is None
+    assert lock.result('key', started) is None
+
+    lock.release('key', handle, _value())
+    assert lock.result('key', started) == _value()
+    assert lock.result('key', time.time() + 60) is None
+    assert lock.acquire('key', 10) is not None
+
+
+def test_mongo_lock(db):
+    lock = MongoFlightLock(db['singleflight'])
+    started = time.time() - 1
+    owner = lock.acquire('key', 10)
+
+    assert owner is not None
+    assert lock.acquire('key', 10) is None
+    lock.release('key', owner, _value())
+    assert lock.result('key', started) == _value()
+    assert lock.acquire('key', 10) is not None
+
+
+def test_mongo_lock_is_taken_over_after_expiry(db):
+    lock = MongoFlightLock(db['singleflight'])
+    lock.acquire('key', 10)
+    db['singleflight'].update_one({'_id': 'key'}, {'$set': {'expires_at': datetime.utcnow() - timedelta(seconds=1)}})
+    assert lock.acquire('key', 10) is not None
+
+
+def test_waiter_in_another_worker_uses_the_stored_result(tmp_path, monkeypatch):
+    lock = FileFlightLock(str(tmp_path))
+    monkeypatch.setattr(singleflight, 'process_lock', lock)
+    handle = lock.acquire('key', 10)
+
+    def other_worker():
+        time.sleep(0.1)
+        lock.release('key', handle, _value(b'from leader'))
+
+    threading.Thread(target=other_worker).start()
+    value = _across_processes('key', lambda: _value(b'computed'), timeout=5)
+    assert value['body'] == b'from leader'
+
+
+@pytest.mark.parametrize('lock', ['none', 'file', 'mongo'])
+def test_decorator_shares_response_with_headers(lock, tmp_path, db, monkeypatch):
+    process_lock = {'none': None, 'file': FileFlightLock(str(tmp_path)), 'mongo': MongoFlightLock(db['singleflight'])}
+    monkeypatch.setattr(singleflight, 'process_lock', process_lock[lock])
+    monkeypatch.setattr(singleflight, 'flights', SingleFlight())
+
+    app = Flask(__name__)
+    calls = []
+
+    @app.route('/slow')
+    @single_flight()
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        response = make_response('{"ok": true}')
+        response.mimetype = 'application/json'
+        response.set_etag('slow-v1')
+        response.headers['Cache-Control'] = 'no-cache'
+        response.last_modified = datetime(2024, 12, 5)
+        return response
+
+    responses = _run_together(4, lambda: app.test_client().get('/slow'))
+
+    assert len(calls) == 1
+    assert sum(1 for response in responses if response.headers.get('X-Single-Flight') == 'shared') == 3
+    for response in responses:
+        assert response.get_json() == {'ok': True}
+        assert response.headers['ETag'] == '"slow-v1"'
+        assert response.headers['Cache-Control'] == 'no-cache'
+        assert response.headers['Last-Modified'] == 'Thu, 05 Dec 2024 00:00:00 GMT'